@@ -0,0 +1,302 @@
+"""
+Offline batch submission for latency-insensitive chat completions.
+
+Nightly backfills of the 22-variable extractions do not need answers in
+seconds, but sent one by one they pay interactive prices and compete with
+interactive traffic for rate limits. run_batch() writes the requests as a
+JSONL batch file in the OpenAI Batch API format, submits it through a
+BatchBackend, polls until the batch finishes and returns each request's
+completion text (or error) by custom_id.
+
+OpenAIBatchBackend uses the provider's Batch API (/v1/files + /v1/batches).
+LocalBatchBackend is a stand-in that works through the file itself with any
+OpenAI-compatible client (for example the mock server), so the batch path can
+be exercised without a real batch queue.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETIONS_ENDPOINT = '/v1/chat/completions'
+TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+
+@dataclass
+class BatchRequest:
+    """One chat completion in a batch"""
+    custom_id: str
+    body: Dict[str, Any]
+
+    def to_line(self) -> str:
+        return json.dumps({
+            'custom_id': self.custom_id,
+            'method': 'POST',
+            'url': CHAT_COMPLETIONS_ENDPOINT,
+            'body': self.body,
+        })
+
+
+@dataclass
+class BatchStatus:
+    """Progress of a submitted batch"""
+    batch_id: str
+    status: str
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch request"""
+    custom_id: str
+    content: Optional[str] = None
+    usage: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class BatchBackend(ABC):
+    """Interface for batch processors: submit a JSONL file, poll it, fetch its output lines"""
+
+    @abstractmethod
+    async def submit(self, path: str) -> str:
+        """Submit a batch input file and return the batch id"""
+
+    @abstractmethod
+    async def status(self, batch_id: str) -> BatchStatus:
+        """Return the batch's current status"""
+
+    @abstractmethod
+    async def results(self, batch_id: str) -> List[Dict[str, Any]]:
+        """Return the output lines (Batch API format) of a finished batch"""
+
+    @abstractmethod
+    async def cancel(self, batch_id: str) -> None:
+        """Stop a batch that is still running"""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Submits batches to the OpenAI Batch API"""
+
+    def __init__(self, client, completion_window: str = '24h'):
+        """
+        Initialize the backend.
+
+        Args:
+            client: AsyncOpenAI client
+            completion_window: Batch completion window requested from the provider
+        """
+        self.client = client
+        self.completion_window = completion_window
+
+    async def submit(self, path: str) -> str:
+        with open(path, 'rb') as f:
+            input_file = await self.client.files.create(file=f, purpose='batch')
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=CHAT_COMPLETIONS_ENDPOINT,
+            completion_window=self.completion_window
+        )
+        return batch.id
+
+    async def status(self, batch_id: str) -> BatchStatus:
+        batch = await self.client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return BatchStatus(
+            batch_id=batch_id,
+            status=batch.status,
+            total=getattr(counts, 'total', 0) or 0,
+            completed=getattr(counts, 'completed', 0) or 0,
+            failed=getattr(counts, 'failed', 0) or 0
+        )
+
+    async def results(self, batch_id: str) -> List[Dict[str, Any]]:
+        batch = await self.client.batches.retrieve(batch_id)
+        lines = []
+        # Expired batches still have output for the requests that finished
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await self.client.files.content(file_id)
+                lines.extend(json.loads(line) for line in content.text.splitlines() if line.strip())
+        return lines
+
+    async def cancel(self, batch_id: str) -> None:
+        await self.client.batches.cancel(batch_id)
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    Stand-in batch processor that sends each request of the file itself.
+
+    Requests go through an OpenAI-compatible client at up to max_concurrency at
+    a time in a background task; output lines are written next to the input.
+    """
+
+    def __init__(self, client, max_concurrency: int = 4):
+        """
+        Initialize the backend.
+
+        Args:
+            client: AsyncOpenAI-compatible client the requests are sent with
+            max_concurrency: Maximum requests in flight
+        """
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._batches: Dict[str, Dict[str, Any]] = {}
+
+    async def submit(self, path: str) -> str:
+        with open(path, 'r', encoding='utf-8') as f:
+            requests = [json.loads(line) for line in f if line.strip()]
+        batch_id = f"local_batch_{uuid.uuid4().hex[:12]}"
+        state = {
+            'status': BatchStatus(batch_id, 'in_progress', total=len(requests)),
+            'output_path': f"{path}.{batch_id}.output.jsonl",
+        }
+        state['task'] = asyncio.ensure_future(self._process(requests, state))
+        self._batches[batch_id] = state
+        return batch_id
+
+    async def _process(self, requests: List[Dict[str, Any]], state: Dict[str, Any]) -> None:
+        status: BatchStatus = state['status']
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def send(request: Dict[str, Any]) -> Dict[str, Any]:
+            line = {'id': f"batch_req_{uuid.uuid4().hex[:12]}", 'custom_id': request['custom_id'],
+                    'response': None, 'error': None}
+            try:
+                async with slots:
+                    response = await self.client.chat.completions.create(**request['body'])
+                line['response'] = {'status_code': 200, 'body': response.model_dump()}
+                status.completed += 1
+            except Exception as e:
+                line['error'] = {'code': type(e).__name__, 'message': str(e)}
+                status.failed += 1
+            return line
+
+        try:
+            lines = await asyncio.gather(*(send(request) for request in requests))
+            with open(state['output_path'], 'w', encoding='utf-8') as f:
+                for line in lines:
+                    f.write(json.dumps(line) + '\n')
+            status.status = 'completed'
+        except asyncio.CancelledError:
+            status.status = 'cancelled'
+            raise
+        except BaseException:
+            status.status = 'failed'
+            raise
+
+    async def status(self, batch_id: str) -> BatchStatus:
+        return self._batches[batch_id]['status']
+
+    async def results(self, batch_id: str) -> List[Dict[str, Any]]:
+        state = self._batches.pop(batch_id)
+        if not os.path.exists(state['output_path']):
+            return []
+        with open(state['output_path'], 'r', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        os.remove(state['output_path'])
+        return lines
+
+    async def cancel(self, batch_id: str) -> None:
+        state = self._batches.pop(batch_id, None)
+        if state is None or state['task'].done():
+            return
+        state['task'].cancel()
+        await asyncio.gather(state['task'], return_exceptions=True)
+
+
+def write_batch_file(requests: List[BatchRequest], path: str) -> str:
+    """Write requests as a Batch API JSONL input file and return its path"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for request in requests:
+            f.write(request.to_line() + '\n')
+    return path
+
+
+def parse_batch_line(line: Dict[str, Any]) -> BatchResult:
+    """Turn one Batch API output line into a BatchResult"""
+    result = BatchResult(custom_id=line.get('custom_id', ''))
+    response = line.get('response') or {}
+    body = response.get('body') or {}
+    if line.get('error') or response.get('status_code', 200) != 200:
+        error = line.get('error') or body.get('error') or {}
+        result.error = error.get('message') if isinstance(error, dict) else str(error)
+        result.error = result.error or f"HTTP {response.get('status_code')}"
+        return result
+    try:
+        result.content = body['choices'][0]['message']['content']
+    except (KeyError, IndexError, TypeError):
+        result.error = 'batch response has no message content'
+    result.usage = body.get('usage') or {}
+    return result
+
+
+async def run_batch(backend: BatchBackend, requests: List[BatchRequest],
+                    batch_dir: Optional[str] = None,
+                    poll_interval: float = 30.0,
+                    timeout: Optional[float] = None) -> Dict[str, BatchResult]:
+    """
+    Submit requests as one batch, wait for it to finish and collect the results.
+
+    Args:
+        backend: Batch processor to submit to
+        requests: Chat completion requests with unique custom_ids
+        batch_dir: Directory for the JSONL input file (default: the temp directory)
+        poll_interval: Seconds between status checks
+        timeout: Give up (raising TimeoutError) after this many seconds (None = wait);
+            the batch is cancelled when this call times out or is itself cancelled
+
+    Returns:
+        BatchResult per custom_id; requests missing from the output get an error
+    """
+    if not requests:
+        return {}
+    batch_dir = batch_dir or tempfile.gettempdir()
+    path = write_batch_file(requests, os.path.join(batch_dir, f"batch_{uuid.uuid4().hex[:12]}.jsonl"))
+    try:
+        batch_id = await backend.submit(path)
+        logger.info(f"Submitted batch {batch_id} with {len(requests)} requests")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                status = await backend.status(batch_id)
+                if status.done:
+                    break
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"Batch {batch_id} still {status.status} after {timeout}s")
+                logger.info(f"Batch {batch_id} {status.status}: {status.completed + status.failed}/{status.total}")
+                await asyncio.sleep(poll_interval)
+        except (TimeoutError, asyncio.CancelledError):
+            # Nobody will collect the results, so stop the provider from finishing (and billing) the batch
+            try:
+                await backend.cancel(batch_id)
+                logger.info(f"Cancelled batch {batch_id}")
+            except Exception as e:
+                logger.warning(f"Could not cancel batch {batch_id}: {e}")
+            raise
+        logger.info(f"Batch {batch_id} {status.status}: {status.completed} completed, {status.failed} failed")
+
+        results = {request.custom_id: BatchResult(request.custom_id, error=f"batch {status.status} without a result")
+                   for request in requests}
+        for line in await backend.results(batch_id):
+            result = parse_batch_line(line)
+            if result.custom_id in results:
+                results[result.custom_id] = result
+        return results
+    finally:
+        os.remove(path)
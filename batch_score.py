@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Batch scoring CLI for nightly resume x job runs.
+
+Streams resume/job pairs from JSONL or CSV, either a pairs file or the cross
+product of a resumes file and a jobs file, and scores them with ResumeScorer
+and/or EnhancedMatchingSystem. Pairs are sent in chunks to a process pool. Each
+worker keeps one event loop and one set of pooled clients, and runs its chunk
+with a bounded number of requests in flight. Results are appended to a JSONL
+file as chunks finish, so memory stays bounded by the in-flight window, not by
+the input size.
+
+For the matcher, the parent process first extracts every distinct job and
+resume into a SQLite extraction cache (by default next to the output file) that
+the workers then read, so a resume shared by many pairs is extracted once
+rather than once per worker.
+
+A crash or Ctrl-C loses only in-flight work. Pairs are numbered in input order.
+The checkpoint next to the output records the contiguous completed prefix plus
+any out-of-order completions, and rerunning the same command skips everything
+already written.
+
+Record fields:
+    resumes: resume_id, resume_text (or resume / text), optional resume_data (JSON object)
+    jobs:    job_id, job_description (or description / text), optional job_title, company
+    pairs:   any of the above in one row
+
+Usage:
+    python batch_score.py --resumes resumes.jsonl --jobs jobs.csv --output results.jsonl
+    python batch_score.py --pairs pairs.jsonl --output results.jsonl --pipeline both --workers 4
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+RESUME_TEXT_FIELDS = ('resume_text', 'resume', 'text')
+JOB_TEXT_FIELDS = ('job_description', 'description', 'text')
+
+
+@dataclass
+class ScoringTask:
+    """One resume/job pair, numbered in input order"""
+    seq: int
+    resume_id: str
+    job_id: str
+    resume_text: str
+    job_description: str
+    job_title: str = ''
+    company: str = ''
+    resume_data: Dict[str, Any] = field(default_factory=dict)
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream rows from a JSONL file, or a CSV file when the extension is .csv"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            csv.field_size_limit(sys.maxsize)
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _first(record: Dict[str, Any], names: Iterable[str]) -> str:
+    for name in names:
+        value = record.get(name)
+        if value:
+            return str(value)
+    return ''
+
+
+def _resume_data(record: Dict[str, Any]) -> Dict[str, Any]:
+    data = record.get('resume_data') or {}
+    return json.loads(data) if isinstance(data, str) else data
+
+
+def iter_tasks(pairs: Optional[str] = None, resumes: Optional[str] = None,
+               jobs: Optional[str] = None) -> Iterator[ScoringTask]:
+    """
+    Stream scoring tasks from a pairs file or the cross product of resumes and jobs.
+
+    The cross product re-reads the jobs file for every resume instead of holding
+    it in memory.
+    """
+    if pairs:
+        for seq, record in enumerate(iter_records(pairs)):
+            yield ScoringTask(
+                seq=seq,
+                resume_id=str(record.get('resume_id') or f"resume-{seq}"),
+                job_id=str(record.get('job_id') or f"job-{seq}"),
+                resume_text=_first(record, RESUME_TEXT_FIELDS[:2]),
+                job_description=_first(record, JOB_TEXT_FIELDS[:2]),
+                job_title=record.get('job_title') or '',
+                company=record.get('company') or '',
+                resume_data=_resume_data(record),
+            )
+        return
+
+    seq = itertools.count()
+    for resume_index, resume in enumerate(iter_records(resumes)):
+        for job_index, job in enumerate(iter_records(jobs)):
+            yield ScoringTask(
+                seq=next(seq),
+                resume_id=str(resume.get('resume_id') or resume.get('id') or f"resume-{resume_index}"),
+                job_id=str(job.get('job_id') or job.get('id') or f"job-{job_index}"),
+                resume_text=_first(resume, RESUME_TEXT_FIELDS),
+                job_description=_first(job, JOB_TEXT_FIELDS),
+                job_title=job.get('job_title') or job.get('title') or '',
+                company=job.get('company') or '',
+                resume_data=_resume_data(resume),
+            )
+
+
+class CompletionTracker:
+    """
+    Completed sequence numbers as a contiguous prefix plus a set of later ones.
+
+    Results finish out of order, but the set only holds completions ahead of the
+    first gap, so its size is bounded by the in-flight window.
+    """
+
+    def __init__(self, done_below: int = 0, done: Iterable[int] = ()):
+        self.done_below = done_below
+        self.done: Set[int] = set()
+        for seq in done:
+            self.add(seq)
+
+    def add(self, seq: int) -> None:
+        if seq < self.done_below:
+            return
+        self.done.add(seq)
+        while self.done_below in self.done:
+            self.done.remove(self.done_below)
+            self.done_below += 1
+
+    def __contains__(self, seq: int) -> bool:
+        return seq < self.done_below or seq in self.done
+
+    def __len__(self) -> int:
+        return self.done_below + len(self.done)
+
+
+def checkpoint_path(output_path: str) -> str:
+    return output_path + '.checkpoint'
+
+
+def load_checkpoint(output_path: str) -> CompletionTracker:
+    """
+    Rebuild progress from the checkpoint plus any results written after it.
+
+    A torn last line from a crash mid-write is truncated away so the pair is redone.
+    """
+    tracker = CompletionTracker()
+    offset = 0
+    if os.path.exists(checkpoint_path(output_path)):
+        with open(checkpoint_path(output_path), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        tracker = CompletionTracker(state['done_below'], state['done'])
+        offset = state['output_offset']
+
+    if os.path.exists(output_path):
+        with open(output_path, 'rb+') as f:
+            f.seek(offset)
+            position = offset
+            for line in iter(f.readline, b''):
+                if not line.endswith(b'\n'):
+                    f.truncate(position)
+                    break
+                tracker.add(json.loads(line)['seq'])
+                position += len(line)
+    return tracker
+
+
+def save_checkpoint(output_path: str, tracker: CompletionTracker, output_offset: int) -> None:
+    """Atomically record progress up to output_offset bytes of the results file"""
+    state = {'done_below': tracker.done_below, 'done': sorted(tracker.done), 'output_offset': output_offset}
+    temp_path = checkpoint_path(output_path) + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(temp_path, checkpoint_path(output_path))
+
+
+# Per-process state: one event loop, so pooled clients and caches live across chunks
+_worker: Dict[str, Any] = {}
+
+
+def _make_limiter(options: Dict[str, Any], share: int):
+    from rate_limiter import DEFAULT_RATE_LIMITS, RateLimit, RateLimiter
+
+    if not options['rate_limit']:
+        return RateLimiter()
+    return RateLimiter(limits={
+        model: RateLimit(limit.requests_per_minute / share, limit.tokens_per_minute / share)
+        for model, limit in DEFAULT_RATE_LIMITS.items()
+    })
+
+
+def _make_matcher(options: Dict[str, Any], limiter):
+    from enhanced_matching_system import EnhancedMatchingSystem
+    from job_dedup import JobDeduplicator
+    deduplicator = JobDeduplicator(threshold=options['duplicate_threshold']) if options['dedupe_jobs'] else None
+    return EnhancedMatchingSystem(
+        api_key=options['api_key'],
+        base_url=options['base_url'],
+        rate_limiter=limiter,
+        extraction_cache_path=options['extraction_cache'],
+        job_deduplicator=deduplicator,
+    )
+
+
+async def _build_pipelines(options: Dict[str, Any]) -> None:
+    # Every worker process has its own limiter, so each gets an equal share of the quota
+    limiter = _make_limiter(options, max(1, options['workers']))
+
+    if options['pipeline'] in ('scorer', 'both'):
+        from resume_scorer import ResumeScorer
+        _worker['scorer'] = ResumeScorer(
+            openai_key=options['api_key'],
+            use_ollama=options['backend'] == 'ollama',
+            use_local_embeddings=options['local_embeddings'],
+            openai_base_url=options['base_url'],
+            ollama_host=options['ollama_host'],
+            max_concurrency=options['concurrency'],
+            rate_limiter=limiter,
+        )
+    if options['pipeline'] in ('matcher', 'both'):
+        _worker['matcher'] = _make_matcher(options, limiter)
+    _worker['slots'] = asyncio.Semaphore(options['concurrency'])
+
+
+async def _extract_distinct(options: Dict[str, Any], tasks: Iterator[ScoringTask]) -> Dict[str, int]:
+    from enhanced_matching_system import CANDIDATE_EXTRACTION_PROMPT_VERSION, JOB_EXTRACTION_PROMPT_VERSION
+    from extraction_cache import candidate_cache_key, job_cache_key
+
+    matcher = _make_matcher(options, _make_limiter(options, 1))
+    slots = asyncio.Semaphore(options['concurrency'] * max(1, options['workers']))
+    seen: Set[str] = set()
+    running: Set[asyncio.Task] = set()
+    counts = {'jobs': 0, 'resumes': 0, 'failed': 0}
+
+    async def extract(kind: str, extraction: Awaitable[Dict], alias: Optional[str] = None) -> None:
+        try:
+            variables = await extraction
+            # Workers deduplicate postings independently, so a posting this pass
+            # collapsed must also be found under its own key
+            if alias is not None and matcher.extraction_cache.get(alias) is None:
+                matcher.extraction_cache.put(alias, variables)
+            counts[kind] += 1
+        except Exception as e:
+            counts['failed'] += 1
+            print(f"Pre-extraction failed, left to the workers: {type(e).__name__}: {e}", file=sys.stderr)
+        finally:
+            slots.release()
+
+    async def schedule(kind: str, extraction: Callable[[], Awaitable[Dict]], alias: Optional[str] = None) -> None:
+        await slots.acquire()
+        job = asyncio.ensure_future(extract(kind, extraction(), alias))
+        running.add(job)
+        job.add_done_callback(running.discard)
+
+    try:
+        for task in tasks:
+            job_key = job_cache_key(matcher.model, JOB_EXTRACTION_PROMPT_VERSION,
+                                    task.job_description, task.job_title, task.company)
+            if job_key not in seen:
+                seen.add(job_key)
+                await schedule('jobs', lambda task=task: matcher.extract_job_variables(
+                    task.job_description, task.job_title, task.company), job_key)
+            resume_key = candidate_cache_key(matcher.model, CANDIDATE_EXTRACTION_PROMPT_VERSION,
+                                             task.resume_text, task.resume_data)
+            if resume_key not in seen:
+                seen.add(resume_key)
+                await schedule('resumes', lambda task=task: matcher.extract_candidate_variables(
+                    task.resume_text, task.resume_data))
+        if running:
+            await asyncio.wait(running)
+    finally:
+        matcher.extraction_cache.close()
+        await matcher.client_registry.aclose()
+    return counts
+
+
+def _pre_extract(options: Dict[str, Any], tasks: Iterator[ScoringTask]) -> Dict[str, int]:
+    """
+    Extract every distinct job and resume once, in this process, before the fan-out.
+
+    Workers open the same extraction cache file, so they read these extractions
+    instead of each re-running them for the jobs and resumes their chunks share.
+    Failed extractions are left for the workers to retry.
+    """
+    # The extraction prompts narrate every stage with print(); progress goes to stderr
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return asyncio.run(_extract_distinct(options, tasks))
+
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    # full_matching_analysis narrates every stage with print(); results go to the JSONL file
+    sys.stdout = open(os.devnull, 'w')
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    _worker['loop'] = loop
+    _worker['options'] = options
+    loop.run_until_complete(_build_pipelines(options))
+
+
+async def _score_task(task: ScoringTask) -> Dict[str, Any]:
+    record: Dict[str, Any] = {'seq': task.seq, 'resume_id': task.resume_id, 'job_id': task.job_id}
+    async with _worker['slots']:
+        try:
+            if 'scorer' in _worker:
+                result = await _worker['scorer'].score_resume(task.resume_text, task.job_description)
+                record['scorer'] = {
+                    'original_score': result.original_score,
+                    'improved_score': result.improved_score,
+                    'suggestions': result.suggestions,
+                    'metrics': result.metrics,
+                }
+                if _worker['options']['include_improved_resume']:
+                    record['scorer']['improved_resume'] = result.improved_resume
+            if 'matcher' in _worker:
+                result = await _worker['matcher'].full_matching_analysis(
+                    task.job_description, task.job_title, task.company, task.resume_text, task.resume_data
+                )
+                record['matcher'] = {**result['matching_result'], 'metrics': result['metrics']}
+        except Exception as e:
+            record['error'] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def _run_chunk(tasks: List[ScoringTask]) -> List[Dict[str, Any]]:
+    """Score one chunk of pairs on this worker's event loop"""
+    loop = _worker['loop']
+    return loop.run_until_complete(asyncio.gather(*(_score_task(task) for task in tasks)))
+
+
+def _chunks(tasks: Iterator[ScoringTask], size: int) -> Iterator[List[ScoringTask]]:
+    while True:
+        chunk = list(itertools.islice(tasks, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _InlineExecutor:
+    """Runs chunks in this process (--workers 0), mainly for debugging"""
+
+    def __init__(self, options: Dict[str, Any]):
+        _init_worker(options)
+
+    def submit(self, fn, *args) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        sys.stdout = sys.__stdout__
+        return False
+
+
+def run_batch(args: argparse.Namespace) -> Dict[str, int]:
+    """Score every pending pair and append results to args.output"""
+    options = {
+        'pipeline': args.pipeline,
+        'backend': args.backend,
+        'api_key': args.api_key,
+        'base_url': args.base_url,
+        'ollama_host': args.ollama_host,
+        'local_embeddings': args.local_embeddings,
+        'concurrency': args.concurrency,
+        'workers': args.workers,
+        'rate_limit': args.rate_limit,
+        'include_improved_resume': args.include_improved_resume,
+        'extraction_cache': args.extraction_cache or args.output + '.extractions.sqlite',
+        'duplicate_threshold': args.duplicate_threshold,
+        'dedupe_jobs': args.dedupe_jobs,
+    }
+    tracker = load_checkpoint(args.output)
+    skipped = len(tracker)
+    if args.pipeline in ('matcher', 'both'):
+        extracted = _pre_extract(options, (task for task in iter_tasks(args.pairs, args.resumes, args.jobs)
+                                           if task.seq not in tracker))
+        print(f"Pre-extracted {extracted['jobs']} jobs and {extracted['resumes']} resumes, "
+              f"{extracted['failed']} failed", file=sys.stderr)
+    tasks = (task for task in iter_tasks(args.pairs, args.resumes, args.jobs) if task.seq not in tracker)
+    max_in_flight = args.max_inflight_chunks or max(2, args.workers * 2)
+
+    if args.workers > 0:
+        executor = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(options,))
+    else:
+        executor = _InlineExecutor(options)
+
+    counts = {'scored': 0, 'errors': 0, 'skipped': skipped}
+    start = time.perf_counter()
+    pending: Set[Future] = set()
+
+    with open(args.output, 'ab') as out, executor:
+        def drain(return_when) -> None:
+            nonlocal pending
+            done, pending = wait(pending, return_when=return_when)
+            for future in done:
+                for record in future.result():
+                    out.write(json.dumps(record).encode('utf-8') + b'\n')
+                    tracker.add(record['seq'])
+                    counts['errors' if 'error' in record else 'scored'] += 1
+            out.flush()
+            save_checkpoint(args.output, tracker, out.tell())
+            elapsed = time.perf_counter() - start
+            print(f"{counts['scored']} scored, {counts['errors']} errors, "
+                  f"{counts['scored'] / elapsed:.1f} pairs/s", file=sys.stderr)
+
+        for chunk in _chunks(tasks, args.chunk_size):
+            while len(pending) >= max_in_flight:
+                drain(FIRST_COMPLETED)
+            pending.add(executor.submit(_run_chunk, chunk))
+        while pending:
+            drain(FIRST_COMPLETED)
+
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--pairs', help='JSONL/CSV with one resume/job pair per row')
+    source.add_argument('--resumes', help='JSONL/CSV of resumes (scored against every row of --jobs)')
+    parser.add_argument('--jobs', help='JSONL/CSV of jobs, used with --resumes')
+    parser.add_argument('--output', required=True, help='results JSONL (appended to; resumable)')
+    parser.add_argument('--pipeline', choices=['scorer', 'matcher', 'both'], default='scorer')
+    parser.add_argument('--backend', choices=['openai', 'ollama'], default='openai',
+                        help='backend for ResumeScorer (the matcher always uses OpenAI)')
+    parser.add_argument('--api-key', default=os.getenv('OPENAI_API_KEY'))
+    parser.add_argument('--base-url', default=None, help='OpenAI-compatible base URL')
+    parser.add_argument('--ollama-host', default=None)
+    parser.add_argument('--local-embeddings', action='store_true',
+                        help='score with the offline hashing embedder')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help='worker processes (0 = run in this process)')
+    parser.add_argument('--concurrency', type=int, default=8, help='pairs in flight per worker')
+    parser.add_argument('--chunk-size', type=int, default=16, help='pairs sent to a worker at a time')
+    parser.add_argument('--max-inflight-chunks', type=int, default=None,
+                        help='chunks queued across all workers (default: 2 per worker)')
+    parser.add_argument('--rate-limit', action='store_true',
+                        help='pace requests to DEFAULT_RATE_LIMITS client-side (split across workers)')
+    parser.add_argument('--include-improved-resume', action='store_true')
+    parser.add_argument('--extraction-cache', default=None,
+                        help='SQLite file the matcher extractions are shared through '
+                             '(default: <output>.extractions.sqlite)')
+    parser.add_argument('--dedupe-jobs', action='store_true',
+                        help='reuse the extraction and results of a near-duplicate posting with the same company '
+                             'and title (lossy)')
+    parser.add_argument('--duplicate-threshold', type=float, default=0.85,
+                        help='SimHash similarity above which --dedupe-jobs treats postings as duplicates (per worker)')
+    args = parser.parse_args()
+
+    if args.resumes and not args.jobs:
+        parser.error('--resumes requires --jobs')
+
+    counts = run_batch(args)
+    print(f"Done: {counts['scored']} scored, {counts['errors']} errors, "
+          f"{counts['skipped']} already complete", file=sys.stderr)
+    return 1 if counts['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
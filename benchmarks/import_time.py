@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Cold-start import benchmark for the Python matching modules.
+
+Imports each module in a fresh interpreter with `-X importtime`, several times,
+and reports the median cumulative import time. Exits non-zero when a module
+goes over its budget or pulls in a heavy dependency (openai, ollama, scipy,
+pandas, sklearn, matplotlib) at import time, so it can gate CI.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 9 --scale 1.5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Median cumulative import time budgets in milliseconds (numpy dominates the floor)
+BUDGETS_MS: Dict[str, float] = {
+    'resume_scorer': 250.0,
+    'enhanced_matching_system': 150.0,
+    'optimal_matching_variables': 200.0,
+    'job_index': 300.0,
+}
+
+# Modules that must only load on the code paths that use them
+DEFERRED_MODULES = ('openai', 'ollama', 'scipy', 'pandas', 'sklearn', 'matplotlib')
+
+PROBE = (
+    "import sys, {module}\n"
+    "print(','.join(m for m in {deferred!r} if m in sys.modules))"
+)
+
+
+def measure_once(module: str) -> Tuple[float, List[str]]:
+    """Import `module` in a fresh interpreter; return (cumulative ms, deferred modules it loaded)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE.format(module=module, deferred=DEFERRED_MODULES)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        fields = [field.strip() for field in line[len('import time:'):].split('|')]
+        if fields[2] == module and fields[1].isdigit():
+            cumulative_us = int(fields[1])
+    loaded = [name for name in result.stdout.strip().split(',') if name]
+    return cumulative_us / 1000.0, loaded
+
+
+def measure(module: str, runs: int) -> Tuple[float, List[str]]:
+    """Median cumulative import time over `runs` cold starts, after one warm-up for the bytecode cache"""
+    measure_once(module)
+    samples = []
+    loaded: List[str] = []
+    for _ in range(runs):
+        elapsed_ms, loaded = measure_once(module)
+        samples.append(elapsed_ms)
+    return statistics.median(samples), loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='cold imports per module')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every budget (slow CI machines)')
+    parser.add_argument('--modules', nargs='+', default=list(BUDGETS_MS))
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<28} {'median':>9} {'budget':>9}  status")
+    for module in args.modules:
+        median_ms, loaded = measure(module, args.runs)
+        budget_ms = BUDGETS_MS.get(module, 500.0) * args.scale
+        problems = []
+        if median_ms > budget_ms:
+            problems.append('over budget')
+        if loaded:
+            problems.append(f"eagerly imports {', '.join(loaded)}")
+        failed = failed or bool(problems)
+        status = '; '.join(problems) if problems else 'ok'
+        print(f"{module:<28} {median_ms:>7.1f}ms {budget_ms:>7.1f}ms  {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
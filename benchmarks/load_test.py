@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test for ResumeScorer.score_resume and
+EnhancedMatchingSystem.full_matching_analysis against the local mock server.
+
+Starts mock_llm_server in-process (or targets --server-url), runs the selected
+pipelines at the requested concurrency, and reports throughput, p50/p95/p99
+latency, failures and tokens per stage. No API key or money is spent.
+
+Usage:
+    python benchmarks/load_test.py --pipeline both --requests 200 --concurrency 32
+    python benchmarks/load_test.py --pipeline scorer --backend ollama --error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from client_registry import get_shared_client_registry
+from enhanced_matching_system import EnhancedMatchingSystem
+from mock_llm_server import MockServerConfig, start_mock_server
+from rate_limiter import RateLimiter
+from resilience import Resilience, RetryPolicy
+from resume_scorer import ResumeScorer
+
+JOB_DESCRIPTION = """
+Senior Python Developer
+
+Requirements:
+- 5+ years Python experience
+- Django framework expertise
+- REST API development
+- PostgreSQL database skills
+- AWS cloud experience
+"""
+
+RESUME = """
+John Doe
+Software Engineer
+
+Experience:
+- Python developer with 3 years experience
+- Built web applications using Django
+- Worked with databases and APIs
+"""
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def run_pipeline(name: str, make_call, requests: int, concurrency: int) -> Dict:
+    """Run `requests` calls with at most `concurrency` in flight and collect latencies"""
+    slots = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def one(i: int):
+        nonlocal failures
+        async with slots:
+            start = time.perf_counter()
+            try:
+                await make_call(i)
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'pipeline': name,
+        'requests': requests,
+        'concurrency': concurrency,
+        'failures': failures,
+        'elapsed_s': elapsed,
+        'throughput_rps': (requests - failures) / elapsed if elapsed else 0.0,
+        'p50_s': percentile(latencies, 0.50),
+        'p95_s': percentile(latencies, 0.95),
+        'p99_s': percentile(latencies, 0.99),
+    }
+
+
+def fetch_stats(server_url: str) -> Dict:
+    with urllib.request.urlopen(f"{server_url}/stats") as response:
+        return json.loads(response.read())
+
+
+def print_report(results: List[Dict], stage_stats: Dict) -> None:
+    print(f"\n{'pipeline':<10} {'reqs':>6} {'conc':>5} {'fail':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for r in results:
+        print(f"{r['pipeline']:<10} {r['requests']:>6} {r['concurrency']:>5} {r['failures']:>5} "
+              f"{r['throughput_rps']:>8.2f} {r['p50_s']:>7.2f}s {r['p95_s']:>7.2f}s {r['p99_s']:>7.2f}s")
+    print(f"\n{'stage':<22} {'reqs':>6} {'errors':>6} {'prompt tok':>11} {'compl tok':>10}")
+    for stage, s in sorted(stage_stats.items()):
+        print(f"{stage:<22} {s['requests']:>6} {s['errors']:>6} {s['prompt_tokens']:>11} {s['completion_tokens']:>10}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pipeline', choices=['scorer', 'matcher', 'both'], default='both')
+    parser.add_argument('--backend', choices=['openai', 'ollama'], default='openai',
+                        help='wire format ResumeScorer uses (the matcher always speaks OpenAI)')
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--server-url', default=None, help='use a running mock server instead of starting one')
+    parser.add_argument('--chat-latency', type=float, nargs=2, default=[0.5, 1.5], metavar=('MEDIAN', 'P95'))
+    parser.add_argument('--embedding-latency', type=float, nargs=2, default=[0.05, 0.15], metavar=('MEDIAN', 'P95'))
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--hedging', action='store_true', help='enable hedged requests in the matcher')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    server: Optional[object] = None
+    server_url = args.server_url
+    if server_url is None:
+        server = start_mock_server(MockServerConfig(
+            chat_latency=tuple(args.chat_latency),
+            embedding_latency=tuple(args.embedding_latency),
+            error_rate=args.error_rate,
+        ))
+        server_url = f"http://127.0.0.1:{server.server_port}"
+
+    # Client-side quotas are disabled: the mock server is the only bottleneck under test
+    limiter = RateLimiter()
+    results = []
+
+    if args.pipeline in ('scorer', 'both'):
+        scorer = ResumeScorer(
+            openai_key='mock-key',
+            use_ollama=args.backend == 'ollama',
+            openai_base_url=f"{server_url}/v1",
+            ollama_host=server_url,
+            max_concurrency=args.concurrency * 2,
+            rate_limiter=limiter,
+        )
+        results.append(await run_pipeline(
+            'scorer',
+            lambda i: scorer.score_resume(f"{RESUME}\nReference {i}", JOB_DESCRIPTION),
+            args.requests, args.concurrency
+        ))
+
+    if args.pipeline in ('matcher', 'both'):
+        matcher = EnhancedMatchingSystem(
+            api_key='mock-key',
+            base_url=f"{server_url}/v1",
+            rate_limiter=limiter,
+            resilience=Resilience(RetryPolicy(base_delay=0.1, hedging=args.hedging)),
+        )
+
+        def match(i: int):
+            # Distinct job and resume content per request, so extraction caching and
+            # near-duplicate collapsing don't turn the run into cache lookups
+            return matcher.full_matching_analysis(
+                f"{JOB_DESCRIPTION}- Owns service {i} end to end\n", "Senior Python Developer", f"Company {i}",
+                f"{RESUME}\nReference {i}", {}
+            )
+
+        # full_matching_analysis narrates each stage with print(); keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            results.append(await run_pipeline('matcher', match, args.requests, args.concurrency))
+
+    await get_shared_client_registry().aclose()
+    stage_stats = fetch_stats(server_url)
+    if server is not None:
+        server.shutdown()
+
+    if args.json:
+        print(json.dumps({'results': results, 'stages': stage_stats}, indent=2))
+    else:
+        print_report(results, stage_stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
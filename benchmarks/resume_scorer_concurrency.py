@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for concurrent ResumeScorer.score_resume calls.
+
+Runs a fixed number of score_resume calls against a simulated async backend with
+fixed per-request latency, once per concurrency level, and prints scores/second.
+No network access or API key is needed.
+
+Usage:
+    python benchmarks/resume_scorer_concurrency.py --requests 64 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from rate_limiter import RateLimiter
+from resume_scorer import ResumeScorer
+
+
+class SimulatedAsyncOpenAI:
+    """Stand-in for AsyncOpenAI that sleeps instead of calling the API"""
+
+    def __init__(self, latency: float, dim: int = 64):
+        self.latency = latency
+        self.dim = dim
+        self.embeddings = SimpleNamespace(create=self._create_embeddings)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_completion))
+
+    async def _create_embeddings(self, input: List[str], model: str):
+        await asyncio.sleep(self.latency)
+        data = []
+        for index, text in enumerate(input):
+            rng = random.Random(text)
+            data.append(SimpleNamespace(index=index, embedding=[rng.random() for _ in range(self.dim)]))
+        return SimpleNamespace(data=data, usage=SimpleNamespace(total_tokens=sum(len(t) // 4 for t in input)))
+
+    async def _create_completion(self, model: str, messages, n: int = 1, **kwargs):
+        await asyncio.sleep(self.latency * 4)
+        choices = [SimpleNamespace(message=SimpleNamespace(content=f"# Improved Resume\n\n{random.random()}"))
+                   for _ in range(n)]
+        return SimpleNamespace(choices=choices, usage=SimpleNamespace(total_tokens=500 * n))
+
+
+async def run_level(concurrency: int, requests: int, latency: float) -> float:
+    """Score `requests` distinct resumes with the given concurrency and return scores/second"""
+    # No client-side quota: the benchmark measures the scorer, not the limiter
+    scorer = ResumeScorer(openai_key="benchmark", max_concurrency=concurrency, max_retries=1,
+                          rate_limiter=RateLimiter())
+    scorer.client = SimulatedAsyncOpenAI(latency)
+    job_description = "Senior Python Developer with Django, REST APIs, PostgreSQL and AWS experience"
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        scorer.score_resume(f"Resume {i}: Python developer with Django experience", job_description)
+        for i in range(requests)
+    ))
+    elapsed = time.perf_counter() - start
+    return requests / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=64, help='score_resume calls per level')
+    parser.add_argument('--latency', type=float, default=0.05, help='simulated seconds per embedding request')
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    print(f"{'concurrency':>12} {'scores/sec':>12} {'speedup':>10}")
+    baseline = None
+    for level in args.levels:
+        throughput = await run_level(level, args.requests, args.latency)
+        baseline = baseline or throughput
+        print(f"{level:>12} {throughput:>12.1f} {throughput / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
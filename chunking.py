@@ -0,0 +1,109 @@
+"""
+Section/paragraph chunking and pooling for long-document embeddings.
+
+Documents are split on section headings and blank lines, paragraphs are packed
+into chunks of at most `max_chars`, and chunk embeddings are pooled into one
+document vector. Because chunks break at section boundaries, editing one line of
+a resume changes only the chunk that contains it.
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# Markdown headings, ALL-CAPS lines and "Title:" lines start a new section
+_HEADING_RE = re.compile(r'^\s*(#{1,6}\s+\S.*|[A-Z][A-Z &/]{2,}:?|[A-Z][A-Za-z &/]{1,40}:)\s*$')
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def _split_sections(text: str) -> List[str]:
+    sections = []
+    current: List[str] = []
+    for line in text.splitlines():
+        if _HEADING_RE.match(line) and any(l.strip() for l in current):
+            sections.append('\n'.join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append('\n'.join(current))
+    return sections
+
+
+def _split_oversized(paragraph: str, max_chars: int) -> List[str]:
+    """Split one paragraph that does not fit in a chunk on lines, then sentences, then hard cuts"""
+    pieces = []
+    for unit in re.split(r'\n', paragraph):
+        if len(unit) <= max_chars:
+            pieces.append(unit)
+            continue
+        for sentence in _SENTENCE_END_RE.split(unit):
+            while len(sentence) > max_chars:
+                pieces.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            pieces.append(sentence)
+    return _pack(pieces, max_chars, '\n')
+
+
+def _pack(pieces: Sequence[str], max_chars: int, separator: str) -> List[str]:
+    chunks = []
+    current = ''
+    for piece in pieces:
+        if not piece.strip():
+            continue
+        candidate = f"{current}{separator}{piece}" if current else piece
+        if len(candidate) <= max_chars:
+            current = candidate
+        else:
+            if current:
+                chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_into_chunks(text: str, max_chars: int = 2000) -> List[str]:
+    """
+    Split a document into embedding-sized chunks.
+
+    Args:
+        text: Document text (resume or job description)
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        Non-empty chunks in document order (a short document is a single chunk)
+    """
+    stripped = text.strip()
+    if len(stripped) <= max_chars:
+        return [stripped] if stripped else [text]
+
+    chunks = []
+    for section in _split_sections(stripped):
+        paragraphs = []
+        for paragraph in _PARAGRAPH_BREAK_RE.split(section):
+            paragraph = paragraph.strip()
+            if len(paragraph) > max_chars:
+                paragraphs.extend(_split_oversized(paragraph, max_chars))
+            elif paragraph:
+                paragraphs.append(paragraph)
+        chunks.extend(_pack(paragraphs, max_chars, '\n\n'))
+    return chunks
+
+
+def pool_embeddings(embeddings: Sequence[Sequence[float]],
+                    weights: Optional[Sequence[float]] = None) -> List[float]:
+    """
+    Pool chunk embeddings into one document vector.
+
+    Each chunk vector is L2-normalized and averaged with the given weights
+    (typically chunk lengths), so long chunks count more than short ones.
+    """
+    if len(embeddings) == 1:
+        return list(embeddings[0])
+    matrix = np.asarray(embeddings, dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    pooled = np.average(matrix / norms, axis=0, weights=weights)
+    return pooled.tolist()
@@ -0,0 +1,149 @@
+"""
+Process-wide registry of pooled API clients.
+
+Each ResumeScorer / EnhancedMatchingSystem used to build its own AsyncOpenAI or
+ollama.AsyncClient, and therefore its own HTTP connection pool, so short-lived
+instances paid a TLS handshake on almost every request. The registry hands out
+one client per (provider, API key, base URL) with a keep-alive pool of
+configurable size, negotiating HTTP/2 when the `h2` package is installed.
+
+httpx connections belong to the event loop that opened them, so clients are
+cached per running loop. A client requested outside a running loop is built
+fresh and never cached, since a later asyncio.run() would find its pool bound
+to a closed loop; callers should resolve clients from inside the loop that uses
+them. Call `aclose()` on shutdown to close the pools cleanly.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ClientKey = Tuple[str, str, str]
+
+
+@dataclass
+class PoolSettings:
+    """Connection pool settings applied to every client the registry creates"""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True               # only used when the h2 package is importable
+    timeout: Optional[float] = None  # None keeps each SDK's own default
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec('h2') is not None
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class ClientRegistry:
+    """Hands out shared, pooled OpenAI and Ollama clients"""
+
+    def __init__(self, settings: Optional[PoolSettings] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            settings: Pool size, keep-alive and HTTP/2 settings for new clients
+        """
+        self.settings = settings or PoolSettings()
+        self._lock = threading.Lock()
+        self._by_loop: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ClientKey, Any]]' = \
+            weakref.WeakKeyDictionary()
+        self.created = 0
+
+    def _slot(self) -> Optional[Dict[ClientKey, Any]]:
+        loop = _current_loop()
+        if loop is None:
+            return None
+        if loop not in self._by_loop:
+            self._by_loop[loop] = {}
+        return self._by_loop[loop]
+
+    def _httpx_options(self) -> Dict[str, Any]:
+        import httpx
+
+        settings = self.settings
+        use_http2 = settings.http2 and http2_available()
+        if settings.http2 and not use_http2:
+            logger.debug("h2 is not installed; API clients fall back to HTTP/1.1 keep-alive")
+        options: Dict[str, Any] = {
+            'limits': httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+            'http2': use_http2,
+        }
+        if settings.timeout is not None:
+            options['timeout'] = settings.timeout
+        return options
+
+    def _get(self, key: ClientKey, factory) -> Any:
+        with self._lock:
+            slot = self._slot()
+            if slot is None:
+                self.created += 1
+                return factory()
+            client = slot.get(key)
+            if client is None:
+                client = factory()
+                slot[key] = client
+                self.created += 1
+            return client
+
+    def get_openai(self, api_key: str, base_url: Optional[str] = None):
+        """Shared AsyncOpenAI client for this key and base URL"""
+        key_hash = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+        def factory():
+            import openai
+            http_client = openai.DefaultAsyncHttpxClient(**self._httpx_options())
+            return openai.AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+        return self._get(('openai', key_hash, base_url or ''), factory)
+
+    def get_ollama(self, host: Optional[str] = None):
+        """Shared ollama.AsyncClient for this host"""
+        def factory():
+            import ollama
+            return ollama.AsyncClient(host=host, **self._httpx_options())
+
+        return self._get(('ollama', '', host or ''), factory)
+
+    async def aclose(self) -> None:
+        """Close every client created on the running loop"""
+        with self._lock:
+            clients = []
+            loop = _current_loop()
+            if loop is not None and loop in self._by_loop:
+                clients.extend(self._by_loop.pop(loop).values())
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Error closing API client: {e}")
+
+
+_shared_client_registry: Optional[ClientRegistry] = None
+
+
+def get_shared_client_registry() -> ClientRegistry:
+    """Process-wide registry shared by every ResumeScorer and EnhancedMatchingSystem"""
+    global _shared_client_registry
+    if _shared_client_registry is None:
+        _shared_client_registry = ClientRegistry()
+    return _shared_client_registry
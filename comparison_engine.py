@@ -0,0 +1,381 @@
+"""
+Local, deterministic comparison of 22-variable job and candidate extractions.
+
+Replaces the GPT-4o comparison call in EnhancedMatchingSystem. Each job variable
+is aligned with its best candidate counterpart using normalized term overlap
+with skill synonyms, and optionally embedding similarity. Pairs are assigned
+greedily one-to-one, preferring the same category. Per-variable credit then
+follows the framework's matching logic: critical requirements are binary,
+competencies respect proficiency levels, experience checks numeric thresholds,
+and preferred qualifications count when present. Category scores, the weighted
+total and the significance tier are computed in code, so the same inputs always
+give the same MatchingResult.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from keyword_extractor import STOP_WORDS, TOKEN_RE
+
+CATEGORIES = ('critical_requirements', 'core_competencies', 'experience_factors', 'preferred_qualifications')
+
+DEFAULT_CATEGORY_WEIGHTS = {
+    'critical_requirements': 0.40,
+    'core_competencies': 0.35,
+    'experience_factors': 0.15,
+    'preferred_qualifications': 0.10,
+}
+
+# Multi-word aliases are rewritten before tokenizing, single-token aliases after
+PHRASE_SYNONYMS = {
+    'amazon web services': 'aws',
+    'google cloud platform': 'gcp',
+    'google cloud': 'gcp',
+    'microsoft azure': 'azure',
+    'continuous integration': 'ci-cd',
+    'continuous delivery': 'ci-cd',
+    'machine learning': 'ml',
+    'artificial intelligence': 'ai',
+    'natural language processing': 'nlp',
+    'computer science': 'cs',
+    "bachelor's degree": 'bachelor',
+    'bachelors degree': 'bachelor',
+    "master's degree": 'master',
+    'masters degree': 'master',
+    'rest api': 'rest',
+    'restful api': 'rest',
+}
+
+TOKEN_SYNONYMS = {
+    'js': 'javascript', 'ecmascript': 'javascript',
+    'node': 'nodejs', 'node.js': 'nodejs',
+    'react.js': 'react', 'reactjs': 'react',
+    'vue.js': 'vue', 'vuejs': 'vue',
+    'postgres': 'postgresql', 'psql': 'postgresql',
+    'mongo': 'mongodb',
+    'k8s': 'kubernetes',
+    'py': 'python', 'python3': 'python',
+    'ci': 'ci-cd', 'cicd': 'ci-cd', 'ci/cd': 'ci-cd',
+    'restful': 'rest',
+    'bsc': 'bachelor', 'b.s': 'bachelor', 'bachelors': 'bachelor',
+    'msc': 'master', 'm.s': 'master', 'masters': 'master',
+    'phd': 'doctorate',
+    'sql-server': 'mssql',
+}
+
+_DEGREE_CONTEXT = frozenset({
+    'bs', 'ba', 'ms', 'bachelor', 'master', 'doctorate', 'degree', 'diploma', 'graduate', 'university',
+    'college', 'cs', 'computer', 'science', 'engineering', 'mathematics', 'math', 'physics', 'statistics',
+    'economics', 'business', 'finance', 'information',
+})
+_LANGUAGE_CONTEXT = frozenset({
+    'go', 'golang', 'ts', 'typescript', 'javascript', 'js', 'python', 'java', 'kotlin', 'scala', 'rust',
+    'ruby', 'php', 'swift', 'c', 'c++', 'c#', 'nodejs', 'node', 'react', 'angular', 'vue', 'programming',
+    'language', 'languages', 'developer', 'development', 'backend', 'frontend', 'microservices', 'grpc',
+})
+
+# Short aliases that are also ordinary words or other abbreviations ("MS Excel",
+# "TS/SCI", "go to market"): folded only next to a word of the given context,
+# or when they are the text's only term
+CONTEXTUAL_SYNONYMS = {
+    'bs': ('bachelor', _DEGREE_CONTEXT),
+    'ba': ('bachelor', _DEGREE_CONTEXT),
+    'ms': ('master', _DEGREE_CONTEXT),
+    'ts': ('typescript', _LANGUAGE_CONTEXT),
+    'go': ('golang', _LANGUAGE_CONTEXT),
+    'cd': ('ci-cd', frozenset({'ci', 'ci-cd', 'continuous', 'pipeline', 'pipelines', 'deployment'})),
+}
+
+_PHRASE_RE = re.compile(
+    r'(?<![\w\-])(' + '|'.join(re.escape(phrase) for phrase in sorted(PHRASE_SYNONYMS, key=len, reverse=True))
+    + r')(?![\w\-])'
+)
+
+# Words that say nothing about which skill a variable is about
+GENERIC_TERMS = frozenset({
+    'experience', 'experienced', 'years', 'year', 'skills', 'skill', 'knowledge', 'strong',
+    'proficiency', 'proficient', 'ability', 'required', 'requirement', 'preferred', 'plus',
+    'working', 'work', 'understanding', 'familiarity', 'familiar', 'background', 'solid',
+    'excellent', 'good', 'using', 'related', 'field', 'equivalent', 'level', 'degree',
+})
+
+PROFICIENCY_LEVELS = {'beginner': 1, 'basic': 1, 'intermediate': 2, 'advanced': 3, 'expert': 4}
+
+_NUMBER_RE = re.compile(r'(\d+(?:\.\d+)?)')
+
+
+def _truthy(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 'yes', 'y', '1', 'present')
+    return bool(value)
+
+
+def normalize_terms(text: str) -> FrozenSet[str]:
+    """
+    Canonical skill terms of a text: lower-cased, synonyms folded, filler words dropped.
+
+    Phrase aliases are only replaced as whole words, so "rest apis" is not read as "rest api".
+    """
+    text = _PHRASE_RE.sub(lambda match: PHRASE_SYNONYMS[match.group(1)], (text or '').lower())
+    tokens = [token for token in TOKEN_RE.findall(text) if token not in STOP_WORDS]
+    terms = set()
+    for index, token in enumerate(tokens):
+        if token in CONTEXTUAL_SYNONYMS:
+            canonical, context = CONTEXTUAL_SYNONYMS[token]
+            neighbours = tokens[max(0, index - 1):index] + tokens[index + 1:index + 2]
+            if len(tokens) == 1 or any(neighbour in context for neighbour in neighbours):
+                token = canonical
+        token = TOKEN_SYNONYMS.get(token, token)
+        if token not in GENERIC_TERMS:
+            terms.add(token)
+    return frozenset(terms)
+
+
+def _first_number(*texts: Any) -> Optional[float]:
+    for text in texts:
+        if isinstance(text, (int, float)) and not isinstance(text, bool):
+            return float(text)
+        match = _NUMBER_RE.search(str(text or ''))
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def _level(value: Any) -> Optional[int]:
+    return PROFICIENCY_LEVELS.get(str(value or '').strip().lower())
+
+
+@dataclass
+class MatchingResult:
+    """Result of job-candidate matching analysis"""
+    total_score: float
+    confidence_level: float
+    statistical_significance: bool
+    category_scores: Dict[str, float]
+    variable_matches: Dict[str, bool]
+    missing_critical: List[str]
+    recommendations: List[str]
+    evidence_summary: Dict[str, str]
+    metrics: Optional[Dict] = field(default=None)  # per-stage timings/tokens of the producing request
+
+
+@dataclass
+class VariableComparison:
+    """One job variable and the candidate variable aligned with it"""
+    category: str
+    variable: str
+    job: Dict[str, Any]
+    candidate: Optional[Dict[str, Any]] = None
+    candidate_category: Optional[str] = None
+    similarity: float = 0.0
+    credit: float = 0.0
+    match: bool = False
+    notes: str = ''
+
+    @property
+    def evidence(self) -> str:
+        if self.candidate is None or not _truthy(self.candidate.get('present', True)):
+            return 'Not found'
+        return str(self.candidate.get('evidence') or self.candidate.get('details') or self.candidate.get('variable', ''))
+
+
+@dataclass
+class _Variable:
+    category: str
+    data: Dict[str, Any]
+    name_terms: FrozenSet[str]
+    text_terms: FrozenSet[str] = field(default_factory=frozenset)
+
+
+def _variables(document: Dict[str, Any], include_evidence: bool) -> List[_Variable]:
+    variables = []
+    for category in CATEGORIES:
+        for _, data in sorted((document.get(category) or {}).items()):
+            if not isinstance(data, dict):
+                continue
+            name_terms = normalize_terms(str(data.get('variable', '')))
+            text = ' '.join(str(data.get(k, '')) for k in ('variable', 'description', 'evidence', 'details'))
+            variables.append(_Variable(category, data, name_terms,
+                                       normalize_terms(text) if include_evidence else name_terms))
+    return variables
+
+
+class ComparisonEngine:
+    """Aligns and scores job vs candidate variables without an LLM call"""
+
+    def __init__(self,
+                 category_weights: Optional[Dict[str, float]] = None,
+                 significance_threshold: int = 14,
+                 strong_evidence_threshold: int = 16,
+                 excellent_evidence_threshold: int = 18,
+                 match_threshold: float = 0.5,
+                 cross_category_penalty: float = 0.85,
+                 embedder: Optional[Any] = None):
+        """
+        Initialize the comparison engine.
+
+        Args:
+            category_weights: Weight of each category in the total score
+            significance_threshold: Matches out of 22 needed for p < 0.05
+            strong_evidence_threshold: Matches needed for p < 0.01
+            excellent_evidence_threshold: Matches needed for p < 0.001
+            match_threshold: Minimum similarity for two variables to be aligned
+            cross_category_penalty: Similarity multiplier when the candidate variable is in another category
+            embedder: Optional object with embed_matrix(texts) returning L2-normalized rows
+                      (e.g. HashingEmbedder), used alongside term overlap
+        """
+        self.category_weights = category_weights or DEFAULT_CATEGORY_WEIGHTS
+        self.significance_threshold = significance_threshold
+        self.strong_evidence_threshold = strong_evidence_threshold
+        self.excellent_evidence_threshold = excellent_evidence_threshold
+        self.match_threshold = match_threshold
+        self.cross_category_penalty = cross_category_penalty
+        self.embedder = embedder
+
+    def significance_tier(self, total_matches: int) -> Tuple[bool, float, str]:
+        """(statistically significant, confidence level %, tier name) for a match count"""
+        if total_matches >= self.excellent_evidence_threshold:
+            return True, 99.9, 'excellent'
+        if total_matches >= self.strong_evidence_threshold:
+            return True, 99.0, 'strong'
+        if total_matches >= self.significance_threshold:
+            return True, 95.0, 'significant'
+        return False, 0.0, 'none'
+
+    @staticmethod
+    def term_similarity(job: _Variable, candidate: _Variable) -> float:
+        """Share of the job variable's terms found in the candidate variable's name and evidence"""
+        if not job.name_terms:
+            return 0.0
+        name_score = len(job.name_terms & candidate.name_terms) / len(job.name_terms)
+        evidence_score = len(job.name_terms & candidate.text_terms) / len(job.name_terms)
+        return max(name_score, 0.8 * evidence_score)
+
+    def _similarity_matrix(self, job_vars: List[_Variable], candidate_vars: List[_Variable]) -> List[List[float]]:
+        matrix = [[self.term_similarity(j, c) for c in candidate_vars] for j in job_vars]
+        if self.embedder is not None and job_vars and candidate_vars:
+            job_vectors = self.embedder.embed_matrix([str(j.data.get('variable', '')) for j in job_vars])
+            candidate_vectors = self.embedder.embed_matrix(
+                [f"{c.data.get('variable', '')} {c.data.get('evidence', '')}" for c in candidate_vars]
+            )
+            cosine = job_vectors @ candidate_vectors.T
+            for i, row in enumerate(matrix):
+                for k in range(len(row)):
+                    row[k] = max(row[k], float(cosine[i, k]))
+        for i, job in enumerate(job_vars):
+            for k, candidate in enumerate(candidate_vars):
+                if candidate.category != job.category:
+                    matrix[i][k] *= self.cross_category_penalty
+        return matrix
+
+    def align(self, job_variables: Dict[str, Any], candidate_variables: Dict[str, Any]) -> List[VariableComparison]:
+        """Pair every job variable with at most one candidate variable and score the pair"""
+        job_vars = _variables(job_variables, include_evidence=False)
+        candidate_vars = _variables(candidate_variables, include_evidence=True)
+        matrix = self._similarity_matrix(job_vars, candidate_vars)
+
+        ranked = sorted(
+            ((matrix[i][k], i, k) for i in range(len(job_vars)) for k in range(len(candidate_vars))),
+            key=lambda item: (-item[0], item[1], item[2])
+        )
+        assigned: Dict[int, Tuple[int, float]] = {}
+        used = set()
+        for score, i, k in ranked:
+            if score < self.match_threshold:
+                break
+            if i in assigned or k in used:
+                continue
+            assigned[i] = (k, score)
+            used.add(k)
+
+        comparisons = []
+        for i, job in enumerate(job_vars):
+            comparison = VariableComparison(job.category, str(job.data.get('variable', '')), job.data)
+            if i in assigned:
+                k, score = assigned[i]
+                comparison.candidate = candidate_vars[k].data
+                comparison.candidate_category = candidate_vars[k].category
+                comparison.similarity = round(score, 4)
+            self._credit(comparison)
+            comparisons.append(comparison)
+        return comparisons
+
+    def _credit(self, comparison: VariableComparison) -> None:
+        candidate = comparison.candidate
+        if candidate is None:
+            comparison.notes = 'No corresponding qualification found'
+            return
+        if not _truthy(candidate.get('present', True)):
+            comparison.notes = 'Candidate lacks this qualification'
+            return
+
+        credit, notes = 1.0, 'Matched'
+        if comparison.category == 'core_competencies':
+            required = _level(comparison.job.get('proficiency_level'))
+            actual = _level(candidate.get('proficiency_level'))
+            if required and actual and actual < required:
+                credit = 0.5 if actual == required - 1 else 0.25
+                notes = (f"Proficiency gap: {candidate.get('proficiency_level')} vs "
+                         f"{comparison.job.get('proficiency_level')} required")
+        elif comparison.category == 'experience_factors':
+            required = _first_number(comparison.job.get('minimum_threshold'))
+            actual = _first_number(candidate.get('years_experience'), candidate.get('measurement'))
+            if required is not None and actual is not None:
+                if actual < required:
+                    credit, notes = actual / required, f"Below threshold: {actual:g} vs {required:g}"
+            elif 'meets_threshold' in candidate and not _truthy(candidate['meets_threshold']):
+                credit, notes = 0.5, 'Present but below the required threshold'
+        comparison.credit = credit
+        comparison.match = credit >= 1.0
+        comparison.notes = notes
+
+    def compare(self, job_variables: Dict[str, Any], candidate_variables: Dict[str, Any]) -> MatchingResult:
+        """Align both extractions and return the scored MatchingResult"""
+        return self.score(self.align(job_variables, candidate_variables))
+
+    def score(self, comparisons: List[VariableComparison]) -> MatchingResult:
+        """Turn aligned comparisons into a MatchingResult"""
+        by_category: Dict[str, List[VariableComparison]] = {category: [] for category in CATEGORIES}
+        for comparison in comparisons:
+            by_category[comparison.category].append(comparison)
+
+        category_scores = {
+            category: round(100.0 * sum(c.credit for c in items) / len(items), 1) if items else 0.0
+            for category, items in by_category.items()
+        }
+        total_score = sum(category_scores[category] * self.category_weights.get(category, 0.0)
+                          for category in CATEGORIES)
+        total_matches = sum(c.match for c in comparisons)
+        statistical_significance, confidence_level, tier = self.significance_tier(total_matches)
+
+        missing_critical = [
+            c.variable for c in by_category['critical_requirements']
+            if not c.match and _truthy(c.job.get('disqualifier', True))
+        ]
+        return MatchingResult(
+            total_score=total_score,
+            confidence_level=confidence_level,
+            statistical_significance=statistical_significance,
+            category_scores=category_scores,
+            variable_matches={c.variable: c.match for c in comparisons},
+            missing_critical=missing_critical,
+            recommendations=self.recommendations(comparisons, total_matches, tier, missing_critical),
+            evidence_summary={c.variable: c.evidence for c in comparisons},
+        )
+
+    @staticmethod
+    def recommendations(comparisons: List[VariableComparison], total_matches: int,
+                        tier: str, missing_critical: List[str]) -> List[str]:
+        """Rule-based next steps derived from the alignment"""
+        next_step = {
+            'excellent': 'Advance to interview: excellent evidence of fit',
+            'strong': 'Advance to interview: strong evidence of fit',
+            'significant': 'Schedule a screening call to confirm the remaining gaps',
+            'none': 'Do not advance unless the gaps below can be addressed',
+        }[tier]
+        steps = [f"{next_step} ({total_matches}/{len(comparisons)} variables matched)"]
+        steps.extend(f"Verify or obtain critical requirement: {name}" for name in missing_critical)
+        gaps = [c for c in comparisons if c.category == 'core_competencies' and not c.match]
+        steps.extend(f"Probe {c.variable}: {c.notes.lower()}" for c in gaps[:3])
+        return steps
@@ -0,0 +1,219 @@
+"""
+Content-addressed embedding cache for ResumeScorer.
+
+Embeddings are keyed by embedding model name + SHA-256 of the normalized input
+text, kept in an in-memory LRU and optionally persisted to a SQLite file so
+repeated job/resume texts are never re-embedded across runs.
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before hashing so trivial whitespace edits share a key"""
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def make_cache_key(model: str, text: str) -> str:
+    """Build the cache key for an (embedding model, input text) pair"""
+    digest = hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+    return f"{model}:{digest}"
+
+
+def _pack(vector: List[float]) -> bytes:
+    return struct.pack(f'<{len(vector)}f', *vector)
+
+
+def _unpack(blob: bytes) -> List[float]:
+    return list(struct.unpack(f'<{len(blob) // 4}f', blob))
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for an embedding cache"""
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class EmbeddingCache:
+    """
+    Two-level embedding cache: in-memory LRU in front of an optional SQLite file.
+
+    The memory level is bounded by ``max_entries``; the disk level is bounded by
+    ``max_disk_entries`` and evicts least-recently-used rows when it grows past it.
+    Disk bookkeeping stays off the read path: the row count is tracked in memory
+    (eviction trims the table to 90% of the bound in one batch), and disk hits
+    only buffer their last_used timestamps, which are written with the next put,
+    every ``touch_batch_size`` hits, or on close().
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 max_entries: int = 10000,
+                 max_disk_entries: Optional[int] = 200000,
+                 touch_batch_size: int = 256):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            path: SQLite file for persistence (None keeps the cache in memory only)
+            max_entries: Maximum number of vectors held in the in-memory LRU
+            max_disk_entries: Maximum number of rows kept on disk (None = unbounded)
+            touch_batch_size: Buffered last_used updates that trigger a write
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.touch_batch_size = touch_batch_size
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Upper bound on the disk row count (puts that replace a row still count once)
+        self._disk_rows = 0
+        self._pending_touches: Dict[str, float] = {}
+
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)"
+            )
+            self._conn.commit()
+            self._disk_rows = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Return the cached embedding for text, or None on a miss"""
+        key = make_cache_key(model, text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.stats.hits += 1
+                return vector
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    vector = _unpack(row[0])
+                    self._pending_touches[key] = time.time()
+                    if len(self._pending_touches) >= self.touch_batch_size:
+                        self._flush_touches()
+                        self._conn.commit()
+                    self._remember(key, vector)
+                    self.stats.hits += 1
+                    self.stats.disk_hits += 1
+                    return vector
+
+            self.stats.misses += 1
+            return None
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """Look up several texts at once, preserving input order"""
+        return [self.get(model, text) for text in texts]
+
+    def put(self, model: str, text: str, vector: List[float]) -> None:
+        """Store an embedding for text"""
+        key = make_cache_key(model, text)
+        with self._lock:
+            self._remember(key, list(vector))
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                    (key, _pack(vector), time.time())
+                )
+                self._disk_rows += 1
+                self._flush_touches()
+                self._evict_disk()
+                self._conn.commit()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _flush_touches(self) -> None:
+        if self._pending_touches:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._pending_touches.items()]
+            )
+            self._pending_touches.clear()
+
+    def _evict_disk(self) -> None:
+        if self.max_disk_entries is None or self._disk_rows <= self.max_disk_entries:
+            return
+        # The tracked count may include replaced rows; recount only when it crosses the bound
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - int(self.max_disk_entries * 0.9) if count > self.max_disk_entries else 0
+        self._disk_rows = count - overflow
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                "SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+            self.stats.evictions += overflow
+
+    def __len__(self) -> int:
+        if self._conn is not None:
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return len(self._memory)
+
+    def clear(self) -> None:
+        """Drop every cached embedding (memory and disk)"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM embeddings")
+                self._conn.commit()
+                self._disk_rows = 0
+                self._pending_touches.clear()
+
+    def close(self) -> None:
+        """Write buffered last_used updates and close the underlying SQLite connection"""
+        if self._conn is not None:
+            with self._lock:
+                self._flush_touches()
+                self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def get_stats(self) -> Dict[str, float]:
+        """Return hit/miss counters as a plain dict"""
+        return {
+            'hits': self.stats.hits,
+            'misses': self.stats.misses,
+            'disk_hits': self.stats.disk_hits,
+            'evictions': self.stats.evictions,
+            'hit_rate': self.stats.hit_rate,
+            'memory_entries': len(self._memory),
+        }
@@ -0,0 +1,293 @@
+"""
+Compact quantized, memory-mapped embedding store.
+
+Vectors are stored as float16 or int8 (with a per-vector float32 scale) in a
+flat memory-mapped file, with a JSON id-to-row index next to it. Readers get
+zero-copy NumPy views of the quantized rows, so many worker processes can share
+one job-embedding corpus through the page cache instead of each holding
+List[float] copies.
+
+The store is a standalone building block: ResumeScorer, batch_score and the
+matching system keep using their own embedding caches and do not read from or
+write to it. Callers that precompute a shared job-embedding corpus populate it
+themselves (e.g. from ResumeScorer.get_document_embeddings) and query it with
+similarities() or hand matrix() to another index.
+
+Files for a store at `path`:
+    path.vec       quantized vectors, one fixed-size row per id
+    path.scale     per-row float32 scales (int8 stores only)
+    path.idx.json  dim, dtype, row count and the id -> row index
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+SUPPORTED_DTYPES = {'float16': np.float16, 'int8': np.int8}
+
+
+def quantize(vectors, dtype: str):
+    """
+    Quantize float vectors (one per row) to dtype.
+
+    Returns:
+        Tuple of (quantized matrix, per-row float32 scales or None)
+    """
+    matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    if dtype == 'float16':
+        return matrix.astype(np.float16), None
+    if dtype == 'int8':
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+    raise ValueError(f"Unsupported dtype {dtype!r}; expected one of {sorted(SUPPORTED_DTYPES)}")
+
+
+def dequantize(quantized: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    """Convert quantized rows back to float32"""
+    matrix = quantized.astype(np.float32)
+    if scales is not None:
+        matrix *= np.asarray(scales, dtype=np.float32).reshape(-1, 1)
+    return matrix
+
+
+def quantization_report(vectors, dtype: str = 'int8', top_k: int = 10,
+                        n_queries: int = 100, seed: int = 0) -> Dict[str, float]:
+    """
+    Measure the accuracy lost by quantizing vectors to dtype.
+
+    Reports per-vector cosine similarity between original and quantized vectors,
+    the absolute error of query-to-vector similarities, top-k retrieval overlap
+    against float32 using sampled rows as queries, and bytes per vector.
+    """
+    original = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    quantized, scales = quantize(original, dtype)
+    restored = dequantize(quantized, scales)
+
+    def unit(m):
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return m / norms
+
+    original_unit, restored_unit = unit(original), unit(restored)
+    self_cosine = np.sum(original_unit * restored_unit, axis=1)
+
+    rng = np.random.default_rng(seed)
+    query_rows = rng.choice(original.shape[0], min(n_queries, original.shape[0]), replace=False)
+    exact = original_unit[query_rows] @ original_unit.T
+    approx = original_unit[query_rows] @ restored_unit.T
+    k = min(top_k, original.shape[0])
+    overlaps = []
+    for exact_row, approx_row in zip(exact, approx):
+        exact_top = set(np.argpartition(-exact_row, k - 1)[:k].tolist())
+        approx_top = set(np.argpartition(-approx_row, k - 1)[:k].tolist())
+        overlaps.append(len(exact_top & approx_top) / k)
+
+    bytes_per_vector = quantized.shape[1] * quantized.itemsize + (4 if scales is not None else 0)
+    return {
+        'dtype': dtype,
+        'vectors': int(original.shape[0]),
+        'mean_self_cosine': float(self_cosine.mean()),
+        'min_self_cosine': float(self_cosine.min()),
+        'mean_similarity_error': float(np.abs(exact - approx).mean()),
+        'max_similarity_error': float(np.abs(exact - approx).max()),
+        f'recall_at_{k}': float(np.mean(overlaps)),
+        'bytes_per_vector': int(bytes_per_vector),
+        'float32_bytes_per_vector': int(original.shape[1] * 4),
+    }
+
+
+class EmbeddingStore:
+    """
+    Append-only quantized embedding store backed by memory-mapped files.
+
+    Open with mode='r' in worker processes to share one read-only copy of the
+    corpus; writers use mode='r+' (the default), which creates the store if needed.
+    """
+
+    def __init__(self, path: str, dim: Optional[int] = None, dtype: str = 'float16',
+                 mode: str = 'r+', normalize: bool = True):
+        """
+        Open or create an embedding store.
+
+        Args:
+            path: Base path of the store files
+            dim: Vector dimension (required when creating a new store)
+            dtype: 'float16' or 'int8' (ignored when opening an existing store)
+            mode: 'r' for read-only shared access, 'r+' for read/write
+            normalize: L2-normalize vectors before quantizing (best for cosine scoring)
+        """
+        self.path = path
+        self.mode = mode
+        self.normalize = normalize
+        self._index_path = f"{path}.idx.json"
+        self._vec_path = f"{path}.vec"
+        self._scale_path = f"{path}.scale"
+
+        if os.path.exists(self._index_path):
+            with open(self._index_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            self.dim = meta['dim']
+            self.dtype = meta['dtype']
+            self._count = meta['count']
+            self._capacity = meta['capacity']
+            self._row_of: Dict[str, int] = meta['rows']
+        else:
+            if mode == 'r':
+                raise FileNotFoundError(f"No embedding store at {path}")
+            if dim is None:
+                raise ValueError("dim is required to create a new embedding store")
+            if dtype not in SUPPORTED_DTYPES:
+                raise ValueError(f"Unsupported dtype {dtype!r}; expected one of {sorted(SUPPORTED_DTYPES)}")
+            self.dim = dim
+            self.dtype = dtype
+            self._count = 0
+            self._capacity = 0
+            self._row_of = {}
+            open(self._vec_path, 'wb').close()
+            if dtype == 'int8':
+                open(self._scale_path, 'wb').close()
+            self._write_index()
+
+        self._np_dtype = SUPPORTED_DTYPES[self.dtype]
+        self._open_maps()
+
+    def _open_maps(self) -> None:
+        if self._capacity == 0:
+            self._vectors = np.zeros((0, self.dim), dtype=self._np_dtype)
+            self._scales = np.zeros(0, dtype=np.float32) if self.dtype == 'int8' else None
+            return
+        self._vectors = np.memmap(self._vec_path, dtype=self._np_dtype, mode=self.mode,
+                                  shape=(self._capacity, self.dim))
+        self._scales = (np.memmap(self._scale_path, dtype=np.float32, mode=self.mode, shape=(self._capacity,))
+                        if self.dtype == 'int8' else None)
+
+    def _grow(self, needed: int) -> None:
+        new_capacity = max(needed, self._capacity * 2, 1024)
+        self.flush()
+        self._vectors = self._scales = None
+        row_bytes = self.dim * np.dtype(self._np_dtype).itemsize
+        with open(self._vec_path, 'r+b') as f:
+            f.truncate(new_capacity * row_bytes)
+        if self.dtype == 'int8':
+            with open(self._scale_path, 'r+b') as f:
+                f.truncate(new_capacity * 4)
+        self._capacity = new_capacity
+        self._open_maps()
+
+    def _write_index(self) -> None:
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'dim': self.dim, 'dtype': self.dtype, 'count': self._count,
+                       'capacity': self._capacity, 'rows': self._row_of}, f)
+        os.replace(tmp_path, self._index_path)
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, vector_id: str) -> bool:
+        return vector_id in self._row_of
+
+    @property
+    def ids(self) -> List[str]:
+        """Ids in row order"""
+        return sorted(self._row_of, key=self._row_of.__getitem__)
+
+    def add(self, ids: Sequence[str], vectors) -> None:
+        """
+        Append vectors under ids; an existing id is overwritten in place.
+
+        Args:
+            ids: Vector identifiers
+            vectors: One vector per id
+        """
+        if self.mode == 'r':
+            raise PermissionError("Embedding store is open read-only")
+        matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if matrix.shape != (len(ids), self.dim):
+            raise ValueError(f"Expected {len(ids)} vectors of dimension {self.dim}, got {matrix.shape}")
+        if self.normalize:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+        quantized, scales = quantize(matrix, self.dtype)
+
+        rows = []
+        for vector_id in ids:
+            row = self._row_of.get(vector_id)
+            if row is None:
+                row = self._count
+                self._row_of[vector_id] = row
+                self._count += 1
+            rows.append(row)
+        if self._count > self._capacity:
+            self._grow(self._count)
+
+        self._vectors[rows] = quantized
+        if scales is not None:
+            self._scales[rows] = scales
+
+    def get(self, vector_id: str) -> np.ndarray:
+        """Return one vector dequantized to float32"""
+        row = self._row_of[vector_id]
+        scales = self._scales[row:row + 1] if self._scales is not None else None
+        return dequantize(self._vectors[row:row + 1], scales)[0]
+
+    def get_many(self, ids: Iterable[str]) -> np.ndarray:
+        """Return several vectors dequantized to float32, one per row"""
+        rows = [self._row_of[vector_id] for vector_id in ids]
+        scales = self._scales[rows] if self._scales is not None else None
+        return dequantize(self._vectors[rows], scales)
+
+    def raw_matrix(self) -> np.ndarray:
+        """
+        Zero-copy view of the rows as stored, one per id in row order.
+
+        These are the quantized values, not the original vectors: float16 rows,
+        or int8 rows that still need their raw_scales() factor. Use matrix() or
+        dequantize(raw_matrix(), raw_scales()) for float32 vectors.
+        """
+        return self._vectors[:self._count]
+
+    def raw_scales(self) -> Optional[np.ndarray]:
+        """Zero-copy view of the per-row int8 scales (None for float16 stores)"""
+        return self._scales[:self._count] if self._scales is not None else None
+
+    def matrix(self) -> np.ndarray:
+        """All vectors dequantized to float32, in row order"""
+        return dequantize(self.raw_matrix(), self.raw_scales())
+
+    def similarities(self, query, block_rows: int = 65536) -> np.ndarray:
+        """
+        Dot products of query against every stored row.
+
+        Rows are upcast to float32 one block at a time and int8 scales are applied
+        after the product, so the full corpus is never expanded in memory.
+        """
+        query_vector = np.asarray(query, dtype=np.float32).reshape(-1)
+        raw = self.raw_matrix()
+        scores = np.empty(raw.shape[0], dtype=np.float32)
+        for start in range(0, raw.shape[0], block_rows):
+            block = raw[start:start + block_rows]
+            scores[start:start + block.shape[0]] = block.astype(np.float32) @ query_vector
+        if self._scales is not None:
+            scores *= self.raw_scales()
+        return scores
+
+    def flush(self) -> None:
+        """Write pending vectors and the id index to disk"""
+        if self.mode == 'r':
+            return
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+        if isinstance(self._scales, np.memmap):
+            self._scales.flush()
+        self._write_index()
+
+    def close(self) -> None:
+        """Flush and release the memory maps"""
+        self.flush()
+        self._vectors = self._scales = None
@@ -4,26 +4,69 @@ Enhanced Job-Candidate Matching System using GPT-4o
 Implements the 22-variable structured extraction and statistical comparison framework
 """
 
+import copy
 import json
 import asyncio
-from typing import Dict, List, Tuple, Optional
-from openai import OpenAI
-import numpy as np
-from scipy import stats
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Tuple, Optional
 from datetime import datetime
 
-@dataclass
-class MatchingResult:
-    """Result of job-candidate matching analysis"""
-    total_score: float
-    confidence_level: float
-    statistical_significance: bool
-    category_scores: Dict[str, float]
-    variable_matches: Dict[str, bool]
-    missing_critical: List[str]
-    recommendations: List[str]
-    evidence_summary: Dict[str, str]
+from batch_backend import BatchBackend, BatchRequest, OpenAIBatchBackend, run_batch
+from comparison_engine import ComparisonEngine, MatchingResult, VariableComparison
+from client_registry import ClientRegistry, get_shared_client_registry
+from extraction_cache import ExtractionCache, candidate_cache_key, job_cache_key
+from extraction_schema import CATEGORY_LAYOUT, response_format, validate_variable_document
+from job_dedup import JobDeduplicator
+from json_repair import IncrementalJSONParser, Path, parse_json
+from prompt_compaction import compact_for_comparison, compact_json, dedupe_resume_data, report_compaction
+from rate_limiter import RateLimiter, estimate_chat_tokens, get_shared_rate_limiter
+from resilience import Resilience
+from metrics import MetricsCollector, record_cache_hits, record_queue_wait, record_usage, track_stage
+
+# Bump when an extraction prompt or its output schema changes so cached extractions are not reused
+JOB_EXTRACTION_PROMPT_VERSION = 'job-v1'
+CANDIDATE_EXTRACTION_PROMPT_VERSION = 'candidate-v2'
+
+# Typical completion size per stage, reserved against TPM quotas instead of max_tokens
+# (the rate limiter's settle() corrects each reservation to the reported usage)
+EXPECTED_COMPLETION_TOKENS = {
+    'job_extraction': 1500,
+    'candidate_extraction': 1500,
+    'comparison': 2500,
+    'recommendations': 400,
+}
+
+# create_comparison_table modes: scored locally, locally plus GPT-written next steps, or fully by GPT
+COMPARISON_MODES = ('local', 'narrative', 'llm')
+
+# Called with (path, value) as each extracted category or variable finishes streaming,
+# e.g. (('core_competencies', 'comp_3'), {...}) and then (('core_competencies',), {...})
+FieldCallback = Callable[[Path, object], None]
+
+
+def _replay_fields(document: Dict, on_field: Optional[FieldCallback]) -> Dict:
+    """Report an already complete extraction to on_field in streaming order"""
+    if on_field is not None:
+        for section, value in document.items():
+            if isinstance(value, dict):
+                for name, field in value.items():
+                    on_field((section, name), field)
+            on_field((section,), value)
+    return document
+
+
+def _changed_fields_only(on_field: FieldCallback) -> FieldCallback:
+    """Wrap on_field so a path is only reported again when its value changed"""
+    reported: Dict[Path, object] = {}
+    
+    def report(path: Path, value: object) -> None:
+        if path in reported and reported[path] == value:
+            return
+        reported[path] = value
+        on_field(path, value)
+    
+    return report
+
 
 class EnhancedMatchingSystem:
     """
@@ -31,9 +74,60 @@ class EnhancedMatchingSystem:
     and statistical comparison based on the 22-variable framework.
     """
     
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, api_key: str, rate_limiter: Optional[RateLimiter] = None,
+                 resilience: Optional[Resilience] = None, base_url: Optional[str] = None,
+                 metrics: Optional[MetricsCollector] = None,
+                 client_registry: Optional[ClientRegistry] = None,
+                 extraction_cache: Optional[ExtractionCache] = None,
+                 extraction_cache_path: Optional[str] = None,
+                 comparison_mode: str = 'local',
+                 comparison_engine: Optional[ComparisonEngine] = None,
+                 structured_outputs: bool = True,
+                 compact_prompts: bool = True,
+                 job_deduplicator: Optional[JobDeduplicator] = None,
+                 dedupe_jobs: bool = False,
+                 match_result_cache_size: int = 1024,
+                 batch_backend: Optional[BatchBackend] = None,
+                 batch_dir: Optional[str] = None,
+                 batch_poll_interval: float = 30.0):
+        if comparison_mode not in COMPARISON_MODES:
+            raise ValueError(f"comparison_mode must be one of {COMPARISON_MODES}")
+        # Pooled client shared with every other instance using the same key and base URL,
+        # resolved inside the running loop (see the client property)
+        self.client_registry = client_registry or get_shared_client_registry()
+        self.api_key = api_key
+        self.base_url = base_url
+        self._client = None
         self.model = "gpt-4o"
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        # Retries with jittered backoff (and optional hedging) for each stage's GPT call
+        self.resilience = resilience or Resilience()
+        # Per-stage timings, queue wait, tokens and retries for every analysis
+        self.metrics = metrics or MetricsCollector()
+        # One extraction per distinct job and resume version, shared by every pairing
+        if extraction_cache is None:
+            extraction_cache = ExtractionCache(path=extraction_cache_path)
+        self.extraction_cache = extraction_cache
+        self._inflight_extractions: Dict[str, asyncio.Future] = {}
+        # Opt-in (dedupe_jobs, or passing a deduplicator): near-duplicate postings of the same
+        # company and title resolve to the first copy's extraction and results
+        if job_deduplicator is None and dedupe_jobs:
+            job_deduplicator = JobDeduplicator()
+        self.job_deduplicator = job_deduplicator
+        # Finished comparisons per (job, candidate) extraction pair, reused for repeated and duplicate jobs
+        self.match_result_cache_size = match_result_cache_size
+        self.comparisons_reused = 0
+        self._match_results: "OrderedDict[Tuple[str, str], MatchingResult]" = OrderedDict()
+        self._inflight_comparisons: Dict[Tuple[str, str], asyncio.Future] = {}
+        # Offline batch processing for backfills (analyze_many(batch=True), batch_extract);
+        # defaults to the OpenAI Batch API on the same client
+        self.batch_backend = batch_backend
+        self.batch_dir = batch_dir
+        self.batch_poll_interval = batch_poll_interval
+        # Ask for schema-constrained extractions; switched off if the endpoint rejects response_format
+        self.structured_outputs = structured_outputs
+        # Send only the fields each stage reads, serialized compactly (see prompt_compaction)
+        self.compact_prompts = compact_prompts
         
         # Statistical thresholds from optimal matching research
         self.TOTAL_VARIABLES = 22
@@ -49,18 +143,231 @@ class EnhancedMatchingSystem:
             'preferred_qualifications': 0.10
         }
         
-        self.VARIABLE_COUNTS = {
-            'critical_requirements': 5,
-            'core_competencies': 8,
-            'experience_factors': 4,
-            'preferred_qualifications': 5
-        }
+        self.VARIABLE_COUNTS = {category: count for category, (_, count) in CATEGORY_LAYOUT.items()}
+        
+        # Variable alignment and scoring in code; GPT is only asked for prose in 'narrative' mode
+        self.comparison_mode = comparison_mode
+        self.comparison_engine = comparison_engine or ComparisonEngine(
+            category_weights=self.CATEGORY_WEIGHTS,
+            significance_threshold=self.SIGNIFICANCE_THRESHOLD,
+            strong_evidence_threshold=self.STRONG_EVIDENCE_THRESHOLD,
+            excellent_evidence_threshold=self.EXCELLENT_EVIDENCE_THRESHOLD
+        )
+
+    @property
+    def client(self):
+        """Pooled AsyncOpenAI client for the running event loop"""
+        if self._client is not None:
+            return self._client
+        return self.client_registry.get_openai(self.api_key, self.base_url)
+
+    @client.setter
+    def client(self, client) -> None:
+        # Pin a specific client (e.g. a simulated one in tests)
+        self._client = client
+
+    async def _chat_completion(self, stage: str, system_prompt: str, user_prompt: str, max_tokens: int,
+                               response_format: Optional[Dict] = None,
+                               on_field: Optional[FieldCallback] = None) -> str:
+        """
+        Run one stage's chat completion, retrying transient failures and
+        hedging slow calls according to the stage's retry policy
+        
+        A streamed call (on_field set) is never hedged, so fields of two
+        generations cannot interleave. A retry streams again but only reports
+        fields whose value differs from what was already reported, so each
+        path's last reported value is the successful attempt's.
+        """
+        if on_field is not None:
+            on_field = _changed_fields_only(on_field)
+        async with track_stage(stage):
+            return await self.resilience.call(
+                stage, lambda: self._send_chat_completion(stage, system_prompt, user_prompt, max_tokens,
+                                                          response_format, on_field),
+                hedge=on_field is None
+            )
+
+    def _chat_request(self, system_prompt: str, user_prompt: str, max_tokens: int,
+                      response_format: Optional[Dict] = None) -> Dict:
+        """Chat completion parameters shared by interactive calls and batch requests"""
+        request = dict(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.1
+        )
+        if response_format is not None and self.structured_outputs:
+            request['response_format'] = response_format
+        return request
+
+    async def _send_chat_completion(self, stage: str, system_prompt: str, user_prompt: str, max_tokens: int,
+                                    response_format: Optional[Dict] = None,
+                                    on_field: Optional[FieldCallback] = None) -> str:
+        """
+        Send one chat completion through the shared rate limiter and return its text
+        
+        Args:
+            response_format: JSON schema response format, used while structured_outputs is enabled
+            on_field: Stream the response and report each JSON field as it completes
+        """
+        request = self._chat_request(system_prompt, user_prompt, max_tokens, response_format)
+        estimated_tokens = estimate_chat_tokens(
+            request['messages'], max_tokens=min(max_tokens, EXPECTED_COMPLETION_TOKENS.get(stage, max_tokens))
+        )
+        record_queue_wait(stage, await self.rate_limiter.acquire(self.model, estimated_tokens))
+        
+        if on_field is not None:
+            request.update(stream=True, stream_options={"include_usage": True})
+        
+        try:
+            response = await self.client.chat.completions.create(**request)
+        except Exception as e:
+            if 'response_format' not in request or getattr(e, 'status_code', None) != 400 \
+                    or 'response_format' not in str(e):
+                raise
+            # Model or endpoint without structured outputs: fall back to prompt-only JSON
+            print(f"Structured outputs not supported, falling back to plain JSON: {e}")
+            self.structured_outputs = False
+            del request['response_format']
+            response = await self.client.chat.completions.create(**request)
+        
+        if on_field is None:
+            usage = response.usage
+            content = response.choices[0].message.content
+        else:
+            usage = None
+            parts: List[str] = []
+            parser = IncrementalJSONParser()
+            async for chunk in response:
+                if getattr(chunk, 'usage', None) is not None:
+                    usage = chunk.usage
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                parts.append(delta)
+                for path, value in parser.feed(delta):
+                    on_field(path, value)
+            content = ''.join(parts)
+        self.rate_limiter.settle(self.model, estimated_tokens, getattr(usage, 'total_tokens', None))
+        record_usage(stage, getattr(usage, 'prompt_tokens', None), getattr(usage, 'completion_tokens', None))
+        return content
 
-    async def extract_job_variables(self, job_description: str, job_title: str, company: str) -> Dict:
+    async def _cached_extraction(self, stage: str, key: str,
+                                 extract: Callable[[Optional[FieldCallback]], Awaitable[Dict]],
+                                 on_field: Optional[FieldCallback] = None) -> Dict:
         """
-        Extract 22 structured variables from job description using GPT-4o
+        Return a cached extraction, or run it once even if several analyses ask
+        for the same job or resume concurrently
+        
+        Only the call that runs the extraction streams its fields to on_field;
+        cache hits and callers that joined an in-flight extraction get the
+        finished document replayed field by field.
+        """
+        cached = self.extraction_cache.get(key)
+        if cached is not None:
+            record_cache_hits(stage, 1)
+            return _replay_fields(cached, on_field)
+        
+        task = self._inflight_extractions.get(key)
+        if task is None:
+            async def run() -> Dict:
+                variables = await extract(on_field)
+                self.extraction_cache.put(key, variables)
+                return variables
+            
+            task = asyncio.ensure_future(run())
+            self._inflight_extractions[key] = task
+            task.add_done_callback(lambda _: self._inflight_extractions.pop(key, None))
+            return copy.deepcopy(await asyncio.shield(task))
+        
+        record_cache_hits(stage, 1)
+        return _replay_fields(copy.deepcopy(await asyncio.shield(task)), on_field)
+
+    def _job_key(self, job_description: str, job_title: str, company: str) -> str:
+        """
+        Extraction cache key for a job, or (with job deduplication on) for the
+        earlier posting it near-duplicates
+        """
+        key = job_cache_key(self.model, JOB_EXTRACTION_PROMPT_VERSION, job_description, job_title, company)
+        if self.job_deduplicator is None:
+            return key
+        canonical, duplicate = self.job_deduplicator.resolve(key, job_title, job_description, company)
+        if duplicate is not None:
+            record_cache_hits('job_dedup', 1)
+        return canonical
+
+    def _candidate_key(self, resume_text: str, resume_data: Dict) -> str:
+        return candidate_cache_key(self.model, CANDIDATE_EXTRACTION_PROMPT_VERSION, resume_text, resume_data)
+
+    async def _cached_comparison(self, job_key: str, candidate_key: str,
+                                 job_variables: Dict, candidate_variables: Dict) -> MatchingResult:
+        """
+        Compare an extraction pair once, reusing the result for repeated and near-duplicate jobs
+        """
+        pair = (job_key, candidate_key)
+        cached = self._match_results.get(pair)
+        if cached is not None:
+            self._match_results.move_to_end(pair)
+            self.comparisons_reused += 1
+            record_cache_hits('comparison', 1)
+            return copy.deepcopy(cached)
+        
+        task = self._inflight_comparisons.get(pair)
+        if task is None:
+            async def run() -> MatchingResult:
+                matching_result = await self.create_comparison_table(job_variables, candidate_variables)
+                self._match_results[pair] = matching_result
+                while len(self._match_results) > self.match_result_cache_size:
+                    self._match_results.popitem(last=False)
+                return matching_result
+            
+            task = asyncio.ensure_future(run())
+            self._inflight_comparisons[pair] = task
+            task.add_done_callback(lambda _: self._inflight_comparisons.pop(pair, None))
+        else:
+            self.comparisons_reused += 1
+            record_cache_hits('comparison', 1)
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _parse_extraction(self, content: str, kind: str) -> Dict:
         """
+        Parse (repairing if needed) and check a 22-variable extraction
         
+        Raises ValueError if the document or whole categories are missing or
+        malformed; individual variables that are not objects are dropped, and
+        other deviations from the 5/8/4/5 layout are reported but kept.
+        """
+        variables = parse_json(content)
+        problems = validate_variable_document(variables, kind)
+        if not isinstance(variables, dict) or any(problem.startswith('missing category') for problem in problems):
+            raise ValueError(f"Malformed {kind} extraction: {'; '.join(problems)}")
+        for category in CATEGORY_LAYOUT:
+            variables[category] = {key: variable for key, variable in variables[category].items()
+                                   if isinstance(variable, dict)}
+        if problems:
+            print(f"Warning: {kind} extraction deviates from the 22-variable layout: {'; '.join(problems)}")
+        return variables
+
+    async def extract_job_variables(self, job_description: str, job_title: str, company: str,
+                                    on_field: Optional[FieldCallback] = None) -> Dict:
+        """
+        Extract 22 structured variables from job description using GPT-4o (cached per job)
+        
+        Args:
+            on_field: Called with (path, value) as each variable and category arrives
+        """
+        key = self._job_key(job_description, job_title, company)
+        return await self._cached_extraction(
+            'job_extraction', key,
+            lambda callback: self._extract_job_variables(job_description, job_title, company, callback),
+            on_field
+        )
+
+    def _job_extraction_prompts(self, job_description: str, job_title: str, company: str) -> Tuple[str, str]:
+        """Build the (system, user) prompts of a job extraction"""
         system_prompt = """You are an expert HR analyst and job requirements specialist. Your task is to extract exactly 22 structured variables from job descriptions for systematic candidate matching.
 
 CRITICAL INSTRUCTIONS:
@@ -161,22 +468,15 @@ Ensure each variable is:
 ✓ Relevant to job success
 ✓ Distinct from other variables
 """
+        return system_prompt, user_prompt
 
+    async def _extract_job_variables(self, job_description: str, job_title: str, company: str,
+                                     on_field: Optional[FieldCallback] = None) -> Dict:
+        system_prompt, user_prompt = self._job_extraction_prompts(job_description, job_title, company)
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=4000,
-                temperature=0.1
-            )
-            
-            content = response.choices[0].message.content
-            # Clean and parse JSON
-            clean_content = content.replace('```json', '').replace('```', '').strip()
-            job_variables = json.loads(clean_content)
+            content = await self._chat_completion('job_extraction', system_prompt, user_prompt, max_tokens=4000,
+                                                  response_format=response_format('job'), on_field=on_field)
+            job_variables = self._parse_extraction(content, 'job')
             
             return job_variables
             
@@ -184,10 +484,29 @@ Ensure each variable is:
             print(f"Error extracting job variables: {e}")
             raise
 
-    async def extract_candidate_variables(self, resume_text: str, resume_data: Dict) -> Dict:
+    async def extract_candidate_variables(self, resume_text: str, resume_data: Dict,
+                                          on_field: Optional[FieldCallback] = None) -> Dict:
         """
-        Extract 22 corresponding variables from candidate resume using GPT-4o
+        Extract 22 corresponding variables from candidate resume using GPT-4o (cached per resume version)
+        
+        Args:
+            on_field: Called with (path, value) as each variable and category arrives
         """
+        key = self._candidate_key(resume_text, resume_data)
+        return await self._cached_extraction(
+            'candidate_extraction', key,
+            lambda callback: self._extract_candidate_variables(resume_text, resume_data, callback),
+            on_field
+        )
+
+    def _candidate_extraction_prompts(self, resume_text: str, resume_data: Dict) -> Tuple[str, str]:
+        """Build the (system, user) prompts of a candidate extraction"""
+        full_resume_data = json.dumps(resume_data, indent=2)
+        if self.compact_prompts:
+            # Structured fields mostly repeat the resume text; send only what the text lacks
+            resume_data_section = compact_json(dedupe_resume_data(resume_text, resume_data) or {})
+        else:
+            resume_data_section = full_resume_data
         
         system_prompt = """You are an expert resume analyzer. Your task is to extract exactly 22 structured variables from candidate resumes that correspond to job requirements for systematic matching.
 
@@ -213,7 +532,7 @@ RESUME TEXT:
 {resume_text}
 
 STRUCTURED RESUME DATA:
-{json.dumps(resume_data, indent=2)}
+{resume_data_section}
 
 Extract variables in this exact JSON format:
 
@@ -287,20 +606,19 @@ ANALYSIS GUIDELINES:
 - Be honest about missing qualifications
 """
 
+        if self.compact_prompts:
+            report_compaction('candidate_extraction', system_prompt + user_prompt,
+                              resume_data_section, full_resume_data)
+        return system_prompt, user_prompt
+
+    async def _extract_candidate_variables(self, resume_text: str, resume_data: Dict,
+                                           on_field: Optional[FieldCallback] = None) -> Dict:
+        system_prompt, user_prompt = self._candidate_extraction_prompts(resume_text, resume_data)
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=4000,
-                temperature=0.1
-            )
-            
-            content = response.choices[0].message.content
-            clean_content = content.replace('```json', '').replace('```', '').strip()
-            candidate_variables = json.loads(clean_content)
+            content = await self._chat_completion('candidate_extraction', system_prompt, user_prompt,
+                                                  max_tokens=4000, response_format=response_format('candidate'),
+                                                  on_field=on_field)
+            candidate_variables = self._parse_extraction(content, 'candidate')
             
             return candidate_variables
             
@@ -309,6 +627,59 @@ ANALYSIS GUIDELINES:
             raise
 
     async def create_comparison_table(self, job_variables: Dict, candidate_variables: Dict) -> MatchingResult:
+        """
+        Create detailed comparison table and calculate statistical match score
+        
+        Variables are aligned and scored locally by the comparison engine unless
+        comparison_mode is 'llm'; 'narrative' additionally asks GPT-4o to write the
+        recommendations from the local result.
+        """
+        if self.comparison_mode == 'llm':
+            return await self._llm_comparison_table(job_variables, candidate_variables)
+        
+        async with track_stage('comparison'):
+            comparisons = self.comparison_engine.align(job_variables, candidate_variables)
+            matching_result = self.comparison_engine.score(comparisons)
+        
+        if self.comparison_mode == 'narrative':
+            try:
+                matching_result.recommendations = await self._narrative_recommendations(
+                    job_variables, comparisons, matching_result
+                )
+            except Exception as e:
+                # The score is already final; keep the rule-based recommendations
+                print(f"Error generating narrative recommendations: {e}")
+        return matching_result
+
+    async def _narrative_recommendations(self, job_variables: Dict, comparisons: List[VariableComparison],
+                                         matching_result: MatchingResult) -> List[str]:
+        """
+        Ask GPT-4o for hiring recommendations grounded in the locally computed comparison
+        """
+        system_prompt = """You are a hiring advisor. You receive a finished, already-scored comparison of a job's requirements with a candidate's qualifications. Do not re-score anything. Write concise, specific recommendations for the hiring team.
+
+Return JSON only: {"next_steps": ["..."]}"""
+        
+        lines = [
+            f"- [{c.category}] {c.variable}: {'MATCH' if c.match else 'GAP'} ({c.notes}); evidence: {c.evidence}"
+            for c in comparisons
+        ]
+        user_prompt = f"""
+ROLE: {job_variables.get('job_analysis', {}).get('title', '')} at {job_variables.get('job_analysis', {}).get('company', '')}
+TOTAL SCORE: {matching_result.total_score:.1f}/100
+CONFIDENCE LEVEL: {matching_result.confidence_level}%
+MISSING CRITICAL REQUIREMENTS: {', '.join(matching_result.missing_critical) or 'none'}
+
+VARIABLE COMPARISON:
+{chr(10).join(lines)}
+
+Give 3-6 next steps.
+"""
+        content = await self._chat_completion('recommendations', system_prompt, user_prompt, max_tokens=800)
+        next_steps = parse_json(content)['next_steps']
+        return [str(step) for step in next_steps]
+
+    async def _llm_comparison_table(self, job_variables: Dict, candidate_variables: Dict) -> MatchingResult:
         """
         Create detailed comparison table and calculate statistical match score using GPT-4o
         """
@@ -335,14 +706,22 @@ MATCHING LOGIC:
 
 Return detailed analysis in the exact JSON format specified."""
 
+        full_variables = json.dumps(job_variables, indent=2) + json.dumps(candidate_variables, indent=2)
+        if self.compact_prompts:
+            job_section = compact_for_comparison(job_variables, 'job')
+            candidate_section = compact_for_comparison(candidate_variables, 'candidate')
+        else:
+            job_section = json.dumps(job_variables, indent=2)
+            candidate_section = json.dumps(candidate_variables, indent=2)
+        
         user_prompt = f"""
 Compare these job requirements with candidate qualifications and create a detailed comparison table:
 
 JOB REQUIREMENTS:
-{json.dumps(job_variables, indent=2)}
+{job_section}
 
 CANDIDATE QUALIFICATIONS:
-{json.dumps(candidate_variables, indent=2)}
+{candidate_section}
 
 Create comparison in this exact JSON format:
 
@@ -444,40 +823,21 @@ ANALYSIS INSTRUCTIONS:
 6. Be objective and data-driven in assessment
 """
 
+        if self.compact_prompts:
+            report_compaction('comparison', system_prompt + user_prompt,
+                              job_section + candidate_section, full_variables)
+        
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=6000,
-                temperature=0.1
-            )
-            
-            content = response.choices[0].message.content
-            clean_content = content.replace('```json', '').replace('```', '').strip()
-            comparison_result = json.loads(clean_content)
+            content = await self._chat_completion('comparison', system_prompt, user_prompt, max_tokens=6000)
+            comparison_result = parse_json(content)
             
             # Extract key metrics
             total_matches = int(comparison_result['comparison_summary']['total_matches'].split(' ')[0])
             match_percentage = float(comparison_result['comparison_summary']['match_percentage'])
             
             # Determine statistical significance
-            statistical_significance = total_matches >= self.SIGNIFICANCE_THRESHOLD
-            
-            if total_matches >= self.EXCELLENT_EVIDENCE_THRESHOLD:
-                confidence_level = 99.9
-                significance_level = "excellent"
-            elif total_matches >= self.STRONG_EVIDENCE_THRESHOLD:
-                confidence_level = 99.0
-                significance_level = "strong"
-            elif total_matches >= self.SIGNIFICANCE_THRESHOLD:
-                confidence_level = 95.0
-                significance_level = "significant"
-            else:
-                confidence_level = 0.0
-                significance_level = "none"
+            statistical_significance, confidence_level, significance_level = \
+                self.comparison_engine.significance_tier(total_matches)
             
             # Calculate weighted total score
             category_scores = {
@@ -522,28 +882,94 @@ ANALYSIS INSTRUCTIONS:
             print(f"Error creating comparison table: {e}")
             raise
 
-    async def full_matching_analysis(self, job_description: str, job_title: str, company: str, 
-                                   resume_text: str, resume_data: Dict) -> Dict:
-        """
-        Complete end-to-end matching analysis using GPT-4o
+    async def batch_extract(self, jobs: List[Dict], candidates: List[Dict]) -> Dict[str, int]:
         """
+        Backfill job and candidate extractions through the batch backend.
         
-        print(f"🔍 Starting full matching analysis for: {job_title} at {company}")
+        Every distinct job and resume version that is not cached yet is sent as
+        one batch; parsed results go into the extraction cache, where later
+        extract_*, full_matching_analysis and analyze_many calls pick them up.
         
-        # Step 1: Extract job variables
-        print("📋 Extracting job variables...")
-        job_variables = await self.extract_job_variables(job_description, job_title, company)
+        Args:
+            jobs: Dicts with job_description, job_title, company
+            candidates: Dicts with resume_text and optional resume_data
+            
+        Returns:
+            Counts of requests submitted, succeeded and failed, and of extractions already cached
+        """
+        async with self.metrics.request('batch_extract'):
+            job_keys = [self._job_key(job['job_description'], job.get('job_title', ''), job.get('company', ''))
+                        for job in jobs]
+            candidate_keys = [self._candidate_key(candidate['resume_text'], candidate.get('resume_data') or {})
+                              for candidate in candidates]
+            return await self._batch_extract(jobs, job_keys, candidates, candidate_keys)
+
+    async def _batch_extract(self, jobs: List[Dict], job_keys: List[str],
+                             candidates: List[Dict], candidate_keys: List[str]) -> Dict[str, int]:
+        """
+        Run the uncached extractions for already resolved keys as one batch
+        """
+        requests: List[BatchRequest] = []
+        pending: Dict[str, Tuple[str, str, str]] = {}
+        queued = set()
+        counts = {'submitted': 0, 'succeeded': 0, 'failed': 0, 'cached': 0}
         
-        # Step 2: Extract candidate variables  
-        print("👤 Extracting candidate variables...")
-        candidate_variables = await self.extract_candidate_variables(resume_text, resume_data)
+        def add(stage: str, kind: str, key: str, prompts: Callable[[], Tuple[str, str]]) -> None:
+            if key in queued:
+                return
+            queued.add(key)
+            if self.extraction_cache.get(key) is not None:
+                counts['cached'] += 1
+                return
+            system_prompt, user_prompt = prompts()
+            custom_id = f"{kind}-{len(requests)}"
+            requests.append(BatchRequest(custom_id, self._chat_request(
+                system_prompt, user_prompt, max_tokens=4000, response_format=response_format(kind)
+            )))
+            pending[custom_id] = (stage, kind, key)
         
-        # Step 3: Create comparison table
-        print("📊 Creating comparison table...")
-        matching_result = await self.create_comparison_table(job_variables, candidate_variables)
+        for job, key in zip(jobs, job_keys):
+            add('job_extraction', 'job', key, lambda job=job: self._job_extraction_prompts(
+                job['job_description'], job.get('job_title', ''), job.get('company', '')))
+        for candidate, key in zip(candidates, candidate_keys):
+            add('candidate_extraction', 'candidate', key, lambda candidate=candidate: self._candidate_extraction_prompts(
+                candidate['resume_text'], candidate.get('resume_data') or {}))
+        if not requests:
+            return counts
         
-        # Step 4: Compile comprehensive result
-        comprehensive_result = {
+        print(f"📦 Submitting {len(requests)} extractions as a batch...")
+        counts['submitted'] = len(requests)
+        async with track_stage('batch_extraction'):
+            results = await run_batch(
+                self.batch_backend or OpenAIBatchBackend(self.client), requests,
+                batch_dir=self.batch_dir, poll_interval=self.batch_poll_interval
+            )
+        for custom_id, result in results.items():
+            stage, kind, key = pending[custom_id]
+            record_usage(stage, result.usage.get('prompt_tokens'), result.usage.get('completion_tokens'))
+            try:
+                if result.error is not None:
+                    raise RuntimeError(result.error)
+                self.extraction_cache.put(key, self._parse_extraction(result.content, kind))
+                counts['succeeded'] += 1
+            except Exception as e:
+                print(f"Error in batch {kind} extraction {custom_id}: {e}")
+                counts['failed'] += 1
+        print(f"📦 Batch finished: {counts['succeeded']} extracted, {counts['failed']} failed")
+        return counts
+
+    def get_cache_stats(self) -> Dict[str, float]:
+        """Return extraction cache hit/miss statistics, duplicate jobs collapsed and comparisons reused"""
+        stats = self.extraction_cache.get_stats()
+        if self.job_deduplicator is not None:
+            stats['job_duplicates_collapsed'] = self.job_deduplicator.duplicates
+        stats['comparisons_reused'] = self.comparisons_reused
+        return stats
+
+    def _compile_result(self, job_variables: Dict, candidate_variables: Dict,
+                        matching_result: MatchingResult) -> Dict:
+        """Assemble the comprehensive analysis dict returned to callers"""
+        return {
             'analysis_timestamp': datetime.now().isoformat(),
             'job_analysis': job_variables,
             'candidate_analysis': candidate_variables,
@@ -557,6 +983,7 @@ ANALYSIS INSTRUCTIONS:
                 'recommendations': matching_result.recommendations,
                 'evidence_summary': matching_result.evidence_summary
             },
+            'metrics': matching_result.metrics,
             'statistical_framework': {
                 'total_variables': self.TOTAL_VARIABLES,
                 'significance_threshold': self.SIGNIFICANCE_THRESHOLD,
@@ -565,11 +992,141 @@ ANALYSIS INSTRUCTIONS:
                 'category_weights': self.CATEGORY_WEIGHTS
             }
         }
+
+    async def full_matching_analysis(self, job_description: str, job_title: str, company: str, 
+                                   resume_text: str, resume_data: Dict) -> Dict:
+        """
+        Complete end-to-end matching analysis using GPT-4o
+        """
+        
+        print(f"🔍 Starting full matching analysis for: {job_title} at {company}")
+        
+        async with self.metrics.request('full_matching_analysis') as request_metrics:
+            # Steps 1-2: Job and candidate extraction are independent, so run them together
+            print("📋 Extracting job and candidate variables...")
+            job_key = self._job_key(job_description, job_title, company)
+            candidate_key = self._candidate_key(resume_text, resume_data)
+            job_variables, candidate_variables = await asyncio.gather(
+                self._cached_extraction('job_extraction', job_key, lambda callback: self._extract_job_variables(
+                    job_description, job_title, company, callback)),
+                self._cached_extraction('candidate_extraction', candidate_key,
+                                        lambda callback: self._extract_candidate_variables(
+                                            resume_text, resume_data, callback))
+            )
+            
+            # Step 3: Create comparison table (reused if this job or a near-duplicate was already compared)
+            print("📊 Creating comparison table...")
+            matching_result = await self._cached_comparison(job_key, candidate_key, job_variables, candidate_variables)
+        
+        matching_result.metrics = request_metrics.as_dict()
+        
+        # Step 4: Compile comprehensive result
+        comprehensive_result = self._compile_result(job_variables, candidate_variables, matching_result)
         
         print(f"✅ Analysis complete! Score: {matching_result.total_score:.1f}, Confidence: {matching_result.confidence_level}%")
         
         return comprehensive_result
 
+    async def analyze_many(self, jobs: List[Dict], candidates: List[Dict],
+                           max_concurrency: int = 8, batch: bool = False) -> AsyncIterator[Dict]:
+        """
+        Match every job against every candidate, yielding results as they complete.
+        
+        Each distinct job (near-duplicate postings count as one when job deduplication
+        is on) and candidate is extracted once, and duplicate pairs share one comparison; the pairwise comparisons
+        then run with at most max_concurrency in flight, and only that many are
+        scheduled at a time, so large grids do not create one task per pair up front.
+        
+        Args:
+            jobs: Dicts with job_description, job_title, company (and optionally job_id)
+            candidates: Dicts with resume_text, optional resume_data (and optionally candidate_id)
+            max_concurrency: Maximum concurrent GPT calls for extraction and comparison
+            batch: Run the uncached extractions through the batch backend first (cheaper,
+                but results arrive only once the whole batch finishes); extractions the
+                batch could not produce are retried interactively
+            
+        Yields:
+            Dicts with job_index, candidate_index, job_id, candidate_id and either the
+            full_matching_analysis-shaped result or an 'error' message
+        """
+        slots = asyncio.Semaphore(max_concurrency)
+        
+        async def limited(coro):
+            async with slots:
+                return await coro
+        
+        print(f"🔍 Extracting {len(jobs)} jobs and {len(candidates)} candidates...")
+        async with self.metrics.request('analyze_many_extraction') as extraction_metrics:
+            job_keys = [self._job_key(job['job_description'], job.get('job_title', ''), job.get('company', ''))
+                        for job in jobs]
+            candidate_keys = [self._candidate_key(candidate['resume_text'], candidate.get('resume_data') or {})
+                              for candidate in candidates]
+            collapsed = extraction_metrics.stage('job_dedup').cache_hits
+            if collapsed:
+                print(f"🧬 Collapsed {collapsed} near-duplicate job postings")
+            if batch:
+                await self._batch_extract(jobs, job_keys, candidates, candidate_keys)
+            extracted = await asyncio.gather(
+                *(limited(self._cached_extraction(
+                    'job_extraction', key,
+                    lambda callback, job=job: self._extract_job_variables(
+                        job['job_description'], job.get('job_title', ''), job.get('company', ''), callback)))
+                  for job, key in zip(jobs, job_keys)),
+                *(limited(self._cached_extraction(
+                    'candidate_extraction', key,
+                    lambda callback, candidate=candidate: self._extract_candidate_variables(
+                        candidate['resume_text'], candidate.get('resume_data') or {}, callback)))
+                  for candidate, key in zip(candidates, candidate_keys)),
+                return_exceptions=True
+            )
+        job_variables, candidate_variables = extracted[:len(jobs)], extracted[len(jobs):]
+        
+        async def compare(job_index: int, candidate_index: int) -> Dict:
+            job, candidate = jobs[job_index], candidates[candidate_index]
+            result = {
+                'job_index': job_index,
+                'candidate_index': candidate_index,
+                'job_id': job.get('job_id', job_index),
+                'candidate_id': candidate.get('candidate_id', candidate_index),
+            }
+            failed = next((v for v in (job_variables[job_index], candidate_variables[candidate_index])
+                           if isinstance(v, BaseException)), None)
+            if failed is not None:
+                result['error'] = f"extraction failed: {failed}"
+                return result
+            try:
+                async with self.metrics.request('analyze_many_comparison') as request_metrics:
+                    matching_result = await limited(self._cached_comparison(
+                        job_keys[job_index], candidate_keys[candidate_index],
+                        job_variables[job_index], candidate_variables[candidate_index]
+                    ))
+                matching_result.metrics = request_metrics.as_dict()
+                result.update(self._compile_result(
+                    job_variables[job_index], candidate_variables[candidate_index], matching_result
+                ))
+            except Exception as e:
+                result['error'] = str(e)
+            return result
+        
+        print(f"📊 Comparing {len(jobs) * len(candidates)} pairs...")
+        pairs = ((j, c) for j in range(len(jobs)) for c in range(len(candidates)))
+        pending = set()
+        try:
+            for job_index, candidate_index in pairs:
+                if len(pending) >= max_concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+                pending.add(asyncio.ensure_future(compare(job_index, candidate_index)))
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # The caller stopped iterating early: don't leave comparisons running
+            for task in pending:
+                task.cancel()
+
 
 # Example usage function
 async def example_usage():
@@ -0,0 +1,247 @@
+"""
+Versioned cache for EnhancedMatchingSystem's 22-variable extractions.
+
+Job extractions are keyed by normalized job text + title + company; candidate
+extractions by resume text + a canonical hash of resume_data. Every key is also
+tagged with the model and the extraction prompt version, so changing either
+naturally misses instead of serving stale structure. Entries expire after a
+TTL and are evicted least-recently-used from an in-memory LRU and an optional
+SQLite file, mirroring EmbeddingCache.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from embedding_cache import CacheStats, normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def job_cache_key(model: str, prompt_version: str, job_description: str, job_title: str, company: str) -> str:
+    """Cache key for one job's extracted variables"""
+    digest = _digest(normalize_text(job_description),
+                     normalize_text(job_title).casefold(),
+                     normalize_text(company).casefold())
+    return f"job:{model}:{prompt_version}:{digest}"
+
+
+def candidate_cache_key(model: str, prompt_version: str, resume_text: str, resume_data: Optional[Dict]) -> str:
+    """Cache key for one resume version's extracted variables"""
+    data = json.dumps(resume_data or {}, sort_keys=True, separators=(',', ':'), default=str)
+    digest = _digest(normalize_text(resume_text), data)
+    return f"candidate:{model}:{prompt_version}:{digest}"
+
+
+class ExtractionCache:
+    """
+    Two-level extraction cache with TTL: in-memory LRU in front of an optional SQLite file.
+
+    Values are stored as JSON text and decoded on every hit, so callers always
+    get their own copy and may mutate it freely. As in EmbeddingCache, the disk
+    row count is tracked in memory, disk hits buffer their last_used updates,
+    and expired rows are purged at most once per purge_interval (they are
+    never served in between). The file may be shared by several processes: it
+    runs in WAL mode with a busy timeout, and a write that still fails is
+    logged and skipped rather than raised, since a lost cache entry only costs
+    a re-extraction.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 max_entries: int = 2000,
+                 max_disk_entries: Optional[int] = 50000,
+                 ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 touch_batch_size: int = 64,
+                 purge_interval: float = 600.0,
+                 busy_timeout: float = 30.0):
+        """
+        Initialize the extraction cache.
+
+        Args:
+            path: SQLite file for persistence (None keeps the cache in memory only)
+            max_entries: Maximum number of extractions held in the in-memory LRU
+            max_disk_entries: Maximum number of rows kept on disk (None = unbounded)
+            ttl_seconds: Age after which an extraction is re-run (None = never expires)
+            touch_batch_size: Buffered last_used updates that trigger a write
+            purge_interval: Minimum seconds between deletes of expired rows
+            busy_timeout: Seconds to wait for another process's lock on the SQLite file
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.touch_batch_size = touch_batch_size
+        self.purge_interval = purge_interval
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Upper bound on the disk row count (puts that replace a row still count once)
+        self._disk_rows = 0
+        self._pending_touches: Dict[str, float] = {}
+        self._last_purge = 0.0
+
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=busy_timeout)
+            self._conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extractions_last_used ON extractions(last_used)"
+            )
+            self._conn.commit()
+            self._disk_rows = self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached extraction for key, or None on a miss or expiry"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.stats.hits += 1
+                    return json.loads(value)
+                del self._memory[key]
+                self.stats.evictions += 1
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created FROM extractions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created = row
+                    if self._expired(created, now):
+                        # Left for the next periodic purge; never served
+                        self.stats.evictions += 1
+                    else:
+                        self._pending_touches[key] = now
+                        if len(self._pending_touches) >= self.touch_batch_size:
+                            try:
+                                self._flush_touches()
+                                self._conn.commit()
+                            except sqlite3.OperationalError as e:
+                                self._conn.rollback()
+                                self._pending_touches.clear()
+                                logger.warning(f"Extraction cache last_used update failed: {e}")
+                        self._remember(key, value, created)
+                        self.stats.hits += 1
+                        self.stats.disk_hits += 1
+                        return json.loads(value)
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, key: str, extraction: Dict[str, Any]) -> None:
+        """Store an extraction under key"""
+        value = json.dumps(extraction)
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO extractions (key, value, created, last_used) VALUES (?, ?, ?, ?)",
+                        (key, value, now, now)
+                    )
+                    self._disk_rows += 1
+                    self._flush_touches()
+                    self._evict_disk(now)
+                    self._conn.commit()
+                except sqlite3.OperationalError as e:
+                    self._conn.rollback()
+                    self._pending_touches.clear()
+                    logger.warning(f"Extraction cache write failed, keeping {key} in memory only: {e}")
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _flush_touches(self) -> None:
+        if self._pending_touches:
+            self._conn.executemany(
+                "UPDATE extractions SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._pending_touches.items()]
+            )
+            self._pending_touches.clear()
+
+    def _evict_disk(self, now: float) -> None:
+        if self.ttl_seconds is not None and now - self._last_purge >= self.purge_interval:
+            self._last_purge = now
+            expired = self._conn.execute(
+                "DELETE FROM extractions WHERE created < ?", (now - self.ttl_seconds,)
+            ).rowcount
+            self.stats.evictions += max(0, expired)
+            self._disk_rows -= max(0, expired)
+        if self.max_disk_entries is None or self._disk_rows <= self.max_disk_entries:
+            return
+        # The tracked count may include replaced rows; recount only when it crosses the bound
+        count = self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        overflow = count - int(self.max_disk_entries * 0.9) if count > self.max_disk_entries else 0
+        self._disk_rows = count - overflow
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM extractions WHERE key IN ("
+                "SELECT key FROM extractions ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+            self.stats.evictions += overflow
+
+    def __len__(self) -> int:
+        if self._conn is not None:
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        return len(self._memory)
+
+    def clear(self) -> None:
+        """Drop every cached extraction (memory and disk)"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM extractions")
+                self._conn.commit()
+                self._disk_rows = 0
+                self._pending_touches.clear()
+
+    def close(self) -> None:
+        """Write buffered last_used updates and close the underlying SQLite connection"""
+        if self._conn is not None:
+            with self._lock:
+                try:
+                    self._flush_touches()
+                    self._conn.commit()
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"Extraction cache last_used update failed: {e}")
+            self._conn.close()
+            self._conn = None
+
+    def get_stats(self) -> Dict[str, float]:
+        """Return hit/miss counters as a plain dict"""
+        return {
+            'hits': self.stats.hits,
+            'misses': self.stats.misses,
+            'disk_hits': self.stats.disk_hits,
+            'evictions': self.stats.evictions,
+            'hit_rate': self.stats.hit_rate,
+            'memory_entries': len(self._memory),
+        }
@@ -0,0 +1,104 @@
+"""
+JSON schemas and structure checks for the 22-variable extractions.
+
+The schemas are passed as OpenAI structured-output response formats, so
+supporting models must return exactly 5/8/4/5 variables with the expected
+fields. validate_variable_document() checks the same structure on responses
+from providers or models without constrained decoding.
+"""
+
+from typing import Any, Dict, List
+
+# category -> (key prefix, number of variables)
+CATEGORY_LAYOUT = {
+    'critical_requirements': ('req', 5),
+    'core_competencies': ('comp', 8),
+    'experience_factors': ('exp', 4),
+    'preferred_qualifications': ('pref', 5),
+}
+
+_STRING = {'type': 'string'}
+_BOOLEAN = {'type': 'boolean'}
+_PROFICIENCY = {'type': 'string', 'enum': ['beginner', 'intermediate', 'advanced', 'expert']}
+_VALUE_LEVEL = {'type': 'string', 'enum': ['low', 'medium', 'high']}
+
+# Per document kind: summary section name and fields, then the fields of each category's variables
+_FIELDS = {
+    'job': {
+        'summary': ('job_analysis', ['title', 'company', 'industry', 'seniority_level', 'job_type']),
+        'common': {'variable': _STRING, 'description': _STRING, 'evidence_needed': _STRING},
+        'critical_requirements': {'disqualifier': _BOOLEAN},
+        'core_competencies': {'proficiency_level': _PROFICIENCY},
+        'experience_factors': {'minimum_threshold': _STRING},
+        'preferred_qualifications': {'bonus_value': _VALUE_LEVEL},
+    },
+    'candidate': {
+        'summary': ('candidate_analysis', ['name', 'years_total_experience', 'current_level',
+                                           'primary_expertise', 'industry_background']),
+        'common': {'variable': _STRING, 'present': _BOOLEAN, 'evidence': _STRING},
+        'critical_requirements': {'details': _STRING},
+        'core_competencies': {'proficiency_level': _PROFICIENCY, 'years_experience': _STRING},
+        'experience_factors': {'measurement': _STRING, 'meets_threshold': _BOOLEAN},
+        'preferred_qualifications': {'value_level': _VALUE_LEVEL},
+    },
+}
+
+
+def _object(properties: Dict[str, Any]) -> Dict[str, Any]:
+    # Strict structured outputs require every property to be required and no extras
+    return {
+        'type': 'object',
+        'properties': properties,
+        'required': list(properties),
+        'additionalProperties': False,
+    }
+
+
+def variable_document_schema(kind: str) -> Dict[str, Any]:
+    """JSON schema of a 'job' or 'candidate' 22-variable extraction"""
+    fields = _FIELDS[kind]
+    summary_name, summary_fields = fields['summary']
+    properties: Dict[str, Any] = {summary_name: _object({name: _STRING for name in summary_fields})}
+    for category, (prefix, count) in CATEGORY_LAYOUT.items():
+        variable = _object({**fields['common'], **fields[category]})
+        properties[category] = _object({f"{prefix}_{i}": variable for i in range(1, count + 1)})
+    return _object(properties)
+
+
+def response_format(kind: str) -> Dict[str, Any]:
+    """OpenAI response_format requesting a schema-constrained extraction"""
+    return {
+        'type': 'json_schema',
+        'json_schema': {
+            'name': f"{kind}_variables",
+            'strict': True,
+            'schema': variable_document_schema(kind),
+        },
+    }
+
+
+def validate_variable_document(document: Any, kind: str) -> List[str]:
+    """
+    Check a parsed extraction against the 5/8/4/5 layout.
+
+    Returns a list of problems (empty when the document is well formed).
+    """
+    if not isinstance(document, dict):
+        return [f"{kind} extraction is {type(document).__name__}, not an object"]
+    problems = []
+    required_fields = list(_FIELDS[kind]['common'])
+    for category, (prefix, count) in CATEGORY_LAYOUT.items():
+        variables = document.get(category)
+        if not isinstance(variables, dict):
+            problems.append(f"missing category {category}")
+            continue
+        if len(variables) != count:
+            problems.append(f"{category} has {len(variables)} variables, expected {count}")
+        for key, variable in variables.items():
+            if not isinstance(variable, dict):
+                problems.append(f"{category}.{key} is not an object")
+                continue
+            missing = [name for name in required_fields if name not in variable]
+            if missing:
+                problems.append(f"{category}.{key} lacks {', '.join(missing)}")
+    return problems
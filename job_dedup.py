@@ -0,0 +1,220 @@
+"""
+Near-duplicate job posting detection.
+
+The same role is captured from several job boards and reposted with trivial
+edits. JobDeduplicator fingerprints each posting's normalized title and
+description with a 64-bit SimHash over word shingles and keeps the fingerprints
+in a banded index: two fingerprints within max_distance bits of each other must
+agree exactly on at least one of max_distance + 1 bands (pigeonhole), so a
+lookup only compares against postings sharing a band instead of scanning them
+all. A near-duplicate must also come from the same employer (company names are
+compared after dropping case, punctuation and legal suffixes), since different
+companies often publish identical template descriptions, and carry the same
+title (compared the same way), since a senior and a junior opening often share
+all but a few lines. Postings that resolve to an earlier one reuse its
+extraction and match results, so collapsing is lossy by design and off unless
+EnhancedMatchingSystem is asked for it.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+_URL_RE = re.compile(r'https?://\S+|www\.\S+|\S+@\S+')
+_NON_WORD_RE = re.compile(r'[^\w+#]+')
+_COMPANY_SUFFIXES = {'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+                     'gmbh', 'ag', 'plc', 'sa', 'bv', 'lp', 'llp', 'pty'}
+
+
+def normalize_posting(text: str) -> List[str]:
+    """Lowercased words of a posting with URLs, e-mail addresses and punctuation removed"""
+    return _NON_WORD_RE.sub(' ', _URL_RE.sub(' ', text.casefold())).split()
+
+
+def normalize_company(company: str) -> str:
+    """Company name reduced to its distinctive words ("Acme, Inc." -> "acme")"""
+    words = normalize_posting(company or '')
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+def normalize_title(job_title: str) -> str:
+    """Job title reduced to its lowercased words ("Sr. Engineer (Remote)" -> "sr engineer remote")"""
+    return ' '.join(normalize_posting(job_title or ''))
+
+
+def simhash(words: List[str], shingle_size: int = 3, bits: int = 64) -> int:
+    """
+    SimHash fingerprint of a word sequence.
+
+    Each distinct shingle of shingle_size words votes on every bit of the
+    fingerprint; similar texts share most shingles and so most bits.
+    """
+    if len(words) < shingle_size:
+        shingles = {' '.join(words)}
+    else:
+        shingles = {' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    digest_size = (bits + 7) // 8
+    # Lay the shingle hashes out as one bit string so each bit's vote count is a C-level slice count
+    layout = ''.join([
+        format(int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=digest_size).digest(), 'big')
+               >> (digest_size * 8 - bits), f'0{bits}b')
+        for shingle in shingles
+    ])
+    half = len(shingles) / 2
+    return int(''.join('1' if layout[bit::bits].count('1') > half else '0' for bit in range(bits)), 2)
+
+
+@dataclass
+class DuplicateMatch:
+    """An indexed posting a new posting duplicates"""
+    key: str
+    similarity: float
+    distance: int
+
+
+class JobDeduplicator:
+    """
+    SimHash index mapping near-duplicate postings to the first posting seen.
+
+    Thread-safe; entries beyond max_entries are evicted least-recently-used.
+    """
+
+    def __init__(self, threshold: float = 0.85, bits: int = 64, shingle_size: int = 3,
+                 max_entries: int = 100000):
+        """
+        Initialize the index.
+
+        Args:
+            threshold: Minimum fingerprint similarity (1 - differing bits / bits) for a duplicate
+            bits: Fingerprint width
+            shingle_size: Words per shingle
+            max_entries: Maximum number of postings kept in the index
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.bits = bits
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self.max_distance = int((1.0 - threshold) * bits + 1e-9)
+        self.checked = 0
+        self.duplicates = 0
+
+        bands = min(self.max_distance + 1, bits)
+        width, extra = divmod(bits, bands)
+        self._bands: List[Tuple[int, int]] = []
+        shift = 0
+        for band in range(bands):
+            band_width = width + (1 if band < extra else 0)
+            self._bands.append((shift, (1 << band_width) - 1))
+            shift += band_width
+        self._tables: List[Dict[int, Set[str]]] = [{} for _ in self._bands]
+        # key -> (fingerprint, normalized company, normalized title)
+        self._entries: "OrderedDict[str, Tuple[int, str, str]]" = OrderedDict()
+        # key of a collapsed posting -> canonical key, so repeat lookups skip the index and count once
+        self._aliases: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fingerprint(self, job_title: str, job_description: str) -> int:
+        """Fingerprint of a posting's title and description"""
+        return simhash(normalize_posting(f"{job_title}\n{job_description}"), self.shingle_size, self.bits)
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        return [(fingerprint >> shift) & mask for shift, mask in self._bands]
+
+    def _find(self, fingerprint: int, company: str, title: str) -> Optional[DuplicateMatch]:
+        best: Optional[DuplicateMatch] = None
+        seen: Set[str] = set()
+        for table, value in zip(self._tables, self._band_values(fingerprint)):
+            for key in table.get(value, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                entry_fingerprint, entry_company, entry_title = self._entries[key]
+                if entry_company != company or entry_title != title:
+                    continue
+                distance = bin(fingerprint ^ entry_fingerprint).count('1')
+                if distance <= self.max_distance and (best is None or distance < best.distance):
+                    best = DuplicateMatch(key, 1.0 - distance / self.bits, distance)
+        return best
+
+    def find(self, job_title: str, job_description: str, company: str = '') -> Optional[DuplicateMatch]:
+        """Return the closest indexed posting with the same company and title within the threshold, if any"""
+        fingerprint = self.fingerprint(job_title, job_description)
+        with self._lock:
+            return self._find(fingerprint, normalize_company(company), normalize_title(job_title))
+
+    def resolve(self, key: str, job_title: str, job_description: str,
+                company: str = '') -> Tuple[str, Optional[DuplicateMatch]]:
+        """
+        Map a posting to the key of the posting it duplicates.
+
+        Postings already indexed under key, or with no near-duplicate with the
+        same company and title, resolve to key itself (and are indexed); near-duplicates
+        resolve to the earlier posting's key, which is remembered for key so
+        resolving the same posting again neither searches nor counts it again.
+
+        Returns:
+            (canonical key, the duplicate match or None)
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return key, None
+            canonical = self._aliases.get(key)
+            if canonical is not None:
+                self._aliases.move_to_end(key)
+                return canonical, None
+        fingerprint = self.fingerprint(job_title, job_description)
+        company = normalize_company(company)
+        title = normalize_title(job_title)
+        with self._lock:
+            self.checked += 1
+            match = self._find(fingerprint, company, title)
+            if match is not None:
+                self.duplicates += 1
+                self._entries.move_to_end(match.key)
+                self._aliases[key] = match.key
+                while len(self._aliases) > self.max_entries:
+                    self._aliases.popitem(last=False)
+                return match.key, match
+            self._add(key, fingerprint, company, title)
+            return key, None
+
+    def _add(self, key: str, fingerprint: int, company: str = '', title: str = '') -> None:
+        self._entries[key] = (fingerprint, company, title)
+        for table, value in zip(self._tables, self._band_values(fingerprint)):
+            table.setdefault(value, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            evicted, (evicted_fingerprint, _, _) = self._entries.popitem(last=False)
+            for table, value in zip(self._tables, self._band_values(evicted_fingerprint)):
+                bucket = table.get(value)
+                if bucket is not None:
+                    bucket.discard(evicted)
+                    if not bucket:
+                        del table[value]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Forget every indexed posting"""
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+            for table in self._tables:
+                table.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Return lookup and duplicate counters as a plain dict"""
+        return {
+            'checked': self.checked,
+            'duplicates_collapsed': self.duplicates,
+            'indexed': len(self._entries),
+            'duplicate_rate': self.duplicates / self.checked if self.checked else 0.0,
+        }
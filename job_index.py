@@ -0,0 +1,332 @@
+"""
+Approximate nearest-neighbour job index for resume-to-job retrieval.
+
+Pure-NumPy IVF (inverted file) index over job embeddings produced by ResumeScorer:
+job vectors are clustered with spherical k-means, each query only scans the
+`nprobe` closest clusters, and recall against the exact matrix path can be
+measured to tune speed against accuracy.
+
+The index is standalone: ResumeScorer, batch_score and the matching system
+score every job they are given and never consult it. Callers that want to
+pre-filter a large job corpus build one and pass the retrieved ids on.
+"""
+
+import itertools
+import logging
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from resume_scorer import ResumeScorer, normalize_embeddings, top_k_similarities
+
+logger = logging.getLogger(__name__)
+
+
+class JobIndex:
+    """
+    IVF index over normalized job embeddings with incremental insert/delete.
+
+    Until enough jobs have been added to train the coarse quantizer the index
+    answers queries exactly; after training it probes `nprobe` of `n_lists` clusters.
+    Centroids drift out of date as jobs are added and removed, so the index
+    retrains itself once the changes since the last training exceed
+    `retrain_ratio` times the number of jobs it was trained on.
+    """
+
+    def __init__(self,
+                 scorer: Optional[ResumeScorer] = None,
+                 n_lists: int = 256,
+                 nprobe: int = 8,
+                 min_train_size: Optional[int] = None,
+                 max_train_samples: int = 65536,
+                 retrain_ratio: Optional[float] = 0.5,
+                 seed: int = 0):
+        """
+        Initialize the job index.
+
+        Args:
+            scorer: ResumeScorer used to embed job and resume texts
+            n_lists: Number of k-means clusters (inverted lists)
+            nprobe: Number of clusters scanned per query
+            min_train_size: Jobs needed before the index trains itself (default 8 * n_lists)
+            max_train_samples: Maximum number of vectors sampled for k-means training
+            retrain_ratio: Inserts and deletes since the last training, relative to the
+                trained size, that trigger retraining (None disables automatic retraining)
+            seed: Random seed for reproducible training
+        """
+        self.scorer = scorer
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size or 8 * n_lists
+        self.max_train_samples = max_train_samples
+        self.retrain_ratio = retrain_ratio
+        self.seed = seed
+
+        self.dim: Optional[int] = None
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self.centroids: Optional[np.ndarray] = None
+        self._list_of_row = np.zeros(0, dtype=np.int32)
+        self._lists: List[Set[int]] = []
+        self._trained_size = 0
+        self.changes_since_train = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._row_of
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def needs_retrain(self) -> bool:
+        """Whether enough jobs changed since training for the clusters to be stale"""
+        if not self.is_trained or self.retrain_ratio is None or self._size == 0:
+            return False
+        return self.changes_since_train > self.retrain_ratio * max(self._trained_size, 1)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Normalized job vectors currently in the index (one row per job)"""
+        return self._vectors[:self._size]
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 1024)
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+        list_of_row = np.full(new_capacity, -1, dtype=np.int32)
+        list_of_row[:self._size] = self._list_of_row[:self._size]
+        self._list_of_row = list_of_row
+
+    def add(self, job_ids: Sequence[str], embeddings) -> None:
+        """
+        Insert or replace jobs by id.
+
+        Args:
+            job_ids: Job identifiers (an id repeated within the batch keeps its last embedding)
+            embeddings: One embedding per job id
+        """
+        matrix = normalize_embeddings(embeddings)
+        if len(job_ids) != matrix.shape[0]:
+            raise ValueError("job_ids and embeddings must have the same length")
+        last_row = {job_id: row for row, job_id in enumerate(job_ids)}
+        if len(last_row) < len(job_ids):
+            rows = sorted(last_row.values())
+            job_ids = [job_ids[row] for row in rows]
+            matrix = matrix[rows]
+        if self.dim is None:
+            self.dim = matrix.shape[1]
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        elif matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional embeddings, got {matrix.shape[1]}")
+
+        for job_id in job_ids:
+            self._discard(job_id)
+
+        self._reserve(len(job_ids))
+        start = self._size
+        self._vectors[start:start + len(job_ids)] = matrix
+        for offset, job_id in enumerate(job_ids):
+            self._row_of[job_id] = start + offset
+            self._ids.append(job_id)
+        self._size += len(job_ids)
+
+        if self.is_trained:
+            self._assign_rows(np.arange(start, self._size))
+            self.changes_since_train += len(job_ids)
+            if self.needs_retrain:
+                self.train()
+        elif self._size >= self.min_train_size:
+            self.train()
+
+    def remove(self, job_id: str) -> bool:
+        """Delete a job by id; returns False if it was not indexed"""
+        if not self._discard(job_id):
+            return False
+        if self.is_trained:
+            self.changes_since_train += 1
+            if self.needs_retrain:
+                self.train()
+        return True
+
+    def _discard(self, job_id: str) -> bool:
+        row = self._row_of.pop(job_id, None)
+        if row is None:
+            return False
+
+        last = self._size - 1
+        if self.is_trained:
+            self._lists[self._list_of_row[row]].discard(row)
+        if row != last:
+            # Move the last row into the freed slot so storage stays dense
+            moved_id = self._ids[last]
+            self._vectors[row] = self._vectors[last]
+            self._ids[row] = moved_id
+            self._row_of[moved_id] = row
+            if self.is_trained:
+                cluster = self._list_of_row[last]
+                self._lists[cluster].discard(last)
+                self._lists[cluster].add(row)
+                self._list_of_row[row] = cluster
+        self._ids.pop()
+        self._size -= 1
+        return True
+
+    def train(self, iterations: int = 20) -> None:
+        """Cluster the current vectors with spherical k-means and rebuild the inverted lists"""
+        if self._size == 0:
+            raise ValueError("Cannot train an empty index")
+
+        rng = np.random.default_rng(self.seed)
+        n_lists = min(self.n_lists, self._size)
+        sample_size = min(self._size, self.max_train_samples)
+        sample = self.vectors[rng.choice(self._size, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():
+                # Re-seed empty clusters with random sample points
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            centroids = normalize_embeddings(sums)
+
+        self.centroids = centroids
+        self._lists = [set() for _ in range(n_lists)]
+        self._assign_rows(np.arange(self._size))
+        self._trained_size = self._size
+        self.changes_since_train = 0
+        logger.info(f"Trained job index: {self._size} jobs in {n_lists} lists")
+
+    def _assign_rows(self, rows: np.ndarray, chunk_size: int = 8192) -> None:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            clusters = np.argmax(self._vectors[chunk] @ self.centroids.T, axis=1)
+            self._list_of_row[chunk] = clusters
+            for row, cluster in zip(chunk.tolist(), clusters.tolist()):
+                self._lists[cluster].add(row)
+
+    def search(self, query, k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Approximate top-k search for a query embedding.
+
+        Returns:
+            List of (job_id, cosine_similarity) pairs, best first
+        """
+        if not self.is_trained:
+            return self.exact_search(query, k)
+
+        query_vector = normalize_embeddings(query)[0]
+        probe = min(nprobe or self.nprobe, len(self._lists))
+        centroid_scores = self.centroids @ query_vector
+        clusters = np.argpartition(-centroid_scores, probe - 1)[:probe]
+        rows = np.fromiter(
+            itertools.chain.from_iterable(self._lists[c] for c in clusters.tolist()),
+            dtype=np.int64
+        )
+        if rows.size == 0:
+            return []
+        ranked = top_k_similarities(query_vector, self._vectors[rows], k)
+        return [(self._ids[rows[i]], score) for i, score in ranked]
+
+    def exact_search(self, query, k: int = 10) -> List[Tuple[str, float]]:
+        """Exact top-k search over every indexed job"""
+        ranked = top_k_similarities(query, self.vectors, k)
+        return [(self._ids[i], score) for i, score in ranked]
+
+    def recall(self, queries, k: int = 10, nprobe: Optional[int] = None) -> float:
+        """
+        Mean recall@k of the approximate path against the exact path.
+
+        Args:
+            queries: Query embeddings, one per row
+            k: Number of neighbours compared
+            nprobe: Clusters scanned per query (defaults to the index setting)
+        """
+        query_matrix = normalize_embeddings(queries)
+        if query_matrix.shape[0] == 0 or self._size == 0:
+            return 1.0
+        total = 0.0
+        for query in query_matrix:
+            exact = {job_id for job_id, _ in self.exact_search(query, k)}
+            approximate = {job_id for job_id, _ in self.search(query, k, nprobe)}
+            total += len(exact & approximate) / len(exact)
+        return total / query_matrix.shape[0]
+
+    async def add_job_texts(self, job_ids: Sequence[str], job_texts: Sequence[str]) -> None:
+        """Embed job texts with the scorer and insert them"""
+        if self.scorer is None:
+            raise ValueError("A ResumeScorer is required to embed job texts")
+        embeddings = await self.scorer.get_document_embeddings(list(job_texts))
+        self.add(list(job_ids), embeddings)
+
+    async def top_k_jobs(self, resume_text: str, k: int = 10,
+                         nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Retrieve the k jobs closest to a resume.
+
+        Returns:
+            List of (job_id, cosine_similarity) pairs, best first
+        """
+        if self.scorer is None:
+            raise ValueError("A ResumeScorer is required to embed the resume")
+        resume_embedding = await self.scorer.get_document_embedding(resume_text)
+        return self.search(resume_embedding, k, nprobe)
+
+    def save(self, path: str) -> None:
+        """Write the index in .npz format to exactly path (no suffix is appended)"""
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                ids=np.array(self._ids, dtype=str),
+                vectors=self.vectors,
+                centroids=self.centroids if self.is_trained else np.zeros((0, self.dim or 0), dtype=np.float32),
+                assignments=self._list_of_row[:self._size],
+                config=np.array([self.n_lists, self.nprobe, self.min_train_size, self.max_train_samples, self.seed]),
+                retrain=np.array([
+                    np.nan if self.retrain_ratio is None else self.retrain_ratio,
+                    self._trained_size,
+                    self.changes_since_train
+                ], dtype=np.float64)
+            )
+
+    @classmethod
+    def load(cls, path: str, scorer: Optional[ResumeScorer] = None) -> "JobIndex":
+        """Read an index written by save()"""
+        with np.load(path) as data:
+            n_lists, nprobe, min_train_size, max_train_samples, seed = (int(v) for v in data['config'])
+            retrain_ratio, trained_size, changes = (
+                data['retrain'].tolist() if 'retrain' in data.files else (0.5, 0, 0)
+            )
+            index = cls(scorer=scorer, n_lists=n_lists, nprobe=nprobe, min_train_size=min_train_size,
+                        max_train_samples=max_train_samples,
+                        retrain_ratio=None if np.isnan(retrain_ratio) else retrain_ratio, seed=seed)
+            vectors = data['vectors'].astype(np.float32)
+            index.dim = vectors.shape[1] if vectors.size else None
+            index._vectors = vectors
+            index._size = vectors.shape[0]
+            index._ids = data['ids'].tolist()
+            index._row_of = {job_id: row for row, job_id in enumerate(index._ids)}
+            index._list_of_row = data['assignments'].astype(np.int32)
+            if data['centroids'].shape[0]:
+                index.centroids = data['centroids'].astype(np.float32)
+                index._lists = [set() for _ in range(index.centroids.shape[0])]
+                for row, cluster in enumerate(index._list_of_row.tolist()):
+                    index._lists[cluster].add(row)
+                # Files without retrain state count as freshly trained
+                index._trained_size = int(trained_size) or index._size
+                index.changes_since_train = int(changes)
+        return index
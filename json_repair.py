@@ -0,0 +1,352 @@
+"""
+Tolerant, incremental JSON parsing for LLM responses.
+
+Models wrap JSON in code fences or prose, leave trailing commas, emit Python
+literals, forget commas between fields, put raw newlines or stray quotes in
+strings, and get cut off by max_tokens. StreamingJSONRepairer scans a response
+character by character, rewrites it into valid JSON as it goes, and can be fed
+chunk by chunk from a streaming response. It reports each value as soon as its
+closing quote or bracket arrives, so callers can start on finished fields while
+the rest of the document is still being generated.
+"""
+
+import json
+import re
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+PathKey = Union[str, int]
+Path = Tuple[PathKey, ...]
+ValueCallback = Callable[[Path, Any], None]
+
+_LITERALS = {
+    'true': 'true', 'false': 'false', 'null': 'null',
+    'True': 'true', 'False': 'false', 'None': 'null',
+    'NaN': 'null', 'undefined': 'null',
+}
+_WORD_RE = re.compile(r'[A-Za-z_$][A-Za-z0-9_$\-]*')
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+_STRING_TERMINATORS = ':,}]"\''
+_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t', '\b': '\\b', '\f': '\\f'}
+_CODE_FENCE_RE = re.compile(r'^\s*```[A-Za-z]*\s*|\s*```\s*$')
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a surrounding Markdown code fence, if any"""
+    return _CODE_FENCE_RE.sub('', text)
+
+
+class _Frame:
+    """One open object or array"""
+    __slots__ = ('closer', 'path', 'start', 'state', 'key', 'index')
+
+    def __init__(self, closer: str, path: Path, start: int):
+        self.closer = closer
+        self.path = path
+        self.start = start
+        # object: key -> colon -> value -> comma; array: value -> comma
+        self.state = 'key' if closer == '}' else 'value'
+        self.key: Optional[str] = None
+        self.index = 0
+
+    def child_path(self) -> Path:
+        return self.path + ((self.key if self.closer == '}' else self.index),)
+
+
+class StreamingJSONRepairer:
+    """
+    Incremental scanner that turns almost-JSON into JSON.
+
+    Text before the first brace/bracket and after the document closes is ignored,
+    comments are dropped, and anything still open at finish() is closed.
+    """
+
+    def __init__(self, on_value: Optional[ValueCallback] = None, emit_depth: int = 2):
+        """
+        Initialize the scanner.
+
+        Args:
+            on_value: Called with (path, value) for every completed value at most emit_depth deep
+            emit_depth: Deepest path reported to on_value (1 = top-level fields)
+        """
+        self.on_value = on_value
+        self.emit_depth = emit_depth
+        self._pending = ''
+        # Emitted pieces; values remember the index of their first piece, so only
+        # a finished value's own pieces are joined to decode it
+        self._out: List[str] = []
+        self._stack: List[_Frame] = []
+        self._started = False
+        self._done = False
+        self._string: Optional[dict] = None
+
+    @property
+    def done(self) -> bool:
+        """True once the top-level value has closed"""
+        return self._done
+
+    @property
+    def text(self) -> str:
+        """Repaired JSON emitted so far"""
+        return ''.join(self._out)
+
+    def feed(self, chunk: str) -> None:
+        """Scan another piece of the response"""
+        self._pending += chunk
+        self._scan(final=False)
+
+    def finish(self) -> str:
+        """Scan what is left, close anything still open and return the repaired JSON"""
+        self._scan(final=True)
+        if self._string is not None:
+            self._end_string()
+        while self._stack:
+            self._close()
+        if not self._started:
+            raise ValueError("No JSON object or array found in response")
+        return self.text
+
+    def _emit(self, piece: str) -> None:
+        self._out.append(piece)
+
+    def _scan(self, final: bool) -> None:
+        s = self._pending
+        i = 0
+        while i < len(s) and not self._done:
+            if self._string is not None:
+                i = self._scan_string(s, i, final)
+                if self._string is not None:
+                    break
+                continue
+
+            c = s[i]
+            if not self._started:
+                if c in '{[':
+                    self._open(c)
+                i += 1
+                continue
+            if c.isspace():
+                i += 1
+            elif c == '/':
+                if i + 1 >= len(s) and not final:
+                    break
+                following = s[i + 1] if i + 1 < len(s) else ''
+                terminator = '\n' if following == '/' else '*/' if following == '*' else None
+                if terminator is None:
+                    i += 1
+                    continue
+                end = s.find(terminator, i + 2)
+                if end < 0:
+                    if not final:
+                        break
+                    end = len(s)
+                i = end + len(terminator)
+            elif c in '{[':
+                self._before_value()
+                self._open(c)
+                i += 1
+            elif c in '}]':
+                self._close()
+                i += 1
+            elif c == ',':
+                self._comma()
+                i += 1
+            elif c == ':':
+                frame = self._stack[-1]
+                if frame.closer == '}' and frame.state == 'colon':
+                    self._emit(':')
+                    frame.state = 'value'
+                i += 1
+            elif c in '"\'':
+                self._start_string(c)
+                i += 1
+            elif c.isdigit() or (c in '-+.' and _NUMBER_RE.match(s, i)):
+                match = _NUMBER_RE.match(s, i)
+                if match.end() == len(s) and not final:
+                    break
+                number = match.group().lstrip('+')
+                try:
+                    json.loads(number)
+                except ValueError:
+                    number = repr(float(number))
+                self._scalar(number)
+                i = match.end()
+            elif _WORD_RE.match(s, i):
+                match = _WORD_RE.match(s, i)
+                if match.end() == len(s) and not final:
+                    break
+                word = match.group()
+                frame = self._stack[-1]
+                if frame.closer == '}' and frame.state in ('key', 'comma'):
+                    self._key(json.dumps(word))
+                else:
+                    self._scalar(_LITERALS.get(word) or json.dumps(word))
+                i = match.end()
+            else:
+                i += 1
+        self._pending = s[i:] if not self._done else ''
+
+    def _separate(self) -> None:
+        """Insert a comma the model forgot before a new key or array element"""
+        frame = self._stack[-1]
+        if frame.state == 'comma':
+            self._emit(',')
+            if frame.closer == '}':
+                frame.state = 'key'
+            else:
+                frame.state = 'value'
+                frame.index += 1
+
+    def _before_value(self) -> None:
+        frame = self._stack[-1]
+        self._separate()
+        if frame.closer == '}' and frame.state == 'colon':
+            self._emit(':')
+            frame.state = 'value'
+
+    def _comma(self) -> None:
+        frame = self._stack[-1]
+        if frame.state == 'comma':
+            self._separate()
+
+    def _open(self, bracket: str) -> None:
+        path: Path = self._stack[-1].child_path() if self._stack else ()
+        self._started = True
+        start = len(self._out)
+        self._emit(bracket)
+        self._stack.append(_Frame('}' if bracket == '{' else ']', path, start))
+
+    def _close(self) -> None:
+        frame = self._stack.pop()
+        if self._out and self._out[-1] == ',':
+            self._out.pop()
+        if frame.closer == '}' and frame.state == 'colon':
+            self._emit(':null')
+        elif frame.closer == '}' and frame.state == 'value':
+            self._emit('null')
+        self._emit(frame.closer)
+        if self._stack:
+            self._value_done(frame.start)
+        else:
+            self._done = True
+
+    def _key(self, quoted: str) -> None:
+        self._separate()
+        frame = self._stack[-1]
+        self._emit(quoted)
+        frame.key = json.loads(quoted)
+        frame.state = 'colon'
+
+    def _scalar(self, text: str) -> None:
+        self._before_value()
+        start = len(self._out)
+        self._emit(text)
+        self._value_done(start)
+
+    def _value_done(self, start: int) -> None:
+        frame = self._stack[-1]
+        if frame.closer == '}' and frame.state != 'value':
+            return
+        path = frame.child_path()
+        frame.state = 'comma'
+        if self.on_value is not None and len(path) <= self.emit_depth:
+            self.on_value(path, json.loads(''.join(self._out[start:])))
+
+    def _start_string(self, quote: str) -> None:
+        frame = self._stack[-1]
+        is_key = frame.closer == '}' and frame.state in ('key', 'comma')
+        if is_key:
+            self._separate()
+        else:
+            self._before_value()
+        self._string = {'quote': quote, 'key': is_key, 'start': len(self._out), 'escape': False}
+        self._emit('"')
+
+    def _end_string(self) -> None:
+        state = self._string
+        self._string = None
+        if state['escape']:
+            # Cut off right after a backslash: keep it as a literal backslash
+            self._emit('\\\\')
+        self._emit('"')
+        if state['key']:
+            frame = self._stack[-1]
+            frame.key = json.loads(''.join(self._out[state['start']:]))
+            frame.state = 'colon'
+        else:
+            self._value_done(state['start'])
+
+    def _scan_string(self, s: str, i: int, final: bool) -> int:
+        state = self._string
+        while i < len(s):
+            c = s[i]
+            if state['escape']:
+                state['escape'] = False
+                if c in '"\\/bfnrtu':
+                    self._emit('\\' + c)
+                elif c == "'":
+                    self._emit(c)
+                else:
+                    # Invalid escape such as a Windows path: keep the backslash literally
+                    self._emit('\\\\' + json.dumps(c)[1:-1])
+            elif c == '\\':
+                state['escape'] = True
+            elif c == state['quote'] or c == '"':
+                # A quote only ends the string if what follows could follow a string
+                j = i + 1
+                while j < len(s) and s[j].isspace():
+                    j += 1
+                if j == len(s) and not final:
+                    return i
+                if c == state['quote'] and (j == len(s) or s[j] in _STRING_TERMINATORS):
+                    self._end_string()
+                    return i + 1
+                self._emit('\\"')
+            elif c in _ESCAPES:
+                self._emit(_ESCAPES[c])
+            elif c < ' ':
+                self._emit(f"\\u{ord(c):04x}")
+            else:
+                self._emit(c)
+            i += 1
+        return i
+
+
+def repair_json(text: str) -> str:
+    """Rewrite an almost-JSON LLM response into valid JSON text"""
+    repairer = StreamingJSONRepairer()
+    repairer.feed(text)
+    return repairer.finish()
+
+
+def parse_json(text: str) -> Any:
+    """Parse an LLM JSON response, repairing it only if the strict parse fails"""
+    try:
+        return json.loads(strip_code_fences(text))
+    except ValueError:
+        return json.loads(repair_json(text))
+
+
+class IncrementalJSONParser:
+    """
+    Parses a streamed JSON response, returning fields as they complete.
+
+    feed() returns the (path, value) pairs finished by that chunk; close()
+    returns the whole document, repaired if needed.
+    """
+
+    def __init__(self, emit_depth: int = 2):
+        self._completed: List[Tuple[Path, Any]] = []
+        self._repairer = StreamingJSONRepairer(on_value=self._on_value, emit_depth=emit_depth)
+
+    def _on_value(self, path: Path, value: Any) -> None:
+        self._completed.append((path, value))
+
+    def feed(self, chunk: str) -> List[Tuple[Path, Any]]:
+        """Scan a chunk and return the values it completed"""
+        self._repairer.feed(chunk)
+        completed, self._completed = self._completed, []
+        return completed
+
+    def close(self) -> Any:
+        """Finish the stream and return the parsed document"""
+        return json.loads(self._repairer.finish())
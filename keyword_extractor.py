@@ -0,0 +1,205 @@
+"""
+Corpus-aware keyword extraction for job descriptions.
+
+Keeps document-frequency statistics over the job descriptions it is fitted on
+and ranks terms by TF-IDF with heapq-based top-k, so the keyword strings
+ResumeScorer embeds are short and distinctive. Statistics change only through
+explicit add_document()/update_from_jsonl() calls, never as a side effect of
+extraction. Large descriptions and JSONL job dumps are processed as streams.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import re
+from collections import Counter, OrderedDict
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Union
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'shall', 'can', 'this', 'that',
+    'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
+})
+
+# Words keeping technical terms and acronyms (C++, C#, node.js, ci-cd)
+TOKEN_RE = re.compile(r'\b[A-Za-z][A-Za-z0-9+#\-\.]*\b')
+
+TextSource = Union[str, IO[str]]
+
+
+def iter_text_chunks(source: TextSource, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """
+    Yield a text or text stream in chunks that never split a token.
+
+    Each chunk ends on whitespace; the trailing partial word is carried into the next chunk.
+    """
+    if isinstance(source, str):
+        yield source
+        return
+
+    carry = ''
+    while True:
+        block = source.read(chunk_size)
+        if not block:
+            break
+        block = carry + block
+        cut = max(block.rfind(' '), block.rfind('\n'), block.rfind('\t'))
+        if cut == -1:
+            carry = block
+            continue
+        carry = block[cut + 1:]
+        yield block[:cut + 1]
+    if carry:
+        yield carry
+
+
+def iter_terms(source: TextSource) -> Iterator[str]:
+    """Yield lower-cased candidate keywords (stop words and short words removed)"""
+    for chunk in iter_text_chunks(source):
+        for word in TOKEN_RE.findall(chunk.lower()):
+            if len(word) > 2 and word not in STOP_WORDS:
+                yield word
+
+
+class KeywordExtractor:
+    """
+    TF-IDF keyword extractor with incrementally maintained document frequencies.
+
+    With an empty corpus every term has the same IDF, so ranking falls back to
+    plain term frequency.
+    """
+
+    def __init__(self,
+                 top_k: int = 50,
+                 max_document_ratio: float = 0.8,
+                 min_corpus_size: int = 20,
+                 max_seen: int = 100000):
+        """
+        Initialize the keyword extractor.
+
+        Args:
+            top_k: Default number of keywords returned by extract()
+            max_document_ratio: Drop terms found in more than this share of documents
+            min_corpus_size: Corpus size before max_document_ratio filtering applies
+            max_seen: Fingerprints of recently added documents remembered to skip repeats
+        """
+        self.top_k = top_k
+        self.max_document_ratio = max_document_ratio
+        self.min_corpus_size = min_corpus_size
+        self.document_frequency: Counter = Counter()
+        self.n_documents = 0
+        self.max_seen = max_seen
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+
+    @staticmethod
+    def _fingerprint(text: str) -> str:
+        return hashlib.sha1(' '.join(text.split()).encode('utf-8')).hexdigest()
+
+    def term_frequencies(self, source: TextSource) -> Counter:
+        """Count candidate keywords in a text or text stream"""
+        return Counter(iter_terms(source))
+
+    def add_document(self, source: TextSource, term_counts: Optional[Counter] = None) -> bool:
+        """
+        Add one document to the corpus statistics.
+
+        Plain-text documents among the last max_seen added are ignored, so a
+        corpus listing the same job description twice does not skew document
+        frequencies.
+
+        Returns:
+            True if the document was counted
+        """
+        if isinstance(source, str):
+            fingerprint = self._fingerprint(source)
+            if fingerprint in self._seen:
+                self._seen.move_to_end(fingerprint)
+                return False
+            self._seen[fingerprint] = None
+            while len(self._seen) > self.max_seen:
+                self._seen.popitem(last=False)
+        terms = term_counts if term_counts is not None else self.term_frequencies(source)
+        self.document_frequency.update(terms.keys())
+        self.n_documents += 1
+        return True
+
+    def add_documents(self, documents: Iterable[TextSource]) -> int:
+        """Add many documents; returns how many were counted"""
+        return sum(1 for document in documents if self.add_document(document))
+
+    def update_from_jsonl(self, stream: Iterable[str], field: str = 'description') -> int:
+        """
+        Stream a JSONL job dump (one job object per line) into the corpus statistics.
+
+        Args:
+            stream: Open file or any iterable of JSON lines
+            field: Key holding the job description text
+
+        Returns:
+            Number of documents counted
+        """
+        counted = 0
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            text = json.loads(line).get(field)
+            if text and self.add_document(text):
+                counted += 1
+        return counted
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency of a term"""
+        return math.log((1 + self.n_documents) / (1 + self.document_frequency[term])) + 1.0
+
+    def extract(self, source: TextSource, top_k: Optional[int] = None, learn: bool = False) -> List[str]:
+        """
+        Return the top-k keywords of a text or text stream ranked by TF-IDF.
+
+        Args:
+            source: Text or readable text stream
+            top_k: Number of keywords (defaults to self.top_k)
+            learn: Also add the document to the corpus statistics (off by default so
+                extraction does not depend on what was extracted before)
+        """
+        counts = self.term_frequencies(source)
+        if learn:
+            self.add_document(source, term_counts=counts)
+
+        if self.n_documents >= self.min_corpus_size:
+            max_df = self.max_document_ratio * self.n_documents
+            candidates = [(term, tf) for term, tf in counts.items() if self.document_frequency[term] <= max_df]
+        else:
+            candidates = list(counts.items())
+
+        # nlargest is stable, so ties keep first-occurrence order
+        ranked = heapq.nlargest(top_k or self.top_k, candidates,
+                                key=lambda item: item[1] * self.idf(item[0]))
+        return [term for term, _ in ranked]
+
+    def to_dict(self) -> Dict:
+        """Serializable corpus statistics"""
+        return {
+            'n_documents': self.n_documents,
+            'document_frequency': dict(self.document_frequency),
+            'seen': list(self._seen),
+        }
+
+    def save(self, path: str) -> None:
+        """Write corpus statistics to a JSON file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "KeywordExtractor":
+        """Read corpus statistics written by save()"""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        extractor = cls(**kwargs)
+        extractor.n_documents = data['n_documents']
+        extractor.document_frequency = Counter(data['document_frequency'])
+        extractor._seen = OrderedDict.fromkeys(data.get('seen', [])[-extractor.max_seen:])
+        return extractor
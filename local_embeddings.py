@@ -0,0 +1,74 @@
+"""
+Offline, deterministic local embedding backend.
+
+A hashing vectorizer with an implicit random projection: every term (and word
+bigram) is hashed to a seed that generates a fixed Gaussian vector, and a document
+is the sublinear-TF weighted sum of its term vectors, L2-normalized. No model
+server, network or training data is needed, the same text always yields the same
+vector on every machine, and throughput is thousands of documents per second.
+"""
+
+import hashlib
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import List, Sequence
+
+import numpy as np
+
+from keyword_extractor import iter_terms
+
+
+class HashingEmbedder:
+    """Deterministic fixed-dimension text embedder for pre-ranking and offline benchmarks"""
+
+    def __init__(self, dim: int = 384, seed: int = 0, use_bigrams: bool = True, cache_size: int = 200000):
+        """
+        Initialize the hashing embedder.
+
+        Args:
+            dim: Output vector dimension
+            seed: Salt mixed into every term hash (different seeds give unrelated spaces)
+            use_bigrams: Also embed adjacent-term bigrams
+            cache_size: Number of term vectors memoized in memory
+        """
+        self.dim = dim
+        self.seed = seed
+        self.use_bigrams = use_bigrams
+        self.model_name = f"local-hashing-{dim}-s{seed}"
+        self._term_vector = lru_cache(maxsize=cache_size)(self._make_term_vector)
+
+    def _make_term_vector(self, term: str) -> np.ndarray:
+        digest = hashlib.blake2b(term.encode('utf-8'), digest_size=8, salt=self.seed.to_bytes(8, 'little')).digest()
+        rng = np.random.default_rng(int.from_bytes(digest, 'little'))
+        return rng.standard_normal(self.dim, dtype=np.float32)
+
+    def _features(self, text: str) -> Counter:
+        terms = list(iter_terms(text))
+        features = Counter(terms)
+        if self.use_bigrams:
+            features.update(f"{a} {b}" for a, b in zip(terms, terms[1:]))
+        return features
+
+    def embed_one(self, text: str) -> np.ndarray:
+        """Embed one text as a normalized float32 vector"""
+        features = self._features(text)
+        if not features:
+            return np.zeros(self.dim, dtype=np.float32)
+        weights = np.fromiter((1.0 + math.log(count) for count in features.values()),
+                              dtype=np.float32, count=len(features))
+        vectors = np.stack([self._term_vector(term) for term in features])
+        vector = weights @ vectors
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed many texts, preserving order"""
+        return [self.embed_one(text).tolist() for text in texts]
+
+    def embed_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed many texts into a (len(texts), dim) float32 matrix"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = self.embed_one(text)
+        return matrix
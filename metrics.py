@@ -0,0 +1,274 @@
+"""
+Per-stage timing, token and cost instrumentation.
+
+A MetricsCollector opens one RequestMetrics per pipeline call (score_resume,
+full_matching_analysis). While it is open, instrumented code records wall time,
+rate-limiter queue wait, prompt/completion tokens, prompt-compaction savings,
+retries and cache hits against named stages through the module-level record_*
+helpers. These helpers do nothing when no request is being tracked. Finished requests are attached to
+ScoringResult/MatchingResult and exported to pluggable sinks (JSON lines,
+Prometheus text). cProfile and tracemalloc capture per request are optional.
+"""
+
+import cProfile
+import contextvars
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from typing import IO, AsyncIterator, Dict, List, Optional, Tuple
+
+
+@dataclass
+class StageMetrics:
+    """Accumulated measurements for one stage of one request"""
+    stage: str
+    calls: int = 0
+    errors: int = 0
+    wall_time: float = 0.0
+    queue_wait: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    cache_hits: int = 0
+    # Estimated prompt tokens with and without prompt compaction (see prompt_compaction)
+    uncompacted_prompt_tokens: int = 0
+    compacted_prompt_tokens: int = 0
+
+
+@dataclass
+class RequestMetrics:
+    """Measurements for one pipeline request"""
+    pipeline: str
+    request_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    started_at: float = field(default_factory=time.time)
+    wall_time: float = 0.0
+    stages: Dict[str, StageMetrics] = field(default_factory=dict)
+    profile: Optional[str] = None
+    memory_peak_bytes: Optional[int] = None
+
+    def stage(self, name: str) -> StageMetrics:
+        if name not in self.stages:
+            self.stages[name] = StageMetrics(name)
+        return self.stages[name]
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(s.prompt_tokens for s in self.stages.values())
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(s.completion_tokens for s in self.stages.values())
+
+    def as_dict(self) -> Dict:
+        data = asdict(self)
+        data['stages'] = {name: asdict(s) for name, s in self.stages.items()}
+        data['prompt_tokens'] = self.prompt_tokens
+        data['completion_tokens'] = self.completion_tokens
+        return data
+
+
+_current_request: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar(
+    'current_request_metrics', default=None
+)
+
+
+def current_request() -> Optional[RequestMetrics]:
+    """The request being tracked in this context, if any"""
+    return _current_request.get()
+
+
+def _stage(name: str) -> Optional[StageMetrics]:
+    request = _current_request.get()
+    return request.stage(name) if request is not None else None
+
+
+def record_queue_wait(stage: str, seconds: float) -> None:
+    metrics = _stage(stage)
+    if metrics is not None:
+        metrics.queue_wait += seconds
+
+
+def record_usage(stage: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    metrics = _stage(stage)
+    if metrics is not None:
+        metrics.prompt_tokens += prompt_tokens or 0
+        metrics.completion_tokens += completion_tokens or 0
+
+
+def record_retry(stage: str) -> None:
+    metrics = _stage(stage)
+    if metrics is not None:
+        metrics.retries += 1
+
+
+def record_cache_hits(stage: str, hits: int) -> None:
+    metrics = _stage(stage)
+    if metrics is not None:
+        metrics.cache_hits += hits
+
+
+def record_prompt_compaction(stage: str, uncompacted_tokens: int, compacted_tokens: int) -> None:
+    metrics = _stage(stage)
+    if metrics is not None:
+        metrics.uncompacted_prompt_tokens += uncompacted_tokens
+        metrics.compacted_prompt_tokens += compacted_tokens
+
+
+@asynccontextmanager
+async def track_stage(stage: str) -> AsyncIterator[Optional[StageMetrics]]:
+    """Time one call of a stage against the current request"""
+    metrics = _stage(stage)
+    start = time.perf_counter()
+    try:
+        yield metrics
+    except BaseException:
+        if metrics is not None:
+            metrics.errors += 1
+        raise
+    finally:
+        if metrics is not None:
+            metrics.calls += 1
+            metrics.wall_time += time.perf_counter() - start
+
+
+class JsonLinesSink:
+    """Writes one JSON object per finished request"""
+
+    def __init__(self, path: Optional[str] = None, stream: Optional[IO[str]] = None):
+        self._stream = stream or open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def export(self, request: RequestMetrics) -> None:
+        line = json.dumps(request.as_dict())
+        with self._lock:
+            self._stream.write(line + '\n')
+            self._stream.flush()
+
+
+class PrometheusTextSink:
+    """Aggregates requests into counters rendered in the Prometheus text exposition format"""
+
+    LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, namespace: str = 'applypilot'):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._stage_totals: Dict[Tuple[str, str], StageMetrics] = {}
+        self._requests: Dict[str, int] = {}
+        self._latency_sum: Dict[str, float] = {}
+        self._latency_buckets: Dict[str, List[int]] = {}
+
+    def export(self, request: RequestMetrics) -> None:
+        with self._lock:
+            pipeline = request.pipeline
+            self._requests[pipeline] = self._requests.get(pipeline, 0) + 1
+            self._latency_sum[pipeline] = self._latency_sum.get(pipeline, 0.0) + request.wall_time
+            buckets = self._latency_buckets.setdefault(pipeline, [0] * len(self.LATENCY_BUCKETS))
+            for i, bound in enumerate(self.LATENCY_BUCKETS):
+                if request.wall_time <= bound:
+                    buckets[i] += 1
+            for name, stage in request.stages.items():
+                total = self._stage_totals.setdefault((pipeline, name), StageMetrics(name))
+                for attr in ('calls', 'errors', 'wall_time', 'queue_wait', 'prompt_tokens',
+                             'completion_tokens', 'retries', 'cache_hits',
+                             'uncompacted_prompt_tokens', 'compacted_prompt_tokens'):
+                    setattr(total, attr, getattr(total, attr) + getattr(stage, attr))
+
+    def render(self) -> str:
+        """Current counters as Prometheus text"""
+        ns = self.namespace
+        lines = []
+        with self._lock:
+            lines.append(f"# TYPE {ns}_request_seconds histogram")
+            for pipeline, count in sorted(self._requests.items()):
+                for bound, bucket_count in zip(self.LATENCY_BUCKETS, self._latency_buckets[pipeline]):
+                    lines.append(f'{ns}_request_seconds_bucket{{pipeline="{pipeline}",le="{bound}"}} {bucket_count}')
+                lines.append(f'{ns}_request_seconds_bucket{{pipeline="{pipeline}",le="+Inf"}} {count}')
+                lines.append(f'{ns}_request_seconds_sum{{pipeline="{pipeline}"}} {self._latency_sum[pipeline]:.6f}')
+                lines.append(f'{ns}_request_seconds_count{{pipeline="{pipeline}"}} {count}')
+            counters = [
+                ('stage_calls_total', 'calls'),
+                ('stage_errors_total', 'errors'),
+                ('stage_seconds_total', 'wall_time'),
+                ('stage_queue_wait_seconds_total', 'queue_wait'),
+                ('stage_prompt_tokens_total', 'prompt_tokens'),
+                ('stage_completion_tokens_total', 'completion_tokens'),
+                ('stage_retries_total', 'retries'),
+                ('stage_cache_hits_total', 'cache_hits'),
+                ('stage_uncompacted_prompt_tokens_total', 'uncompacted_prompt_tokens'),
+                ('stage_compacted_prompt_tokens_total', 'compacted_prompt_tokens'),
+            ]
+            for metric, attr in counters:
+                lines.append(f"# TYPE {ns}_{metric} counter")
+                for (pipeline, stage), total in sorted(self._stage_totals.items()):
+                    lines.append(f'{ns}_{metric}{{pipeline="{pipeline}",stage="{stage}"}} {getattr(total, attr)}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str) -> None:
+        """Write the current counters to a file (e.g. for the node-exporter textfile collector)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+
+
+class MetricsCollector:
+    """
+    Opens per-request metrics scopes and exports finished requests to sinks.
+
+    cProfile and tracemalloc are process-wide, so with concurrent requests only
+    one request at a time is profiled and memory peaks include the others' work.
+    """
+
+    def __init__(self, sinks: Optional[List] = None, profile: bool = False,
+                 trace_memory: bool = False, profile_top: int = 25):
+        """
+        Initialize the collector.
+
+        Args:
+            sinks: Objects with an export(RequestMetrics) method
+            profile: Capture a cProfile summary per request
+            trace_memory: Record the tracemalloc peak per request
+            profile_top: Number of functions kept in the profile summary
+        """
+        self.sinks = list(sinks or [])
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_top = profile_top
+        self._profiling = threading.Lock()
+
+    @asynccontextmanager
+    async def request(self, pipeline: str) -> AsyncIterator[RequestMetrics]:
+        """Track one pipeline request; metrics are final once the block exits"""
+        request = RequestMetrics(pipeline)
+        token = _current_request.set(request)
+
+        profiler = None
+        if self.profile and self._profiling.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            profiler.enable()
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            yield request
+        finally:
+            request.wall_time = time.perf_counter() - start
+            _current_request.reset(token)
+            if self.trace_memory:
+                request.memory_peak_bytes = tracemalloc.get_traced_memory()[1]
+            if profiler is not None:
+                profiler.disable()
+                self._profiling.release()
+                output = io.StringIO()
+                pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(self.profile_top)
+                request.profile = output.getvalue()
+            for sink in self.sinks:
+                sink.export(request)
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI and Ollama HTTP APIs.
+
+Speaks enough of both wire formats for ResumeScorer and EnhancedMatchingSystem:
+OpenAI /v1/chat/completions (including SSE streaming) and /v1/embeddings, and
+Ollama /api/generate (including NDJSON streaming) and /api/embed. Latency is drawn
+from a configurable log-normal distribution, a configurable share of requests
+fails with 429/500, chat prompts for the 22-variable pipeline get canned JSON
+documents, and embeddings come from the deterministic local hashing backend.
+GET /stats returns request, error and token counts per pipeline stage.
+
+Usage:
+    python mock_llm_server.py --port 8089 --chat-latency 0.8 2.0 --error-rate 0.02
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from local_embeddings import HashingEmbedder
+from rate_limiter import estimate_tokens
+
+CATEGORY_PREFIXES = {
+    'critical_requirements': ('req', 5),
+    'core_competencies': ('comp', 8),
+    'experience_factors': ('exp', 4),
+    'preferred_qualifications': ('pref', 5),
+}
+
+SKILLS = [
+    "Python", "JavaScript", "SQL", "REST APIs", "AWS", "Docker", "Git", "React",
+    "Node.js", "Agile", "Communication", "Leadership", "Kubernetes", "CI/CD",
+    "PostgreSQL", "System Design", "Testing", "Mentoring", "Linux", "Security",
+    "Bachelor's degree", "5+ years experience",
+]
+
+
+@dataclass
+class MockServerConfig:
+    """Latency, error and payload settings for the mock server"""
+    chat_latency: Tuple[float, float] = (0.5, 1.5)        # (median, p95) seconds
+    embedding_latency: Tuple[float, float] = (0.05, 0.15)
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (429, 500)
+    embedding_dim: int = 1536
+    stream_chunk_chars: int = 40
+    seed: Optional[int] = None
+
+
+def sample_latency(rng: random.Random, median: float, p95: float) -> float:
+    """Draw from a log-normal distribution with the given median and 95th percentile"""
+    if median <= 0:
+        return 0.0
+    sigma = max(0.0, math.log(max(p95, median) / median) / 1.645)
+    return rng.lognormvariate(math.log(median), sigma)
+
+
+def classify_stage(messages: List[Dict[str, str]]) -> str:
+    """Name the pipeline stage a chat request belongs to"""
+    system = ' '.join(m.get('content') or '' for m in messages if m.get('role') == 'system')
+    if 'HR analyst' in system:
+        return 'job_extraction'
+    if 'resume analyzer' in system:
+        return 'candidate_extraction'
+    if 'statistical analyst' in system:
+        return 'comparison'
+    if 'hiring advisor' in system:
+        return 'recommendations'
+    return 'resume_improvement'
+
+
+def _job_document(prompt: str, rng: random.Random) -> Dict:
+    title = re.search(r'JOB TITLE:\s*(.*)', prompt)
+    company = re.search(r'COMPANY:\s*(.*)', prompt)
+    document = {
+        'job_analysis': {
+            'title': title.group(1).strip() if title else 'Software Engineer',
+            'company': company.group(1).strip() if company else 'Example Corp',
+            'industry': 'technology',
+            'seniority_level': 'senior',
+            'job_type': 'technical',
+        }
+    }
+    skills = rng.sample(SKILLS, 22)
+    for category, (prefix, count) in CATEGORY_PREFIXES.items():
+        document[category] = {
+            f"{prefix}_{i}": {
+                'variable': skills.pop(),
+                'description': 'Required for day-to-day work on the team',
+                'evidence_needed': 'Explicit mention in work history or skills',
+                'disqualifier': category == 'critical_requirements',
+            }
+            for i in range(1, count + 1)
+        }
+    return document
+
+
+def _candidate_document(rng: random.Random) -> Dict:
+    document = {
+        'candidate_analysis': {
+            'name': 'Mock Candidate',
+            'years_total_experience': '6',
+            'current_level': 'senior',
+            'primary_expertise': 'software engineering',
+            'industry_background': 'technology',
+        }
+    }
+    skills = rng.sample(SKILLS, 22)
+    for category, (prefix, count) in CATEGORY_PREFIXES.items():
+        document[category] = {
+            f"{prefix}_{i}": {
+                'variable': skills.pop(),
+                'present': rng.random() < 0.7,
+                'evidence': 'Listed under professional experience',
+                'proficiency_level': 'advanced',
+            }
+            for i in range(1, count + 1)
+        }
+    return document
+
+
+def _comparison_document(rng: random.Random) -> Dict:
+    detailed = {}
+    total_matches = 0
+    for category, (prefix, count) in CATEGORY_PREFIXES.items():
+        details = []
+        for i in range(1, count + 1):
+            match = rng.random() < 0.7
+            total_matches += match
+            details.append({
+                'variable': f"{category} {i}",
+                'candidate_has': 'Listed under professional experience' if match else 'Not found',
+                'match': match,
+                'notes': 'Mock comparison',
+            })
+        matches = sum(d['match'] for d in details)
+        detailed[category] = {
+            'matches': f"{matches} out of {count}",
+            'score': str(round(100.0 * matches / count, 1)),
+            'details': details,
+        }
+    return {
+        'comparison_summary': {
+            'total_matches': f"{total_matches} out of 22",
+            'match_percentage': str(round(total_matches / 22, 3)),
+            'statistical_significance': 'significant' if total_matches >= 14 else 'none',
+            'confidence_level': '95',
+            'overall_recommendation': 'moderate_fit',
+        },
+        'detailed_comparison': detailed,
+        'statistical_analysis': {},
+        'recommendations': {
+            'hiring_decision': 'maybe',
+            'missing_critical': [d['variable'] for d in detailed['critical_requirements']['details'] if not d['match']],
+            'development_areas': [],
+            'strengths': [],
+            'next_steps': ['Schedule a technical screen'],
+        },
+    }
+
+
+def canned_completion(stage: str, prompt: str, rng: random.Random) -> str:
+    """Response text for a chat/generate request of the given stage"""
+    if stage == 'job_extraction':
+        return "```json\n" + json.dumps(_job_document(prompt, rng), indent=2) + "\n```"
+    if stage == 'candidate_extraction':
+        return json.dumps(_candidate_document(rng), indent=2)
+    if stage == 'comparison':
+        return json.dumps(_comparison_document(rng), indent=2)
+    if stage == 'recommendations':
+        return json.dumps({'next_steps': ['Schedule a technical screen', 'Ask for a code sample']})
+    keywords = re.search(r'Extracted Job Keywords:\s*```\s*(.*?)```', prompt, re.S)
+    skills = keywords.group(1).strip() if keywords else ', '.join(SKILLS[:8])
+    return (
+        "# Mock Candidate\n\n## Summary\nSoftware engineer experienced in "
+        f"{skills}.\n\n## Experience\n- Delivered production systems using {skills}.\n"
+    )
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the mock configuration and per-stage stats"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: MockServerConfig):
+        super().__init__(address, MockRequestHandler)
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.embedder = HashingEmbedder(dim=config.embedding_dim)
+        self.lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, stage: str, prompt_tokens: int = 0, completion_tokens: int = 0, error: bool = False) -> None:
+        with self.lock:
+            entry = self.stats.setdefault(stage, {'requests': 0, 'errors': 0,
+                                                  'prompt_tokens': 0, 'completion_tokens': 0})
+            entry['requests'] += 1
+            entry['errors'] += int(error)
+            entry['prompt_tokens'] += prompt_tokens
+            entry['completion_tokens'] += completion_tokens
+
+    def draw(self, latency: Tuple[float, float]) -> Tuple[float, Optional[int]]:
+        """Pick this request's latency and, maybe, an error status"""
+        with self.lock:
+            delay = sample_latency(self.rng, *latency)
+            fail = self.rng.random() < self.config.error_rate
+            status = self.rng.choice(self.config.error_statuses) if fail else None
+        return delay, status
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Routes OpenAI- and Ollama-style requests"""
+
+    server: MockLLMServer
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: Dict, status: int = 200) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 429:
+            self.send_header('Retry-After', '0.1')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, lines: List[bytes], content_type: str) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for line in lines:
+            self.wfile.write(f"{len(line):X}\r\n".encode() + line + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _fail(self, stage: str, status: int) -> None:
+        self.server.record(stage, error=True)
+        self._send_json({'error': {'message': f'mock {status}', 'type': 'mock_error'}}, status)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            with self.server.lock:
+                self._send_json(json.loads(json.dumps(self.server.stats)))
+        else:
+            self._send_json({'error': 'not found'}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        path = self.path.rstrip('/')
+        if path.endswith('/chat/completions'):
+            self._chat(request)
+        elif path.endswith('/embeddings'):
+            self._openai_embeddings(request)
+        elif path == '/api/generate':
+            self._ollama_generate(request)
+        elif path == '/api/embed':
+            self._ollama_embed(request)
+        else:
+            self._send_json({'error': 'not found'}, 404)
+
+    def _chunks(self, text: str) -> List[str]:
+        size = self.server.config.stream_chunk_chars
+        return [text[i:i + size] for i in range(0, len(text), size)] or ['']
+
+    def _chat(self, request: Dict) -> None:
+        messages = request.get('messages', [])
+        stage = classify_stage(messages)
+        delay, status = self.server.draw(self.server.config.chat_latency)
+        time.sleep(delay)
+        if status:
+            return self._fail(stage, status)
+
+        prompt = '\n'.join(m.get('content') or '' for m in messages)
+        n = int(request.get('n') or 1)
+        texts = [canned_completion(stage, prompt, self.server.rng) for _ in range(n)]
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = sum(estimate_tokens(text) for text in texts)
+        self.server.record(stage, prompt_tokens, completion_tokens)
+        usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                 'total_tokens': prompt_tokens + completion_tokens}
+        base = {'id': 'chatcmpl-mock', 'created': int(time.time()), 'model': request.get('model', 'mock')}
+
+        if not request.get('stream'):
+            return self._send_json({**base, 'object': 'chat.completion', 'usage': usage, 'choices': [
+                {'index': i, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': text}}
+                for i, text in enumerate(texts)
+            ]})
+
+        lines = []
+        for i, text in enumerate(texts):
+            for piece in self._chunks(text):
+                chunk = {**base, 'object': 'chat.completion.chunk',
+                         'choices': [{'index': i, 'delta': {'content': piece}, 'finish_reason': None}]}
+                lines.append(f"data: {json.dumps(chunk)}\n\n".encode())
+        if (request.get('stream_options') or {}).get('include_usage'):
+            lines.append(f"data: {json.dumps({**base, 'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})}\n\n".encode())
+        lines.append(b"data: [DONE]\n\n")
+        self._send_stream(lines, 'text/event-stream')
+
+    def _embed_inputs(self, inputs) -> Tuple[List[str], List[List[float]]]:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        return texts, self.server.embedder.embed(texts)
+
+    def _openai_embeddings(self, request: Dict) -> None:
+        delay, status = self.server.draw(self.server.config.embedding_latency)
+        time.sleep(delay)
+        if status:
+            return self._fail('embedding', status)
+        texts, vectors = self._embed_inputs(request.get('input', []))
+        tokens = sum(estimate_tokens(text) for text in texts)
+        self.server.record('embedding', tokens)
+        self._send_json({
+            'object': 'list',
+            'model': request.get('model', 'mock'),
+            'data': [{'object': 'embedding', 'index': i, 'embedding': v} for i, v in enumerate(vectors)],
+            'usage': {'prompt_tokens': tokens, 'total_tokens': tokens},
+        })
+
+    def _ollama_embed(self, request: Dict) -> None:
+        delay, status = self.server.draw(self.server.config.embedding_latency)
+        time.sleep(delay)
+        if status:
+            return self._fail('embedding', status)
+        texts, vectors = self._embed_inputs(request.get('input', []))
+        tokens = sum(estimate_tokens(text) for text in texts)
+        self.server.record('embedding', tokens)
+        self._send_json({'model': request.get('model', 'mock'), 'embeddings': vectors,
+                         'prompt_eval_count': tokens})
+
+    def _ollama_generate(self, request: Dict) -> None:
+        prompt = request.get('prompt', '')
+        stage = classify_stage([{'role': 'system', 'content': request.get('system') or ''}])
+        delay, status = self.server.draw(self.server.config.chat_latency)
+        time.sleep(delay)
+        if status:
+            return self._fail(stage, status)
+
+        text = canned_completion(stage, prompt, self.server.rng)
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(text)
+        self.server.record(stage, prompt_tokens, completion_tokens)
+        base = {'model': request.get('model', 'mock'), 'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ')}
+        final = {**base, 'response': '', 'done': True, 'done_reason': 'stop',
+                 'prompt_eval_count': prompt_tokens, 'eval_count': completion_tokens}
+
+        if request.get('stream') is False:
+            return self._send_json({**final, 'response': text})
+        lines = [(json.dumps({**base, 'response': piece, 'done': False}) + '\n').encode()
+                 for piece in self._chunks(text)]
+        lines.append((json.dumps(final) + '\n').encode())
+        self._send_stream(lines, 'application/x-ndjson')
+
+
+def start_mock_server(config: Optional[MockServerConfig] = None,
+                      host: str = '127.0.0.1', port: int = 0) -> MockLLMServer:
+    """
+    Start the mock server on a background thread.
+
+    Returns:
+        The running server; its URL is http://{host}:{server.server_port}
+    """
+    server = MockLLMServer((host, port), config or MockServerConfig())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--chat-latency', type=float, nargs=2, default=[0.5, 1.5], metavar=('MEDIAN', 'P95'))
+    parser.add_argument('--embedding-latency', type=float, nargs=2, default=[0.05, 0.15], metavar=('MEDIAN', 'P95'))
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--embedding-dim', type=int, default=1536)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    config = MockServerConfig(
+        chat_latency=tuple(args.chat_latency),
+        embedding_latency=tuple(args.embedding_latency),
+        error_rate=args.error_rate,
+        embedding_dim=args.embedding_dim,
+        seed=args.seed,
+    )
+    server = MockLLMServer((args.host, args.port), config)
+    print(f"Mock LLM server listening on http://{args.host}:{server.server_port}")
+    print(f"  OpenAI base_url: http://{args.host}:{server.server_port}/v1")
+    print(f"  Ollama host:     http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,9 @@ from job descriptions and candidate profiles, and provides the mathematical
 framework for determining match significance.
 """
 
+import math
 import numpy as np
-import pandas as pd
-from scipy import stats
-from sklearn.feature_selection import SelectKBest, f_classif, mutual_info_classif
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-from sklearn.model_selection import cross_val_score
-from sklearn.ensemble import RandomForestClassifier
-import matplotlib.pyplot as plt
+from statistics import NormalDist
 from typing import Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
@@ -241,8 +235,8 @@ class OptimalMatchingVariables:
         for power in power_levels:
             # Approximate sample size calculation
             # N = (Z_α/2 + Z_β)² * (1-R²) / (R²/df)
-            z_alpha = stats.norm.ppf(1 - alpha/2)
-            z_beta = stats.norm.ppf(power)
+            z_alpha = NormalDist().inv_cdf(1 - alpha/2)
+            z_beta = NormalDist().inv_cdf(power)
             
             n = ((z_alpha + z_beta) ** 2) * ((1 - r_squared) / (r_squared / df))
             sample_sizes.append(int(n))
@@ -313,7 +307,7 @@ class OptimalMatchingVariables:
         
         if expected_matches > 0:
             chi2_stat = ((observed_matches - expected_matches) ** 2) / expected_matches
-            p_value = 1 - stats.chi2.cdf(chi2_stat, df=1)
+            p_value = math.erfc(math.sqrt(chi2_stat / 2))  # chi-square survival function, df=1
         else:
             chi2_stat = 0
             p_value = 1
@@ -420,8 +414,8 @@ class OptimalMatchingVariables:
         
         # 2. Cohen's Power Analysis
         r_squared = effect_size ** 2 / (1 + effect_size ** 2)
-        z_alpha = stats.norm.ppf(0.975)  # 95% confidence
-        z_beta = stats.norm.ppf(desired_power)
+        z_alpha = NormalDist().inv_cdf(0.975)  # 95% confidence
+        z_beta = NormalDist().inv_cdf(desired_power)
         
         cohen_n = int(((z_alpha + z_beta) ** 2) * ((1 - r_squared) / (r_squared / num_variables)))
         
@@ -0,0 +1,119 @@
+"""
+Prompt compaction for the 22-variable pipeline.
+
+Input tokens drive both latency and cost. The extraction and comparison prompts
+used to embed pretty-printed documents: full extractions including the
+descriptions and evidence_needed hints the comparison never reads, and
+structured resume data that mostly repeats the resume text sent alongside it.
+The helpers here project only the fields a stage uses, drop resume data already
+present in the resume text, and serialize without whitespace.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from extraction_schema import CATEGORY_LAYOUT
+from metrics import record_prompt_compaction
+from rate_limiter import estimate_tokens
+
+# Variable fields the comparison prompt needs from each extraction
+COMPARISON_FIELDS = {
+    'job': ('variable', 'disqualifier', 'proficiency_level', 'minimum_threshold', 'bonus_value'),
+    'candidate': ('variable', 'present', 'evidence', 'details', 'proficiency_level',
+                  'years_experience', 'measurement', 'meets_threshold', 'value_level'),
+}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def compact_json(value: Any) -> str:
+    """Serialize without indentation or padding"""
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def _truncate(value: Any, max_chars: Optional[int]) -> Any:
+    if max_chars is None or not isinstance(value, str) or len(value) <= max_chars:
+        return value
+    return value[:max_chars - 3].rstrip() + '...'
+
+
+def project_variables(document: Dict, fields: List[str], max_text_chars: Optional[int] = None) -> Dict:
+    """
+    Keep only the given fields of every variable in an extraction.
+
+    Summary sections (job_analysis, candidate_analysis) are kept as they are.
+
+    Args:
+        document: Job or candidate extraction
+        fields: Variable fields to keep
+        max_text_chars: Truncate longer string values (e.g. quoted evidence)
+    """
+    projected = {}
+    for section, value in document.items():
+        if section not in CATEGORY_LAYOUT or not isinstance(value, dict):
+            projected[section] = value
+            continue
+        projected[section] = {
+            key: {name: _truncate(variable[name], max_text_chars) for name in fields if name in variable}
+            if isinstance(variable, dict) else variable
+            for key, variable in value.items()
+        }
+    return projected
+
+
+def compact_for_comparison(document: Dict, kind: str, max_text_chars: Optional[int] = 240) -> str:
+    """Compact JSON of the parts of a 'job' or 'candidate' extraction the comparison uses"""
+    return compact_json(project_variables(document, COMPARISON_FIELDS[kind], max_text_chars))
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(' ', text).strip().casefold()
+
+
+def _mentions(text: str, phrase: str) -> bool:
+    """True if phrase occurs in text as whole words ("R" is not found in "retail", "C" not in "C++")"""
+    return re.search(r'(?<![\w+#])' + re.escape(phrase) + r'(?![\w+#])', text) is not None
+
+
+def dedupe_resume_data(resume_text: str, resume_data: Any) -> Any:
+    """
+    Drop the parts of structured resume data that already appear in the resume text.
+
+    Strings found as whole words (ignoring case and whitespace) in the text are removed,
+    as are lists and objects left empty; numbers and booleans are kept since a
+    matching digit in the text is no evidence of duplication.
+
+    Returns:
+        The remaining data, or None if nothing is left
+    """
+    text = _normalize(resume_text or '')
+
+    def prune(value: Any) -> Any:
+        if isinstance(value, str):
+            normalized = _normalize(value)
+            return None if not normalized or _mentions(text, normalized) else value
+        if isinstance(value, dict):
+            kept = {key: pruned for key, pruned in ((k, prune(v)) for k, v in value.items()) if pruned is not None}
+            return kept or None
+        if isinstance(value, (list, tuple)):
+            kept = [pruned for pruned in (prune(v) for v in value) if pruned is not None]
+            return kept or None
+        return value
+
+    return prune(resume_data)
+
+
+def report_compaction(stage: str, prompt: str, compact_section: str, original_section: str) -> None:
+    """
+    Record a prompt's estimated tokens with and without compaction against a stage.
+
+    Args:
+        stage: Pipeline stage the prompt is sent for
+        prompt: The compacted prompt as sent
+        compact_section: Compacted text embedded in the prompt
+        original_section: Text the uncompacted prompt would have embedded instead
+    """
+    compacted = estimate_tokens(prompt)
+    uncompacted = compacted - estimate_tokens(compact_section) + estimate_tokens(original_section)
+    record_prompt_compaction(stage, uncompacted, compacted)
@@ -0,0 +1,223 @@
+"""
+Shared client-side rate limiting for LLM and embedding calls.
+
+Each model gets two token buckets, one for requests per minute and one for tokens
+per minute. Callers estimate a request's tokens before sending it, wait in FIFO
+order until both buckets can cover it, and settle the estimate against the usage
+the API reports afterwards. Pacing requests this way keeps batch runs close to
+quota without tripping 429s.
+
+Quotas are opt-in: a RateLimiter without configured limits passes every request
+straight through. Pass DEFAULT_RATE_LIMITS (or your account tier's numbers) to
+enable pacing.
+"""
+
+import asyncio
+import math
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class RateLimit:
+    """Per-model quota"""
+    requests_per_minute: float
+    tokens_per_minute: float
+
+
+# Conservative quotas for the models this repo uses, applied only when passed to RateLimiter
+DEFAULT_RATE_LIMITS: Dict[str, RateLimit] = {
+    'gpt-4o': RateLimit(requests_per_minute=500, tokens_per_minute=30000),
+    'text-embedding-ada-002': RateLimit(requests_per_minute=3000, tokens_per_minute=1000000),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (about 4 characters per token)"""
+    return max(1, math.ceil(len(text) / 4))
+
+
+def estimate_chat_tokens(messages: List[Dict[str, str]], max_tokens: int = 0) -> int:
+    """
+    Estimate tokens charged for a chat request: prompt plus the expected completion.
+
+    Args:
+        messages: Chat messages of the request
+        max_tokens: Completion tokens to reserve; pass the expected completion size
+            rather than the hard max_tokens cap, since settle() corrects the estimate
+    """
+    prompt_tokens = sum(estimate_tokens(message.get('content') or '') + 4 for message in messages) + 2
+    return prompt_tokens + max_tokens
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to one minute of quota"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until amount can be taken (0.0 if available now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float) -> None:
+        """Give back (positive) or charge (negative) tokens after the fact"""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """
+    Per-model requests-per-minute and tokens-per-minute limiter.
+
+    Waiters for the same model are served in arrival order, so a burst of small
+    requests cannot starve a large one. Models without a configured limit pass
+    straight through. The waiter at the head of the queue re-checks the buckets
+    whenever settle() refunds tokens, and at least every max_wait_slice seconds.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, RateLimit]] = None,
+                 default_limit: Optional[RateLimit] = None,
+                 max_wait_slice: float = 1.0):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            limits: Quota per model name (None = no limits, e.g. DEFAULT_RATE_LIMITS to opt in)
+            default_limit: Quota for models not listed in limits (None = unlimited)
+            max_wait_slice: Longest sleep before the head waiter re-checks the buckets
+        """
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.max_wait_slice = max_wait_slice
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        # Keyed by the event loop object (ids are reused); entries of closed loops are
+        # pruned whenever a new loop shows up, since the locks and events reference it
+        self._queues: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]' = \
+            weakref.WeakKeyDictionary()
+        # loop -> model -> event set when settle() returns tokens
+        self._refunds: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Event]]' = \
+            weakref.WeakKeyDictionary()
+        self.total_wait: Dict[str, float] = {}
+
+    def set_limit(self, model: str, limit: RateLimit) -> None:
+        """Set or replace the quota for one model"""
+        self.limits[model] = limit
+        self._buckets.pop(model, None)
+
+    def _get_buckets(self, model: str) -> Optional[Tuple[TokenBucket, TokenBucket]]:
+        limit = self.limits.get(model, self.default_limit)
+        if limit is None:
+            return None
+        if model not in self._buckets:
+            self._buckets[model] = (TokenBucket(limit.requests_per_minute), TokenBucket(limit.tokens_per_minute))
+        return self._buckets[model]
+
+    def _prune_closed_loops(self) -> None:
+        for registry in (self._queues, self._refunds):
+            for loop in [loop for loop in list(registry.keys()) if loop.is_closed()]:
+                registry.pop(loop, None)
+
+    def _get_queue(self, model: str) -> asyncio.Lock:
+        # asyncio.Lock wakes waiters in FIFO order; one lock per model and event loop
+        loop = asyncio.get_running_loop()
+        if loop not in self._queues:
+            self._prune_closed_loops()
+        queues = self._queues.setdefault(loop, {})
+        if model not in queues:
+            queues[model] = asyncio.Lock()
+        return queues[model]
+
+    def _get_refund_event(self, model: str) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if loop not in self._refunds:
+            self._prune_closed_loops()
+        events = self._refunds.setdefault(loop, {})
+        if model not in events:
+            events[model] = asyncio.Event()
+        return events[model]
+
+    async def acquire(self, model: str, tokens: int) -> float:
+        """
+        Wait until one request of `tokens` estimated tokens may be sent to model.
+
+        Returns:
+            Seconds spent waiting in the queue
+        """
+        buckets = self._get_buckets(model)
+        if buckets is None:
+            return 0.0
+        requests_bucket, tokens_bucket = buckets
+
+        start = time.monotonic()
+        async with self._get_queue(model):
+            refunded = self._get_refund_event(model)
+            while True:
+                delay = max(requests_bucket.delay_for(1), tokens_bucket.delay_for(tokens))
+                if delay <= 0:
+                    break
+                # Sleep until the buckets refill, a refund arrives, or the slice ends
+                refunded.clear()
+                try:
+                    await asyncio.wait_for(refunded.wait(), min(delay, self.max_wait_slice))
+                except asyncio.TimeoutError:
+                    pass
+            requests_bucket.take(1)
+            tokens_bucket.take(tokens)
+        waited = time.monotonic() - start
+        self.total_wait[model] = self.total_wait.get(model, 0.0) + waited
+        return waited
+
+    def settle(self, model: str, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct the token bucket once the API reports the real usage"""
+        buckets = self._get_buckets(model)
+        if buckets is None or actual_tokens is None:
+            return
+        buckets[1].adjust(estimated_tokens - actual_tokens)
+        if actual_tokens < estimated_tokens:
+            self._wake(model)
+
+    def _wake(self, model: str) -> None:
+        """Let the head waiter for model re-check the buckets on every loop"""
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        self._prune_closed_loops()
+        for loop, events in list(self._refunds.items()):
+            event = events.get(model)
+            if event is None:
+                continue
+            if loop is current:
+                event.set()
+            else:
+                loop.call_soon_threadsafe(event.set)
+
+
+_shared_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """Process-wide limiter shared by every ResumeScorer and EnhancedMatchingSystem"""
+    global _shared_rate_limiter
+    if _shared_rate_limiter is None:
+        _shared_rate_limiter = RateLimiter()
+    return _shared_rate_limiter
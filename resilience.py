@@ -0,0 +1,186 @@
+"""
+Retry and request-hedging layer for LLM calls.
+
+Transient failures (rate limits, timeouts, connection resets, 5xx) are retried
+with exponential backoff and full jitter, honouring Retry-After when the API
+sends it. Optionally a stage can be hedged: if the first request has not answered
+after the stage's observed p95 latency, a second identical request is fired and
+whichever finishes first wins. Per-stage counters make the cost of both visible.
+"""
+
+import asyncio
+import logging
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from metrics import record_retry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+TRANSIENT_ERROR_NAMES = {'APIConnectionError', 'APITimeoutError', 'RateLimitError', 'InternalServerError'}
+
+
+def is_transient(error: BaseException) -> bool:
+    """True for errors worth retrying: rate limits, timeouts, dropped connections and 5xx responses"""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    return getattr(error, 'status_code', None) in TRANSIENT_STATUS_CODES
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Server-requested delay from a Retry-After header, if any"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        value = headers.get('retry-after')
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """Backoff and hedging settings"""
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    hedging: bool = False
+    hedge_delay: float = 10.0        # used until enough latency samples exist
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+
+
+@dataclass
+class StageCounters:
+    """Retry and hedge counters for one pipeline stage"""
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    failures: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=500))
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            'calls': self.calls,
+            'attempts': self.attempts,
+            'retries': self.retries,
+            'failures': self.failures,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+        }
+
+
+class Resilience:
+    """Runs stage calls with retries and optional hedging, keeping per-stage counters"""
+
+    def __init__(self, policy: Optional[RetryPolicy] = None,
+                 stage_policies: Optional[Dict[str, RetryPolicy]] = None):
+        """
+        Initialize the resilience layer.
+
+        Args:
+            policy: Default policy for every stage
+            stage_policies: Overrides for individual stages
+        """
+        self.policy = policy or RetryPolicy()
+        self.stage_policies = stage_policies or {}
+        self.stats: Dict[str, StageCounters] = {}
+
+    def _counters(self, stage: str) -> StageCounters:
+        if stage not in self.stats:
+            self.stats[stage] = StageCounters()
+        return self.stats[stage]
+
+    def policy_for(self, stage: str) -> RetryPolicy:
+        return self.stage_policies.get(stage, self.policy)
+
+    def hedge_delay(self, stage: str) -> Optional[float]:
+        """Seconds to wait before hedging a stage call (None when hedging is off)"""
+        policy = self.policy_for(stage)
+        if not policy.hedging:
+            return None
+        latencies = sorted(self._counters(stage).latencies)
+        if len(latencies) < policy.hedge_min_samples:
+            return policy.hedge_delay
+        return latencies[min(len(latencies) - 1, int(policy.hedge_quantile * len(latencies)))]
+
+    async def call(self, stage: str, factory: Callable[[], Awaitable[T]], hedge: bool = True) -> T:
+        """
+        Run factory() with retries (and hedging if enabled) for the given stage.
+
+        Args:
+            stage: Stage name used for counters and per-stage policies
+            factory: Zero-argument callable returning a fresh awaitable per attempt
+            hedge: Allow a hedged second attempt; pass False when attempts have side
+                effects that must not run concurrently (e.g. streaming to a callback)
+        """
+        policy = self.policy_for(stage)
+        counters = self._counters(stage)
+        counters.calls += 1
+        loop = asyncio.get_running_loop()
+
+        for attempt in range(1, policy.max_attempts + 1):
+            counters.attempts += 1
+            start = loop.time()
+            try:
+                result = await self._hedged(stage, factory, counters, hedge)
+                counters.latencies.append(loop.time() - start)
+                return result
+            except Exception as e:
+                if attempt == policy.max_attempts or not is_transient(e):
+                    counters.failures += 1
+                    raise
+                backoff = random.uniform(0, min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1)))
+                delay = max(backoff, retry_after_seconds(e) or 0.0)
+                counters.retries += 1
+                record_retry(stage)
+                logger.warning(f"{stage}: transient error on attempt {attempt} ({e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def _hedged(self, stage: str, factory: Callable[[], Awaitable[T]], counters: StageCounters,
+                      hedge: bool = True) -> T:
+        delay = self.hedge_delay(stage) if hedge else None
+        if delay is None:
+            return await factory()
+
+        primary = asyncio.ensure_future(factory())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            counters.hedges += 1
+            hedge = asyncio.ensure_future(factory())
+            tasks.append(hedge)
+            pending = {primary, hedge}
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            counters.hedge_wins += 1
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            # Also runs when the caller is cancelled mid-race: stop both requests and
+            # wait for them to unwind so neither is left running unobserved
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return retry/hedge counters for every stage"""
+        return {stage: counters.as_dict() for stage, counters in self.stats.items()}
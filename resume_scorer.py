@@ -1,15 +1,81 @@
 import os
 import re
 import json
+import asyncio
 import logging
+import weakref
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
-from openai import OpenAI
-import ollama
+from typing import Dict, Iterable, List, Tuple, Optional, Any, Callable
+from dataclasses import dataclass, field
+
+from chunking import pool_embeddings, split_into_chunks
+from client_registry import ClientRegistry, get_shared_client_registry
+from embedding_cache import EmbeddingCache
+from keyword_extractor import KeywordExtractor
+from local_embeddings import HashingEmbedder
+from metrics import MetricsCollector, record_cache_hits, record_queue_wait, record_usage, track_stage
+from rate_limiter import RateLimiter, estimate_chat_tokens, estimate_tokens, get_shared_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# Openers that mean the model is writing commentary instead of the resume
+_COMMENTARY_RE = re.compile(
+    r"^\W*(sure|certainly|of course|okay|absolutely|here(\s+is|'s|\s+are)|below\s+is|i\s+(have|ve|'ve|will)|"
+    r"as\s+an\s+ai|this\s+(revised|updated|improved)\s+resume)\b",
+    re.IGNORECASE
+)
+
+ProgressCallback = Callable[[int, str], None]
+
+
+def check_partial_resume(text: str, max_chars: int) -> Optional[str]:
+    """
+    Check a partially generated resume against the output rules.
+    
+    Returns:
+        Reason to abort the generation, or None if it may continue
+    """
+    if len(text) > max_chars:
+        return f"exceeded length budget of {max_chars} characters"
+    head = text.lstrip().lstrip('`').lstrip()
+    if len(head) >= 40 and _COMMENTARY_RE.match(head.lstrip('#').lstrip()):
+        return "started with commentary instead of the resume"
+    return None
+
+
+def normalize_embeddings(embeddings: Any) -> np.ndarray:
+    """
+    Convert embeddings to a contiguous float32 matrix with L2-normalized rows.
+    
+    Zero vectors are left as zeros so they score 0.0 against everything.
+    """
+    matrix = np.ascontiguousarray(np.atleast_2d(np.asarray(embeddings, dtype=np.float32)))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_similarities(query: Any, normalized_matrix: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+    """
+    Rank rows of a pre-normalized matrix by cosine similarity to query.
+    
+    Uses one matrix-vector product and argpartition, so only the top_k rows are sorted.
+    
+    Returns:
+        List of (row_index, similarity) pairs, best first
+    """
+    if normalized_matrix.shape[0] == 0 or top_k <= 0:
+        return []
+    query_vector = normalize_embeddings(query)[0]
+    similarities = normalized_matrix @ query_vector
+    k = min(top_k, similarities.shape[0])
+    if k < similarities.shape[0]:
+        candidates = np.argpartition(-similarities, k - 1)[:k]
+    else:
+        candidates = np.arange(similarities.shape[0])
+    ranked = candidates[np.argsort(-similarities[candidates], kind='stable')]
+    return [(int(i), float(similarities[i])) for i in ranked]
+
 
 @dataclass
 class ScoringResult:
@@ -18,6 +84,7 @@ class ScoringResult:
     improved_score: float
     improved_resume: str
     suggestions: List[str]
+    metrics: Optional[Dict] = field(default=None)
 
 
 class ResumeScorer:
@@ -31,7 +98,27 @@ class ResumeScorer:
                  use_ollama: bool = False,
                  ollama_model: str = "gemma3:4b",
                  ollama_embedding_model: str = "nomic-embed-text:137m-v1.5-fp16",
-                 max_retries: int = 3):
+                 max_retries: int = 3,
+                 embedding_cache: Optional[EmbeddingCache] = None,
+                 embedding_cache_path: Optional[str] = None,
+                 embedding_cache_size: int = 10000,
+                 embedding_batch_size: int = 256,
+                 embedding_batch_max_chars: int = 400000,
+                 max_concurrency: int = 8,
+                 n_candidates: int = 1,
+                 target_score: Optional[float] = None,
+                 min_score_gain: Optional[float] = None,
+                 keyword_extractor: Optional[KeywordExtractor] = None,
+                 chunk_max_chars: Optional[int] = 2000,
+                 use_local_embeddings: bool = False,
+                 local_embedding_dim: int = 384,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 stream_generation: bool = False,
+                 length_budget_ratio: float = 3.0,
+                 openai_base_url: Optional[str] = None,
+                 ollama_host: Optional[str] = None,
+                 metrics: Optional[MetricsCollector] = None,
+                 client_registry: Optional[ClientRegistry] = None):
         """
         Initialize the resume scorer.
         
@@ -41,73 +128,242 @@ class ResumeScorer:
             ollama_model: Ollama model for text generation
             ollama_embedding_model: Ollama model for embeddings
             max_retries: Maximum retries for improvement attempts
+            embedding_cache: Shared embedding cache (overrides the path/size arguments)
+            embedding_cache_path: SQLite file for persisting embeddings across runs
+            embedding_cache_size: Maximum number of embeddings kept in memory
+            embedding_batch_size: Maximum number of inputs per embedding request
+            embedding_batch_max_chars: Maximum total characters per embedding request
+            max_concurrency: Maximum number of in-flight backend requests for this scorer
+            n_candidates: Improvement candidates generated concurrently per round (the default
+                of 1 makes max_retries sequential attempts; raise it to opt into concurrent candidates)
+            target_score: Stop improving as soon as a candidate reaches this score
+            min_score_gain: Stop improving when a round gains no more than this (None disables)
+            keyword_extractor: Shared corpus-aware keyword extractor (fitted with fit_keywords()
+                or loaded with KeywordExtractor.load(); scoring never changes its statistics)
+            chunk_max_chars: Split documents longer than this into pooled chunks (None disables)
+            use_local_embeddings: Embed with the offline deterministic hashing backend;
+                without an OpenAI key (and without Ollama) generation is disabled
+            local_embedding_dim: Vector dimension of the local backend
+            rate_limiter: Client-side RPM/TPM limiter (defaults to the process-wide shared one)
+            stream_generation: Stream improvement candidates and abort those that break format rules
+            length_budget_ratio: Abort a streamed candidate longer than this multiple of the resume
+            openai_base_url: Alternative OpenAI-compatible endpoint (e.g. the local mock server)
+            ollama_host: Ollama server URL (defaults to OLLAMA_HOST / localhost)
+            metrics: Collector for per-stage timings, tokens and cache hits (with export sinks)
+            client_registry: Source of pooled API clients (defaults to the process-wide registry)
         """
         self.use_ollama = use_ollama
         self.max_retries = max_retries
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_batch_max_chars = embedding_batch_max_chars
+        self.max_concurrency = max_concurrency
+        # One semaphore per event loop, created on first use (see _request_slots)
+        self._slots_by_loop: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = \
+            weakref.WeakKeyDictionary()
+        if n_candidates < 1:
+            raise ValueError("n_candidates must be at least 1")
+        self.n_candidates = n_candidates
+        self.target_score = target_score
+        self.min_score_gain = min_score_gain
+        self.keyword_extractor = keyword_extractor or KeywordExtractor()
+        self.chunk_max_chars = chunk_max_chars
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.stream_generation = stream_generation
+        self.length_budget_ratio = length_budget_ratio
+        self.aborted_generations = 0
+        self.metrics = metrics or MetricsCollector()
+        # `is None`, not `or`: an injected cache that is still empty has len() == 0
+        if embedding_cache is None:
+            embedding_cache = EmbeddingCache(path=embedding_cache_path, max_entries=embedding_cache_size)
+        self.embedding_cache = embedding_cache
         
+        self.local_embedder = HashingEmbedder(dim=local_embedding_dim) if use_local_embeddings else None
+        
+        # Clients come from a process-wide registry so connection pools survive across instances;
+        # it imports the client library on first use, so OpenAI-only or local-only workers start fast
+        # Clients are resolved per event loop (see the client property), never cached across loops
+        self.client_registry = client_registry or get_shared_client_registry()
+        self._client = None
+        self._client_factory: Optional[Callable[[], Any]] = None
         if use_ollama:
-            self.client = ollama.Client()
+            self._client_factory = lambda: self.client_registry.get_ollama(ollama_host)
             self.model = ollama_model
             self.embedding_model = ollama_embedding_model
         else:
             api_key = openai_key or os.getenv("OPENAI_API_KEY")
-            if not api_key:
+            if api_key:
+                self._client_factory = lambda: self.client_registry.get_openai(api_key, openai_base_url)
+            elif not use_local_embeddings:
                 raise ValueError("OpenAI API key is required")
-            self.client = OpenAI(api_key=api_key)
             self.model = "gpt-4o"
             self.embedding_model = "text-embedding-ada-002"
+        
+        if self.local_embedder is not None:
+            self.embedding_model = self.local_embedder.model_name
+    
+    @property
+    def _request_slots(self) -> asyncio.Semaphore:
+        """Bound on this scorer's in-flight backend requests on the running event loop"""
+        loop = asyncio.get_running_loop()
+        slots = self._slots_by_loop.get(loop)
+        if slots is None:
+            # A semaphore references its loop, so entries of finished asyncio.run() calls are dropped here
+            for closed in [other for other in list(self._slots_by_loop.keys()) if other.is_closed()]:
+                del self._slots_by_loop[closed]
+            slots = self._slots_by_loop[loop] = asyncio.Semaphore(self.max_concurrency)
+        return slots
+    
+    @property
+    def client(self):
+        """Pooled API client for the running event loop (None without a generation backend)"""
+        if self._client is not None:
+            return self._client
+        if self._client_factory is None:
+            return None
+        return self._client_factory()
+    
+    @client.setter
+    def client(self, client) -> None:
+        # Pin a specific client (e.g. a simulated one in benchmarks)
+        self._client = client
+    
+    def fit_keywords(self, job_descriptions: Iterable[str]) -> int:
+        """
+        Add job descriptions to the keyword extractor's document-frequency statistics.
+        
+        Terms common to most postings then sink in extract_keywords() rankings.
+        Fit once on a representative corpus before scoring so every pair is scored
+        against the same statistics.
+        
+        Returns:
+            Number of descriptions counted (already seen ones are skipped)
+        """
+        return self.keyword_extractor.add_documents(job_descriptions)
     
     def extract_keywords(self, text: str) -> List[str]:
         """
-        Extract keywords from text using simple regex and common patterns.
-        This replaces the complex LLM-based keyword extraction.
+        Extract keywords from a job description ranked by TF-IDF.
+        
+        Ranking uses the statistics from fit_keywords() (plain term frequency
+        until then) and does not update them, so the same job always yields
+        the same keywords regardless of what was scored before.
         """
-        # Remove common stop words and extract meaningful terms
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-            'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'must', 'shall', 'can', 'this', 'that',
-            'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
-        }
-        
-        # Extract words, keeping technical terms and acronyms
-        words = re.findall(r'\b[A-Za-z][A-Za-z0-9+#\-\.]*\b', text.lower())
-        
-        # Filter out stop words and short words
-        keywords = [word for word in words if word not in stop_words and len(word) > 2]
-        
-        # Count frequency and return top keywords
-        word_freq = {}
-        for word in keywords:
-            word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # Sort by frequency and return top 50
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, freq in sorted_words[:50]]
+        return self.keyword_extractor.extract(text)
     
     async def get_embedding(self, text: str) -> List[float]:
-        """Get embedding for text using OpenAI or Ollama"""
-        if self.use_ollama:
-            try:
-                response = self.client.embed(
-                    input=text,
-                    model=self.embedding_model
-                )
-                return response['embeddings'][0]
-            except Exception as e:
-                logger.error(f"Ollama embedding error: {e}")
-                raise
-        else:
-            try:
-                response = self.client.embeddings.create(
-                    input=text,
-                    model=self.embedding_model
-                )
-                return response.data[0].embedding
-            except Exception as e:
-                logger.error(f"OpenAI embedding error: {e}")
-                raise
+        """Get embedding for text using OpenAI or Ollama, served from cache when possible"""
+        embeddings = await self.get_embeddings([text])
+        return embeddings[0]
+    
+    def _split_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into request-sized batches by input count and approximate size"""
+        batches = []
+        current = []
+        current_chars = 0
+        for text in texts:
+            if current and (len(current) >= self.embedding_batch_size or
+                            current_chars + len(text) > self.embedding_batch_max_chars):
+                batches.append(current)
+                current = []
+                current_chars = 0
+            current.append(text)
+            current_chars += len(text)
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one request-sized batch with the configured backend"""
+        estimated_tokens = sum(estimate_tokens(text) for text in texts)
+        record_queue_wait('embedding', await self.rate_limiter.acquire(self.embedding_model, estimated_tokens))
+        
+        async with track_stage('embedding'):
+            if self.use_ollama:
+                try:
+                    async with self._request_slots:
+                        response = await self.client.embed(
+                            input=texts,
+                            model=self.embedding_model
+                        )
+                    record_usage('embedding', response.get('prompt_eval_count'), 0)
+                    return list(response['embeddings'])
+                except Exception as e:
+                    logger.error(f"Ollama embedding error: {e}")
+                    raise
+            else:
+                try:
+                    async with self._request_slots:
+                        response = await self.client.embeddings.create(
+                            input=texts,
+                            model=self.embedding_model
+                        )
+                    usage_tokens = getattr(response.usage, 'total_tokens', None)
+                    self.rate_limiter.settle(self.embedding_model, estimated_tokens, usage_tokens)
+                    record_usage('embedding', usage_tokens, 0)
+                    return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+                except Exception as e:
+                    logger.error(f"OpenAI embedding error: {e}")
+                    raise
+    
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Get embeddings for many texts, packing cache misses into as few requests as possible.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            One embedding per input text, in input order
+        """
+        if self.local_embedder is not None:
+            # Local vectors are cheaper to recompute than to hash and cache
+            return self.local_embedder.embed(texts)
+        
+        results: List[Optional[List[float]]] = self.embedding_cache.get_many(self.embedding_model, texts)
+        record_cache_hits('embedding', sum(1 for vector in results if vector is not None))
+        
+        # Embed each distinct missing text once
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, results) if vector is None))
+        embedded: Dict[str, List[float]] = {}
+        for batch in self._split_batches(missing):
+            vectors = await self._embed_batch(batch)
+            for text, vector in zip(batch, vectors):
+                self.embedding_cache.put(self.embedding_model, text, vector)
+                embedded[text] = vector
+        
+        return [vector if vector is not None else embedded[text] for text, vector in zip(texts, results)]
+    
+    async def get_document_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed whole documents, chunking long ones and pooling the chunk vectors.
+        
+        All chunks of all documents go through get_embeddings together, so they are
+        batched and cached per chunk: an edited document only re-embeds the chunks
+        whose content changed.
+        """
+        if not self.chunk_max_chars:
+            return await self.get_embeddings(texts)
+        
+        document_chunks = [split_into_chunks(text, self.chunk_max_chars) for text in texts]
+        flat_chunks = [chunk for chunks in document_chunks for chunk in chunks]
+        flat_embeddings = await self.get_embeddings(flat_chunks)
+        
+        results = []
+        offset = 0
+        for chunks in document_chunks:
+            vectors = flat_embeddings[offset:offset + len(chunks)]
+            results.append(pool_embeddings(vectors, weights=[len(chunk) for chunk in chunks]))
+            offset += len(chunks)
+        return results
+    
+    async def get_document_embedding(self, text: str) -> List[float]:
+        """Embed one (possibly long) document"""
+        embeddings = await self.get_document_embeddings([text])
+        return embeddings[0]
+    
+    def get_cache_stats(self) -> Dict[str, float]:
+        """Return embedding cache hit/miss counters"""
+        return self.embedding_cache.get_stats()
     
     def calculate_cosine_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """Calculate cosine similarity between two embeddings"""
@@ -127,14 +383,177 @@ class ResumeScorer:
         
         return float(dot_product / (magnitude1 * magnitude2))
     
+    @staticmethod
+    def prepare_job_matrix(job_embeddings: Any) -> np.ndarray:
+        """Pre-normalize stored job embeddings once for repeated score_against_jobs calls"""
+        return normalize_embeddings(job_embeddings)
+    
+    async def score_against_jobs(self,
+                                 resume_text: str,
+                                 job_embeddings_matrix: Any,
+                                 top_k: int = 10,
+                                 normalized: bool = False) -> List[Tuple[int, float]]:
+        """
+        Score one resume against many job embeddings in a single matrix-vector product.
+        
+        Args:
+            resume_text: The resume content as string
+            job_embeddings_matrix: One job embedding per row
+            top_k: Number of best-matching jobs to return
+            normalized: True if the matrix came from prepare_job_matrix (skips re-normalizing)
+            
+        Returns:
+            List of (job_row_index, cosine_similarity) pairs, best first
+        """
+        matrix = job_embeddings_matrix if normalized else self.prepare_job_matrix(job_embeddings_matrix)
+        resume_embedding = await self.get_document_embedding(resume_text)
+        return top_k_similarities(resume_embedding, matrix, top_k)
+    
+    async def _generate(self, prompt: str, n: int = 1) -> List[str]:
+        """
+        Generate completions for prompt with one backend request.
+        
+        OpenAI returns n samples from the request; Ollama has no n parameter and
+        always returns one.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        # A rewrite is about as long as the resume in the prompt; settle() corrects the reservation
+        estimated_tokens = estimate_chat_tokens(messages, max_tokens=min(4000, estimate_tokens(prompt)) * n)
+        record_queue_wait('improvement', await self.rate_limiter.acquire(self.model, estimated_tokens))
+        
+        async with track_stage('improvement'), self._request_slots:
+            if self.use_ollama:
+                response = await self.client.generate(
+                    model=self.model,
+                    prompt=prompt,
+                    options={"temperature": 0.7, "top_p": 0.9}
+                )
+                record_usage('improvement', response.get('prompt_eval_count'), response.get('eval_count'))
+                return [response['response'].strip()]
+            
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=4000,
+                n=n
+            )
+        usage = response.usage
+        self.rate_limiter.settle(self.model, estimated_tokens, getattr(usage, 'total_tokens', None))
+        record_usage('improvement', getattr(usage, 'prompt_tokens', None), getattr(usage, 'completion_tokens', None))
+        return [choice.message.content.strip() for choice in response.choices if choice.message.content]
+    
+    async def _generate_stream(self,
+                               prompt: str,
+                               candidate_index: int,
+                               max_chars: int,
+                               progress_callback: Optional[ProgressCallback] = None) -> Optional[str]:
+        """
+        Stream one completion, checking it as it arrives.
+        
+        Returns:
+            The finished text, or None if the stream was cancelled for breaking the output rules
+        """
+        messages = [{"role": "user", "content": prompt}]
+        estimated_tokens = estimate_chat_tokens(messages, max_tokens=min(4000, estimate_tokens(prompt)))
+        record_queue_wait('improvement', await self.rate_limiter.acquire(self.model, estimated_tokens))
+        
+        parts: List[str] = []
+        text = ''
+        usage = None
+        abort_reason = None
+        async with track_stage('improvement'), self._request_slots:
+            if self.use_ollama:
+                stream = await self.client.generate(
+                    model=self.model,
+                    prompt=prompt,
+                    options={"temperature": 0.7, "top_p": 0.9},
+                    stream=True
+                )
+            else:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=4000,
+                    stream=True,
+                    stream_options={"include_usage": True}
+                )
+            try:
+                async for chunk in stream:
+                    if self.use_ollama:
+                        delta = chunk['response']
+                        if chunk.get('done'):
+                            record_usage('improvement', chunk.get('prompt_eval_count'), chunk.get('eval_count'))
+                    else:
+                        if getattr(chunk, 'usage', None) is not None:
+                            usage = chunk.usage
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    parts.append(delta)
+                    text = ''.join(parts)
+                    if progress_callback is not None:
+                        progress_callback(candidate_index, text)
+                    abort_reason = check_partial_resume(text, max_chars)
+                    if abort_reason:
+                        break
+            finally:
+                close = getattr(stream, 'close', None) or getattr(stream, 'aclose', None)
+                if abort_reason and close is not None:
+                    await close()
+        
+        if usage is not None:
+            record_usage('improvement', usage.prompt_tokens, usage.completion_tokens)
+        self.rate_limiter.settle(self.model, estimated_tokens, getattr(usage, 'total_tokens', None))
+        if abort_reason:
+            self.aborted_generations += 1
+            logger.info(f"Cancelled improvement candidate {candidate_index + 1}: {abort_reason}")
+            return None
+        return text.strip()
+    
+    async def _generate_candidates(self,
+                                   prompt: str,
+                                   n: int,
+                                   max_chars: int = 12000,
+                                   progress_callback: Optional[ProgressCallback] = None) -> List[str]:
+        """
+        Generate n candidate completions at once.
+        
+        OpenAI returns all n samples from a single request; Ollama requests are
+        issued concurrently instead. With streaming enabled every candidate is its
+        own stream so a bad one can be cancelled without losing the others.
+        """
+        if self.stream_generation:
+            requests = [self._generate_stream(prompt, i, max_chars, progress_callback) for i in range(n)]
+        elif not self.use_ollama:
+            return await self._generate(prompt, n)
+        else:
+            requests = [self._generate(prompt) for _ in range(n)]
+        
+        results = await asyncio.gather(*requests, return_exceptions=True)
+        candidates = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error generating improvement candidate: {result}")
+            elif isinstance(result, str):
+                candidates.append(result)
+            elif result:
+                candidates.extend(result)
+        return candidates
+    
     async def improve_resume_with_llm(self, 
                                     resume_text: str,
                                     job_description: str,
                                     job_keywords: List[str],
                                     current_score: float,
-                                    job_embedding: List[float]) -> Tuple[str, float]:
+                                    job_embedding: List[float],
+                                    progress_callback: Optional[ProgressCallback] = None) -> Tuple[str, float]:
         """
         Use LLM to improve resume based on job description and keywords
+        
+        With stream_generation enabled, progress_callback(candidate_index, partial_text)
+        is called as each candidate streams in.
         """
         prompt = f"""
 You are an expert resume editor and talent acquisition specialist. Your task is to revise the following resume so that it aligns as closely as possible with the provided job description and extracted job keywords, in order to maximize the cosine similarity between the resume and the job keywords.
@@ -171,38 +590,46 @@ NOTE: ONLY OUTPUT THE IMPROVED UPDATED RESUME IN MARKDOWN FORMAT.
         best_resume = resume_text
         best_score = current_score
         
-        for attempt in range(self.max_retries):
+        if self.client is None:
+            logger.info("No generation backend configured; skipping resume improvement")
+            return best_resume, best_score
+        
+        max_chars = max(2000, int(len(resume_text) * self.length_budget_ratio))
+        remaining = self.max_retries
+        round_number = 0
+        while remaining > 0:
+            round_number += 1
+            n = min(self.n_candidates, remaining)
+            remaining -= n
+            
             try:
-                if self.use_ollama:
-                    response = self.client.generate(
-                        model=self.model,
-                        prompt=prompt,
-                        options={"temperature": 0.7, "top_p": 0.9}
-                    )
-                    improved_resume = response['response'].strip()
-                else:
-                    response = self.client.chat.completions.create(
-                        model=self.model,
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.7,
-                        max_tokens=4000
-                    )
-                    improved_resume = response.choices[0].message.content.strip()
-                
-                # Get embedding for improved resume
-                improved_embedding = await self.get_embedding(improved_resume)
-                
-                # Calculate new score
-                new_score = self.calculate_cosine_similarity(improved_embedding, job_embedding)
-                
-                if new_score > best_score:
-                    best_resume = improved_resume
-                    best_score = new_score
-                    logger.info(f"Improved score from {current_score:.4f} to {new_score:.4f}")
-                
+                candidates = await self._generate_candidates(prompt, n, max_chars, progress_callback)
+                if not candidates:
+                    continue
+                # Embed every candidate of this round in one batched request
+                candidate_embeddings = await self.get_document_embeddings(candidates)
             except Exception as e:
-                logger.error(f"Error in improvement attempt {attempt + 1}: {e}")
+                logger.error(f"Error in improvement round {round_number}: {e}")
                 continue
+            
+            round_best_resume, round_best_score = best_resume, best_score
+            for improved_resume, improved_embedding in zip(candidates, candidate_embeddings):
+                # Calculate new score
+                new_score = self.calculate_cosine_similarity(improved_embedding, job_embedding)
+                if new_score > round_best_score:
+                    round_best_resume, round_best_score = improved_resume, new_score
+            
+            gain = round_best_score - best_score
+            if gain > 0:
+                logger.info(f"Improved score from {best_score:.4f} to {round_best_score:.4f}")
+                best_resume, best_score = round_best_resume, round_best_score
+            
+            if self.target_score is not None and best_score >= self.target_score:
+                logger.info(f"Target score {self.target_score:.4f} reached after round {round_number}")
+                break
+            if self.min_score_gain is not None and gain <= self.min_score_gain:
+                logger.info(f"Score gain levelled off after round {round_number}")
+                break
         
         return best_resume, best_score
     
@@ -229,42 +656,46 @@ NOTE: ONLY OUTPUT THE IMPROVED UPDATED RESUME IN MARKDOWN FORMAT.
         
         return suggestions
     
-    async def score_resume(self, resume_text: str, job_description: str) -> ScoringResult:
+    async def score_resume(self, resume_text: str, job_description: str,
+                           progress_callback: Optional[ProgressCallback] = None) -> ScoringResult:
         """
         Main method to score resume against job description
         
         Args:
             resume_text: The resume content as string
             job_description: The job description as string
+            progress_callback: Receives (candidate_index, partial_text) while rewrites stream in
             
         Returns:
             ScoringResult with similarity score and improvement suggestions
         """
         try:
-            # Extract keywords from job description
-            job_keywords = self.extract_keywords(job_description)
-            job_keywords_text = ', '.join(job_keywords)
+            async with self.metrics.request('score_resume') as request_metrics:
+                # Extract keywords from job description
+                job_keywords = self.extract_keywords(job_description)
+                job_keywords_text = ', '.join(job_keywords)
             
-            # Get embeddings
-            resume_embedding = await self.get_embedding(resume_text)
-            job_embedding = await self.get_embedding(job_keywords_text)
+                # Get embeddings in a single batched request
+                resume_embedding, job_embedding = await self.get_document_embeddings([resume_text, job_keywords_text])
             
-            # Calculate initial similarity score
-            original_score = self.calculate_cosine_similarity(resume_embedding, job_embedding)
+                # Calculate initial similarity score
+                original_score = self.calculate_cosine_similarity(resume_embedding, job_embedding)
             
-            # Improve resume using LLM
-            improved_resume, improved_score = await self.improve_resume_with_llm(
-                resume_text, job_description, job_keywords, original_score, job_embedding
-            )
+                # Improve resume using LLM
+                improved_resume, improved_score = await self.improve_resume_with_llm(
+                    resume_text, job_description, job_keywords, original_score, job_embedding,
+                    progress_callback=progress_callback
+                )
             
-            # Generate suggestions
-            suggestions = self.generate_suggestions(original_score, improved_score, job_keywords)
+                # Generate suggestions
+                suggestions = self.generate_suggestions(original_score, improved_score, job_keywords)
             
             return ScoringResult(
                 original_score=original_score,
                 improved_score=improved_score,
                 improved_resume=improved_resume,
-                suggestions=suggestions
+                suggestions=suggestions,
+                metrics=request_metrics.as_dict()
             )
             
         except Exception as e:
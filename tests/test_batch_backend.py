@@ -0,0 +1,114 @@
+import asyncio
+import os
+
+import pytest
+
+from batch_backend import (BatchBackend, BatchRequest, BatchStatus, LocalBatchBackend, parse_batch_line,
+                           run_batch)
+
+
+class _Response:
+    def __init__(self, content):
+        self.content = content
+
+    def model_dump(self):
+        return {'choices': [{'message': {'content': self.content}}], 'usage': {'prompt_tokens': 3}}
+
+
+class _Completions:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.started = 0
+
+    async def create(self, **body):
+        self.started += 1
+        await asyncio.sleep(self.delay)
+        return _Response(body['messages'][0]['content'].upper())
+
+
+class _Client:
+    def __init__(self, delay=0.0):
+        self.chat = type('Chat', (), {})()
+        self.chat.completions = _Completions(delay)
+
+
+def _requests(n):
+    return [BatchRequest(f"r{i}", {'model': 'gpt-4o', 'messages': [{'role': 'user', 'content': f"hi {i}"}]})
+            for i in range(n)]
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        BatchBackend()
+
+    class Partial(BatchBackend):
+        async def submit(self, path):
+            return 'b'
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_local_backend_round_trip(tmp_path):
+    backend = LocalBatchBackend(_Client())
+    results = asyncio.run(run_batch(backend, _requests(3), batch_dir=str(tmp_path), poll_interval=0.01))
+    assert {custom_id: result.content for custom_id, result in results.items()} == {
+        'r0': 'HI 0', 'r1': 'HI 1', 'r2': 'HI 2'}
+    assert results['r0'].usage == {'prompt_tokens': 3}
+    assert os.listdir(tmp_path) == []
+
+
+def test_timeout_cancels_the_running_batch(tmp_path):
+    client = _Client(delay=60)
+    backend = LocalBatchBackend(client, max_concurrency=2)
+    statuses = []
+
+    async def main():
+        original = backend.status
+
+        async def status(batch_id):
+            result = await original(batch_id)
+            statuses.append(result)
+            return result
+
+        backend.status = status
+        with pytest.raises(TimeoutError):
+            await run_batch(backend, _requests(4), batch_dir=str(tmp_path), poll_interval=0.01, timeout=0.05)
+
+    asyncio.run(main())
+    assert statuses[-1].status == 'cancelled'
+    assert client.chat.completions.started == 2
+    assert backend._batches == {}
+
+
+def test_caller_cancellation_cancels_the_batch(tmp_path):
+    cancelled = []
+
+    class Backend(BatchBackend):
+        async def submit(self, path):
+            return 'batch-1'
+
+        async def status(self, batch_id):
+            return BatchStatus(batch_id, 'in_progress')
+
+        async def results(self, batch_id):
+            return []
+
+        async def cancel(self, batch_id):
+            cancelled.append(batch_id)
+
+    async def main():
+        task = asyncio.ensure_future(run_batch(Backend(), _requests(1), batch_dir=str(tmp_path), poll_interval=10))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert cancelled == ['batch-1']
+
+
+def test_parse_batch_line_errors():
+    assert parse_batch_line({'custom_id': 'a', 'error': {'message': 'boom'}}).error == 'boom'
+    assert parse_batch_line({'custom_id': 'a', 'response': {'status_code': 500, 'body': {}}}).error == 'HTTP 500'
+    assert parse_batch_line({'custom_id': 'a', 'response': {'status_code': 200, 'body': {}}}).error
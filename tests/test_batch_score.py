@@ -0,0 +1,58 @@
+import json
+
+from batch_score import (CompletionTracker, checkpoint_path, iter_tasks, load_checkpoint,
+                         save_checkpoint)
+
+
+def _write_jsonl(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records), encoding='utf-8')
+    return str(path)
+
+
+def test_tracker_keeps_only_completions_past_the_first_gap():
+    tracker = CompletionTracker()
+    for seq in (0, 2, 3, 1, 5):
+        tracker.add(seq)
+    assert tracker.done_below == 4 and tracker.done == {5}
+    assert 3 in tracker and 4 not in tracker and 5 in tracker
+    assert len(tracker) == 5
+
+
+def test_cross_product_and_pairs_files(tmp_path):
+    resumes = _write_jsonl(tmp_path / 'resumes.jsonl', [{'id': 'r1', 'text': 'Python'}, {'resume_text': 'Go'}])
+    jobs = _write_jsonl(tmp_path / 'jobs.jsonl', [{'id': 'j1', 'description': 'Backend', 'title': 'SWE'},
+                                                  {'job_description': 'Data'}])
+    tasks = list(iter_tasks(resumes=resumes, jobs=jobs))
+    assert [(t.seq, t.resume_id, t.job_id) for t in tasks] == [
+        (0, 'r1', 'j1'), (1, 'r1', 'job-1'), (2, 'resume-1', 'j1'), (3, 'resume-1', 'job-1')
+    ]
+    assert tasks[0].job_title == 'SWE' and tasks[3].resume_text == 'Go'
+
+    pairs = _write_jsonl(tmp_path / 'pairs.jsonl', [
+        {'resume': 'Python', 'description': 'Backend', 'resume_data': '{"name": "A"}'}
+    ])
+    [task] = iter_tasks(pairs=pairs)
+    assert (task.resume_id, task.job_id, task.resume_data) == ('resume-0', 'job-0', {'name': 'A'})
+
+
+def test_checkpoint_round_trip_adds_results_written_after_it(tmp_path):
+    output = tmp_path / 'results.jsonl'
+    output.write_bytes(b'{"seq": 0}\n{"seq": 2}\n')
+    tracker = CompletionTracker(done=[0, 2])
+    save_checkpoint(str(output), tracker, output.stat().st_size)
+    with open(output, 'ab') as f:
+        f.write(b'{"seq": 1}\n')
+
+    resumed = load_checkpoint(str(output))
+    assert resumed.done_below == 3 and not resumed.done
+    with open(checkpoint_path(str(output)), encoding='utf-8') as f:
+        assert json.load(f)['done'] == [2]
+
+
+def test_torn_last_line_is_truncated_and_redone(tmp_path):
+    output = tmp_path / 'results.jsonl'
+    output.write_bytes(b'{"seq": 0}\n{"seq": 1}\n{"seq": 2, "sco')
+
+    tracker = load_checkpoint(str(output))
+    assert 1 in tracker and 2 not in tracker
+    assert output.read_bytes() == b'{"seq": 0}\n{"seq": 1}\n'
@@ -0,0 +1,82 @@
+from comparison_engine import ComparisonEngine, _Variable, normalize_terms
+
+
+def _var(category, name, evidence=''):
+    data = {'variable': name, 'evidence': evidence}
+    return _Variable(category, data, normalize_terms(name), normalize_terms(f"{name} {evidence}"))
+
+
+def test_synonyms_fold_to_canonical_terms():
+    assert normalize_terms("Node.js and K8s") == {'nodejs', 'kubernetes'}
+    assert normalize_terms("CI/CD pipelines") == {'ci-cd', 'pipelines'}
+    assert normalize_terms("Master's degree") == {'master'}
+    assert normalize_terms("Go") == {'golang'}
+
+
+def test_ambiguous_aliases_need_context():
+    assert normalize_terms("MS Excel") == {'ms', 'excel'}
+    assert normalize_terms("MS in Computer Science") == {'master', 'cs'}
+    assert 'golang' not in normalize_terms("go to market strategy")
+
+
+def test_phrase_aliases_only_match_whole_words():
+    assert normalize_terms("REST API") == {'rest'}
+    assert normalize_terms("rest apis") == {'rest', 'apis'}
+
+
+def test_term_similarity_is_relative_to_the_job_terms():
+    job = _var('core_competencies', "Python")
+    candidate = _var('core_competencies', "Python, Django, PostgreSQL and Redis")
+    assert ComparisonEngine.term_similarity(job, candidate) == 1.0
+    # Terms only found in the evidence count for less than a name match
+    evidence_only = _var('core_competencies', "Backend services", "Built APIs in Python")
+    assert ComparisonEngine.term_similarity(job, evidence_only) == 0.8
+    assert ComparisonEngine.term_similarity(_var('core_competencies', "and the"), candidate) == 0.0
+
+
+def test_alignment_is_one_to_one_and_prefers_same_category():
+    job = {
+        'critical_requirements': {'a': {'variable': "Python"}},
+        'core_competencies': {'b': {'variable': "Python", 'proficiency_level': 'advanced'}},
+    }
+    candidate = {
+        'core_competencies': {'x': {'variable': "Python", 'proficiency_level': 'intermediate', 'evidence': "5 services"}},
+    }
+    comparisons = {c.category: c for c in ComparisonEngine().align(job, candidate)}
+    assert comparisons['core_competencies'].candidate_category == 'core_competencies'
+    assert comparisons['core_competencies'].credit == 0.5
+    assert comparisons['critical_requirements'].candidate is None
+    assert comparisons['critical_requirements'].evidence == 'Not found'
+
+
+def test_experience_credit_and_missing_critical():
+    job = {
+        'critical_requirements': {'a': {'variable': "Kubernetes", 'disqualifier': True}},
+        'experience_factors': {'b': {'variable': "Backend experience", 'minimum_threshold': "4 years"}},
+    }
+    candidate = {
+        'critical_requirements': {'x': {'variable': "Kubernetes", 'present': 'no'}},
+        'experience_factors': {'y': {'variable': "Backend experience", 'years_experience': 3}},
+    }
+    result = ComparisonEngine().compare(job, candidate)
+    assert result.category_scores['experience_factors'] == 75.0
+    assert result.category_scores['critical_requirements'] == 0.0
+    assert result.missing_critical == ["Kubernetes"]
+    assert result.variable_matches == {"Kubernetes": False, "Backend experience": False}
+    assert not result.statistical_significance
+
+
+def test_significance_tiers():
+    engine = ComparisonEngine()
+    assert engine.significance_tier(13) == (False, 0.0, 'none')
+    assert engine.significance_tier(14) == (True, 95.0, 'significant')
+    assert engine.significance_tier(16) == (True, 99.0, 'strong')
+    assert engine.significance_tier(22) == (True, 99.9, 'excellent')
+
+
+def test_compare_is_deterministic():
+    job = {'core_competencies': {str(i): {'variable': name} for i, name in enumerate(["React", "TypeScript", "GraphQL"])}}
+    candidate = {'core_competencies': {str(i): {'variable': name} for i, name in enumerate(["ReactJS", "TS and React", "REST"])}}
+    first, second = ComparisonEngine().compare(job, candidate), ComparisonEngine().compare(job, candidate)
+    assert first == second
+    assert first.variable_matches == {"React": True, "TypeScript": True, "GraphQL": False}
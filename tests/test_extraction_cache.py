@@ -0,0 +1,98 @@
+import sqlite3
+
+import extraction_cache
+from extraction_cache import ExtractionCache, candidate_cache_key, job_cache_key
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_keys_normalize_text_and_separate_versions():
+    key = job_cache_key('gpt-4o', 'v1', "Build  APIs\n", "Engineer", "Acme")
+    assert key == job_cache_key('gpt-4o', 'v1', "Build APIs", "ENGINEER", "acme")
+    assert key != job_cache_key('gpt-4o', 'v2', "Build APIs", "Engineer", "Acme")
+    assert (candidate_cache_key('gpt-4o', 'v1', "resume", {'b': 1, 'a': 2})
+            == candidate_cache_key('gpt-4o', 'v1', "resume", {'a': 2, 'b': 1}))
+
+
+def test_hits_return_independent_copies():
+    cache = ExtractionCache()
+    cache.put('k', {'skills': ['python']})
+    cache.get('k')['skills'].append('go')
+    assert cache.get('k') == {'skills': ['python']}
+    assert cache.get('missing') is None
+    assert cache.get_stats()['hits'] == 2 and cache.get_stats()['misses'] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch, tmp_path):
+    clock = FakeClock()
+    monkeypatch.setattr(extraction_cache.time, 'time', clock)
+    cache = ExtractionCache(path=str(tmp_path / 'cache.db'), ttl_seconds=60, purge_interval=0)
+    cache.put('old', {'v': 1})
+    clock.now += 61
+    assert cache.get('old') is None
+    cache.put('new', {'v': 2})
+    # The put purged the expired row from disk
+    assert len(cache) == 1
+    assert cache.get('new') == {'v': 2}
+    cache.close()
+
+
+def test_memory_lru_evicts_least_recently_used():
+    cache = ExtractionCache(max_entries=2)
+    cache.put('a', {'v': 'a'})
+    cache.put('b', {'v': 'b'})
+    cache.get('a')
+    cache.put('c', {'v': 'c'})
+    assert cache.get('b') is None
+    assert cache.get('a') == {'v': 'a'} and cache.get('c') == {'v': 'c'}
+
+
+def test_disk_is_bounded(monkeypatch, tmp_path):
+    clock = FakeClock()
+    monkeypatch.setattr(extraction_cache.time, 'time', clock)
+    cache = ExtractionCache(path=str(tmp_path / 'cache.db'), max_entries=1, max_disk_entries=10,
+                            touch_batch_size=1)
+    for i in range(10):
+        clock.now += 1
+        cache.put(f'k{i}', {'v': i})
+    clock.now += 1
+    assert cache.get('k0') == {'v': 0}
+    clock.now += 1
+    cache.put('k10', {'v': 10})
+    # Trimmed to 90% of the bound, dropping the least recently used rows
+    assert len(cache) == 9
+    assert cache.get('k0') == {'v': 0}
+    assert cache.get('k1') is None
+    cache.close()
+
+
+def test_file_is_shared_between_caches(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    writer, reader = ExtractionCache(path=path), ExtractionCache(path=path)
+    writer.put('k', {'v': 1})
+    assert reader.get('k') == {'v': 1}
+    assert reader.get_stats()['disk_hits'] == 1
+    writer.close()
+    reader.close()
+
+
+def test_put_never_raises_when_the_file_is_locked(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = ExtractionCache(path=path, busy_timeout=0.05)
+    other = sqlite3.connect(path)
+    other.execute("BEGIN EXCLUSIVE")
+    try:
+        cache.put('k', {'v': 1})
+    finally:
+        other.rollback()
+        other.close()
+    # Kept in memory even though the write was skipped
+    assert len(cache) == 0
+    assert cache.get('k') == {'v': 1}
+    cache.close()
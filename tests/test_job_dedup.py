@@ -0,0 +1,74 @@
+import pytest
+
+from job_dedup import JobDeduplicator, normalize_company, normalize_title, simhash
+
+DESCRIPTION = (
+    "We are hiring a backend engineer to build payment APIs in Python and Go. "
+    "You will own services end to end, review designs, mentor engineers and run "
+    "production systems with on-call rotation across three time zones. "
+) * 3
+
+
+def test_normalizers():
+    assert normalize_company("Acme, Inc.") == normalize_company("ACME Corp") == "acme"
+    assert normalize_company("Inc") == "inc"
+    assert normalize_title("Sr. Engineer (Remote)") == "sr engineer remote"
+
+
+def test_simhash_is_stable_and_close_for_small_edits():
+    words = DESCRIPTION.split()
+    assert simhash(words) == simhash(list(words))
+    edited = simhash(words + ['Apply', 'today'])
+    assert bin(simhash(words) ^ edited).count('1') <= 9
+
+
+def test_threshold_bounds():
+    with pytest.raises(ValueError):
+        JobDeduplicator(threshold=0.0)
+    assert JobDeduplicator(threshold=1.0).max_distance == 0
+    assert JobDeduplicator(threshold=0.85).max_distance == 9
+
+
+def test_near_duplicate_of_same_company_and_title_resolves_to_first_posting():
+    dedup = JobDeduplicator()
+    assert dedup.resolve('a', 'Backend Engineer', DESCRIPTION, 'Acme, Inc.') == ('a', None)
+    key, match = dedup.resolve('b', 'Backend engineer', DESCRIPTION + ' Apply today.', 'ACME')
+    assert key == 'a'
+    assert match.similarity >= dedup.threshold
+
+
+def test_exact_threshold_only_collapses_identical_fingerprints():
+    dedup = JobDeduplicator(threshold=1.0)
+    dedup.resolve('a', 'Engineer', DESCRIPTION, 'Acme')
+    assert dedup.resolve('b', 'Engineer', DESCRIPTION, 'Acme')[0] == 'a'
+    assert dedup.resolve('c', 'Engineer', DESCRIPTION + ' Relocation offered to the successful hire.',
+                         'Acme')[0] == 'c'
+
+
+@pytest.mark.parametrize('company, title', [('Globex', 'Backend Engineer'), ('Acme', 'Senior Backend Engineer')])
+def test_other_company_or_title_is_not_a_duplicate(company, title):
+    dedup = JobDeduplicator()
+    dedup.resolve('a', 'Backend Engineer', DESCRIPTION, 'Acme')
+    assert dedup.resolve('b', title, DESCRIPTION, company) == ('b', None)
+    assert dedup.find('Backend Engineer', DESCRIPTION, 'Acme').key == 'a'
+
+
+def test_repeat_resolves_of_a_collapsed_posting_count_once():
+    dedup = JobDeduplicator()
+    dedup.resolve('a', 'Engineer', DESCRIPTION, 'Acme')
+    for _ in range(4):
+        assert dedup.resolve('b', 'Engineer', DESCRIPTION + ' Apply today.', 'Acme')[0] == 'a'
+    stats = dedup.get_stats()
+    assert stats['duplicates_collapsed'] == 1
+    assert stats['checked'] == 2
+    assert stats['indexed'] == 1
+
+
+def test_lru_eviction_drops_oldest_postings():
+    dedup = JobDeduplicator(max_entries=2)
+    for i in range(3):
+        dedup.resolve(f'k{i}', f'Role {i}', f"{DESCRIPTION} team {i} " * (i + 1), 'Acme')
+    assert len(dedup) == 2
+    assert dedup.find('Role 0', DESCRIPTION + " team 0 ", 'Acme') is None
+    dedup.clear()
+    assert len(dedup) == 0
@@ -0,0 +1,72 @@
+import numpy as np
+
+from job_index import JobIndex
+
+
+def _vectors(count, dim=16, seed=1):
+    return np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+
+
+def _ids(start, count):
+    return [f"job-{i}" for i in range(start, start + count)]
+
+
+def test_exact_until_trained_then_approximate():
+    index = JobIndex(n_lists=4, nprobe=4, min_train_size=40)
+    vectors = _vectors(60)
+    index.add(_ids(0, 30), vectors[:30])
+    assert not index.is_trained
+    assert index.search(vectors[3], k=1)[0][0] == "job-3"
+
+    index.add(_ids(30, 30), vectors[30:])
+    assert index.is_trained and len(index) == 60
+    # Probing every list is exact
+    assert index.recall(vectors[:10], k=5) == 1.0
+
+
+def test_retrains_after_enough_changes():
+    index = JobIndex(n_lists=4, min_train_size=40, retrain_ratio=0.5)
+    vectors = _vectors(100)
+    index.add(_ids(0, 40), vectors[:40])
+    first_centroids = index.centroids
+
+    index.add(_ids(40, 20), vectors[40:60])
+    assert index.changes_since_train == 20 and not index.needs_retrain
+    assert index.centroids is first_centroids
+
+    index.remove("job-0")
+    assert index.centroids is not first_centroids
+    assert index.changes_since_train == 0
+
+
+def test_retrain_can_be_disabled():
+    index = JobIndex(n_lists=4, min_train_size=40, retrain_ratio=None)
+    vectors = _vectors(200)
+    index.add(_ids(0, 40), vectors[:40])
+    centroids = index.centroids
+    index.add(_ids(40, 160), vectors[40:])
+    assert index.centroids is centroids
+    assert index.changes_since_train == 160 and not index.needs_retrain
+
+
+def test_replacing_a_job_counts_as_one_change():
+    index = JobIndex(n_lists=4, min_train_size=40)
+    vectors = _vectors(41)
+    index.add(_ids(0, 40), vectors[:40])
+    index.add(["job-0"], vectors[40:])
+    assert len(index) == 40
+    assert index.changes_since_train == 1
+    assert index.search(vectors[40], k=1, nprobe=4)[0][0] == "job-0"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = JobIndex(n_lists=4, min_train_size=40, retrain_ratio=0.25)
+    vectors = _vectors(50)
+    index.add(_ids(0, 50), vectors)
+    path = str(tmp_path / "jobs.index")
+    index.save(path)
+
+    loaded = JobIndex.load(path)
+    assert loaded.retrain_ratio == 0.25
+    assert loaded.changes_since_train == index.changes_since_train
+    assert loaded.search(vectors[7], k=3) == index.search(vectors[7], k=3)
@@ -0,0 +1,78 @@
+import json
+import time
+
+import pytest
+
+from json_repair import IncrementalJSONParser, StreamingJSONRepairer, parse_json, repair_json, strip_code_fences
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('```json\n{"a": 1}\n```', {'a': 1}),
+    ('Here you go: {"a": 1,} Thanks!', {'a': 1}),
+    ("{'a': True, 'b': None, 'c': NaN}", {'a': True, 'b': None, 'c': None}),
+    ('{"a": 1 "b": 2}', {'a': 1, 'b': 2}),
+    ('{a: "x", b: [1 2 3]}', {'a': 'x', 'b': [1, 2, 3]}),
+    ('{"a": "line\nbreak"}', {'a': 'line\nbreak'}),
+    ('{"a": "he said "hi" to me"}', {'a': 'he said "hi" to me'}),
+    ('{"a": "C:\\path"}', {'a': 'C:\\path'}),
+    ('{"a": 1, // note\n "b": /* x */ 2}', {'a': 1, 'b': 2}),
+    ('{"a": +.5}', {'a': 0.5}),
+])
+def test_repairs_common_llm_mistakes(text, expected):
+    assert parse_json(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('{"a": [1, {"b": "tru', {'a': [1, {'b': 'tru'}]}),
+    ('{"a": "x\\', {'a': 'x\\'}),
+    ('{"a": ', {'a': None}),
+    ('{"a"', {'a': None}),
+    ('["\\', ['\\']),
+])
+def test_closes_truncated_documents(text, expected):
+    assert parse_json(text) == expected
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        repair_json('no braces here')
+
+
+def test_strip_code_fences_leaves_plain_text():
+    assert strip_code_fences('{"a": 1}') == '{"a": 1}'
+
+
+def test_incremental_parser_reports_fields_as_they_complete():
+    document = {'cat': {'v1': {'x': 1}, 'v2': {'y': [1, 2]}}, 'summary': 'done'}
+    text = json.dumps(document)
+    parser = IncrementalJSONParser()
+    seen = []
+    for i in range(0, len(text), 3):
+        seen.extend(path for path, _ in parser.feed(text[i:i + 3]))
+    assert seen == [('cat', 'v1'), ('cat', 'v2'), ('cat',), ('summary',)]
+    assert parser.close() == document
+
+
+def test_values_split_across_chunks_are_not_cut():
+    values = []
+    repairer = StreamingJSONRepairer(on_value=lambda path, value: values.append((path, value)))
+    for chunk in ('{"n": 12', '34, "w": tr', 'ue, "s": "ab', 'c"}'):
+        repairer.feed(chunk)
+    assert json.loads(repairer.finish()) == {'n': 1234, 'w': True, 's': 'abc'}
+    assert values[:3] == [(('n',), 1234), (('w',), True), (('s',), 'abc')]
+
+
+def test_streaming_repair_is_linear_in_document_size():
+    def run(count):
+        text = json.dumps({f"k{i}": {'value': 'x' * 20, 'n': i} for i in range(count)})
+        start = time.perf_counter()
+        parser = IncrementalJSONParser()
+        for i in range(0, len(text), 16):
+            parser.feed(text[i:i + 16])
+        parser.close()
+        return time.perf_counter() - start
+
+    run(200)
+    small, large = min(run(1000) for _ in range(3)), min(run(8000) for _ in range(3))
+    # 8x the input; a quadratic re-join would be ~64x slower
+    assert large < small * 20
@@ -0,0 +1,52 @@
+import io
+
+from keyword_extractor import KeywordExtractor, iter_text_chunks, iter_terms
+
+JOBS = [
+    "Python engineer building data pipelines with Spark and Airflow",
+    "Python engineer building web services with Django and Postgres",
+    "Python engineer building ML models with PyTorch",
+]
+
+
+def test_extraction_does_not_change_statistics():
+    extractor = KeywordExtractor(min_corpus_size=1)
+    extractor.add_documents(JOBS)
+    before = extractor.to_dict()
+    first = extractor.extract(JOBS[0])
+    for job in JOBS * 3:
+        extractor.extract(job)
+    assert extractor.extract(JOBS[0]) == first
+    assert extractor.to_dict() == before
+
+
+def test_fitted_corpus_demotes_common_terms():
+    extractor = KeywordExtractor(top_k=3, min_corpus_size=100)
+    assert extractor.extract(JOBS[0] + " python python")[0] == 'python'
+    extractor.add_documents(JOBS)
+    assert 'python' not in extractor.extract(JOBS[0])
+
+
+def test_repeated_documents_are_counted_once_and_seen_is_bounded():
+    extractor = KeywordExtractor(max_seen=2)
+    assert extractor.add_documents(JOBS + JOBS[-1:]) == 3
+    assert extractor.n_documents == 3
+    assert len(extractor._seen) == 2
+    assert extractor.add_document(JOBS[0])
+
+
+def test_save_and_load_round_trip(tmp_path):
+    extractor = KeywordExtractor()
+    extractor.add_documents(JOBS)
+    path = str(tmp_path / 'keywords.json')
+    extractor.save(path)
+    loaded = KeywordExtractor.load(path)
+    assert loaded.to_dict() == extractor.to_dict()
+    assert not loaded.add_document(JOBS[1])
+
+
+def test_streams_never_split_tokens():
+    text = "kubernetes " * 5000
+    chunks = list(iter_text_chunks(io.StringIO(text), chunk_size=7))
+    assert ''.join(chunks) == text
+    assert set(iter_terms(io.StringIO(text))) == {'kubernetes'}
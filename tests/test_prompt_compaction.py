@@ -0,0 +1,36 @@
+from prompt_compaction import compact_json, dedupe_resume_data, project_variables
+
+
+def test_dedupe_keeps_short_skills_that_only_appear_inside_words():
+    text = "Good communicator. Built dashboards for a retail chain."
+    data = {'coreSkills': ['R', 'Go', 'C', 'Rust', 'SQL']}
+    assert dedupe_resume_data(text, data) == {'coreSkills': ['R', 'Go', 'C', 'Rust', 'SQL']}
+
+
+def test_dedupe_drops_whole_word_mentions():
+    text = "Wrote ETL jobs in R and Go; tuned SQL queries."
+    data = {'coreSkills': ['R', 'Go', 'C', 'SQL'], 'summary': 'Tuned  SQL queries'}
+    assert dedupe_resume_data(text, data) == {'coreSkills': ['C']}
+
+
+def test_dedupe_does_not_find_c_in_cpp_or_csharp():
+    data = {'skills': ['C', 'C++', 'C#']}
+    assert dedupe_resume_data("Expert in C++ and C#.", data) == {'skills': ['C']}
+
+
+def test_dedupe_keeps_numbers_and_returns_none_when_everything_is_duplicated():
+    assert dedupe_resume_data("Python", {'years': 5, 'skills': ['python']}) == {'years': 5}
+    assert dedupe_resume_data("Python developer", {'skills': ['Python'], 'empty': []}) is None
+
+
+def test_project_variables_keeps_only_requested_fields():
+    document = {
+        'critical_requirements': {'req1': {'variable': 'Python', 'description': 'long text', 'disqualifier': True}},
+        'job_analysis': {'seniority': 'senior'},
+    }
+    projected = project_variables(document, ['variable', 'disqualifier'])
+    assert projected == {
+        'critical_requirements': {'req1': {'variable': 'Python', 'disqualifier': True}},
+        'job_analysis': {'seniority': 'senior'},
+    }
+    assert compact_json({'a': [1, 2]}) == '{"a":[1,2]}'
@@ -0,0 +1,68 @@
+import asyncio
+
+from rate_limiter import RateLimit, RateLimiter, TokenBucket, estimate_chat_tokens
+
+
+def test_estimates_cover_prompt_and_completion():
+    messages = [{'role': 'user', 'content': 'x' * 40}]
+    assert estimate_chat_tokens(messages) == 10 + 4 + 2
+    assert estimate_chat_tokens(messages, max_tokens=100) == 116
+
+
+def test_bucket_delay_and_adjust():
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.delay_for(60) == 0.0
+    bucket.take(60)
+    assert 29.0 < bucket.delay_for(30) <= 30.0
+    bucket.adjust(30)
+    assert bucket.delay_for(30) == 0.0
+
+
+def test_models_without_a_limit_pass_straight_through():
+    limiter = RateLimiter()
+
+    async def run():
+        return [await limiter.acquire('gpt-4o', 10 ** 9) for _ in range(100)]
+
+    assert asyncio.run(run()) == [0.0] * 100
+
+
+def test_waiters_are_served_in_arrival_order():
+    limiter = RateLimiter({'m': RateLimit(requests_per_minute=1000, tokens_per_minute=60000)})
+    order = []
+
+    async def request(name, tokens):
+        await limiter.acquire('m', tokens)
+        order.append(name)
+
+    async def run():
+        await limiter.acquire('m', 60000)
+        # The large request arrives first, so the small one may not overtake it
+        await asyncio.gather(request('large', 200), request('small', 1))
+
+    asyncio.run(run())
+    assert order == ['large', 'small']
+
+
+def test_settle_refund_wakes_the_head_waiter():
+    limiter = RateLimiter({'m': RateLimit(requests_per_minute=1000, tokens_per_minute=60)},
+                          max_wait_slice=10.0)
+
+    async def run():
+        await limiter.acquire('m', 60)
+        waiter = asyncio.ensure_future(limiter.acquire('m', 30))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        # Without the refund this request would wait about 30 seconds
+        limiter.settle('m', estimated_tokens=60, actual_tokens=20)
+        return await asyncio.wait_for(waiter, 2.0)
+
+    assert asyncio.run(run()) < 2.0
+
+
+def test_closed_loops_are_pruned():
+    limiter = RateLimiter({'m': RateLimit(requests_per_minute=1000, tokens_per_minute=100000)})
+    for _ in range(3):
+        asyncio.run(limiter.acquire('m', 10))
+    assert len(limiter._queues) <= 1
+    assert len(limiter._refunds) <= 1
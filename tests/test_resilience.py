@@ -0,0 +1,110 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from resilience import Resilience, RetryPolicy, is_transient, retry_after_seconds
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def test_transient_classification():
+    assert is_transient(asyncio.TimeoutError())
+    assert is_transient(ConnectionResetError())
+    assert is_transient(StatusError(429))
+    assert not is_transient(StatusError(400))
+    assert not is_transient(ValueError("bad json"))
+    assert retry_after_seconds(StatusError(429, {'retry-after': '2.5'})) == 2.5
+    assert retry_after_seconds(StatusError(429, {'retry-after': 'soon'})) is None
+
+
+def test_transient_errors_are_retried():
+    resilience = Resilience(RetryPolicy(max_attempts=3, base_delay=0.001))
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise StatusError(503)
+        return 'ok'
+
+    assert asyncio.run(resilience.call('extract', flaky)) == 'ok'
+    assert resilience.get_stats()['extract'] == {
+        'calls': 1, 'attempts': 3, 'retries': 2, 'failures': 0, 'hedges': 0, 'hedge_wins': 0
+    }
+
+
+def test_other_errors_are_not_retried():
+    resilience = Resilience(RetryPolicy(max_attempts=3, base_delay=0.001))
+    attempts = []
+
+    async def broken():
+        attempts.append(1)
+        raise ValueError("bad json")
+
+    with pytest.raises(ValueError):
+        asyncio.run(resilience.call('extract', broken))
+    assert len(attempts) == 1
+    assert resilience.get_stats()['extract']['failures'] == 1
+
+
+def _slow_then_fast(started, cancelled):
+    async def request():
+        index = len(started)
+        started.append(index)
+        try:
+            await asyncio.sleep(10.0 if index == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return index
+    return request
+
+
+def test_hedge_wins_and_the_slow_request_is_cancelled():
+    resilience = Resilience(RetryPolicy(hedging=True, hedge_delay=0.02))
+    started, cancelled = [], []
+    assert asyncio.run(resilience.call('compare', _slow_then_fast(started, cancelled))) == 1
+    assert started == [0, 1] and cancelled == [0]
+    assert resilience.get_stats()['compare']['hedge_wins'] == 1
+
+
+def test_hedging_can_be_disabled_per_call():
+    resilience = Resilience(RetryPolicy(hedging=True, hedge_delay=0.01))
+    started = []
+
+    async def request():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return 'done'
+
+    assert asyncio.run(resilience.call('compare', request, hedge=False)) == 'done'
+    assert len(started) == 1
+
+
+def test_cancelling_the_caller_cancels_both_requests():
+    resilience = Resilience(RetryPolicy(hedging=True, hedge_delay=0.01))
+    started, cancelled = [], []
+
+    async def request():
+        started.append(1)
+        try:
+            await asyncio.sleep(10.0)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        call = asyncio.ensure_future(resilience.call('compare', request))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+    asyncio.run(run())
+    assert len(started) == 2 and len(cancelled) == 2
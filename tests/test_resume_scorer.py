@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from resume_scorer import ResumeScorer
+
+
+def test_improvement_defaults_to_one_candidate_per_round():
+    scorer = ResumeScorer(use_local_embeddings=True, max_retries=3)
+    assert scorer.n_candidates == 1
+    assert ResumeScorer(use_local_embeddings=True, n_candidates=3).n_candidates == 3
+    with pytest.raises(ValueError):
+        ResumeScorer(use_local_embeddings=True, n_candidates=0)
+
+
+def test_request_slots_are_created_per_event_loop():
+    scorer = ResumeScorer(use_local_embeddings=True, max_concurrency=2)
+
+    async def slots_and_embeddings(text):
+        async with scorer._request_slots:
+            vectors = await scorer.get_embeddings([text])
+        return scorer._request_slots, vectors
+
+    first, vectors = asyncio.run(slots_and_embeddings("Python developer"))
+    second, _ = asyncio.run(slots_and_embeddings("Data engineer"))
+    assert first is not second
+    assert len(vectors) == 1
+    # Only the semaphore of the most recent loop is still tracked
+    assert len(scorer._slots_by_loop) <= 1
@@ -0,0 +1,82 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from enhanced_matching_system import EnhancedMatchingSystem
+from resilience import Resilience, RetryPolicy
+
+
+def _chunk(text):
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class _Stream:
+    def __init__(self, pieces, fail_after=None, delay=0.0):
+        self.pieces = pieces
+        self.fail_after = fail_after
+        self.delay = delay
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for index, piece in enumerate(self.pieces):
+            if index == self.fail_after:
+                raise ConnectionError("connection reset")
+            await asyncio.sleep(self.delay)
+            yield _chunk(piece)
+
+
+class _Client:
+    def __init__(self, streams):
+        self.streams = list(streams)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **request):
+        self.calls += 1
+        return self.streams.pop(0)
+
+
+def _pieces(document):
+    text = json.dumps(document)
+    return [text[i:i + 7] for i in range(0, len(text), 7)]
+
+
+def _matcher(client, policy):
+    matcher = EnhancedMatchingSystem(api_key='test', resilience=Resilience(policy))
+    matcher.client = client
+    return matcher
+
+
+def test_retry_reports_only_changed_fields_and_ends_on_the_winning_values():
+    first = {'a': {'x': 1, 'y': 2}, 'b': {'z': 3}}
+    second = {'a': {'x': 1, 'y': 5}, 'b': {'z': 3}}
+    client = _Client([_Stream(_pieces(first), fail_after=len(_pieces(first)) - 1), _Stream(_pieces(second))])
+    matcher = _matcher(client, RetryPolicy(max_attempts=2, base_delay=0.0))
+    reported = []
+
+    content = asyncio.run(matcher._chat_completion('job_extraction', 'system', 'user', 100,
+                                                   on_field=lambda path, value: reported.append((path, value))))
+
+    assert json.loads(content) == second
+    assert client.calls == 2
+    assert len({json.dumps([path, value]) for path, value in reported}) == len(reported)
+    latest = dict(reported)
+    assert latest[('a', 'y')] == 5
+    assert latest[('a',)] == {'x': 1, 'y': 5}
+    assert reported.count((('a', 'x'), 1)) == 1
+
+
+def test_streamed_calls_are_not_hedged():
+    document = {'a': {'x': 1}}
+    client = _Client([_Stream(_pieces(document), delay=0.02), _Stream(_pieces(document))])
+    matcher = _matcher(client, RetryPolicy(hedging=True, hedge_delay=0.001))
+    reported = []
+
+    asyncio.run(matcher._chat_completion('job_extraction', 'system', 'user', 100,
+                                         on_field=lambda path, value: reported.append(path)))
+
+    assert client.calls == 1
+    assert reported == [('a', 'x'), ('a',)]
+    assert matcher.resilience.get_stats()['job_extraction']['hedges'] == 0